@@ -0,0 +1,44 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: b1c2d3e4f501
+Revises: fix_term_lang_unique
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c2d3e4f501'
+down_revision: Union[str, None] = 'fix_term_lang_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (language, id) backs the list endpoints' `after` cursor
+    op.create_index('ix_categories_language_id', 'categories', ['language', 'id'], unique=False)
+    op.create_index('ix_topics_language_id', 'topics', ['language', 'id'], unique=False)
+    op.create_index('ix_lessons_language_id', 'lessons', ['language', 'id'], unique=False)
+    op.create_index('ix_fabrics_language_id', 'fabrics', ['language', 'id'], unique=False)
+    op.create_index('ix_garments_language_id', 'garments', ['language', 'id'], unique=False)
+    op.create_index('ix_terms_language_id', 'terms', ['language', 'id'], unique=False)
+
+    # Parent-scoped lists page within a single category / topic
+    op.create_index('ix_topics_category_language_id', 'topics', ['category_id', 'language', 'id'], unique=False)
+    op.create_index('ix_lessons_topic_language_id', 'lessons', ['topic_id', 'language', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lessons_topic_language_id', table_name='lessons')
+    op.drop_index('ix_topics_category_language_id', table_name='topics')
+
+    op.drop_index('ix_terms_language_id', table_name='terms')
+    op.drop_index('ix_garments_language_id', table_name='garments')
+    op.drop_index('ix_fabrics_language_id', table_name='fabrics')
+    op.drop_index('ix_lessons_language_id', table_name='lessons')
+    op.drop_index('ix_topics_language_id', table_name='topics')
+    op.drop_index('ix_categories_language_id', table_name='categories')
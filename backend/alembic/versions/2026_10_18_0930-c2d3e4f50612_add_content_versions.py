@@ -0,0 +1,101 @@
+"""add content_versions table maintained by triggers
+
+Revision ID: c2d3e4f50612
+Revises: b1c2d3e4f501
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d3e4f50612'
+down_revision: Union[str, None] = 'b1c2d3e4f501'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTENT_TABLES = ['categories', 'topics', 'lessons', 'fabrics', 'garments', 'terms']
+
+# Statement-level triggers bump one counter per (table, language) touched by a
+# statement, plus the table's '*' counter, so bulk writes cost one upsert per
+# language rather than one per row.
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_content_versions() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO content_versions (table_name, language, version)
+        SELECT TG_TABLE_NAME, lang, 1
+        FROM (SELECT language AS lang FROM new_rows UNION SELECT '*') AS changed
+        ON CONFLICT (table_name, language)
+        DO UPDATE SET version = content_versions.version + 1, updated_at = now();
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO content_versions (table_name, language, version)
+        SELECT TG_TABLE_NAME, lang, 1
+        FROM (
+            SELECT language AS lang FROM new_rows
+            UNION SELECT language FROM old_rows
+            UNION SELECT '*'
+        ) AS changed
+        ON CONFLICT (table_name, language)
+        DO UPDATE SET version = content_versions.version + 1, updated_at = now();
+    ELSE
+        INSERT INTO content_versions (table_name, language, version)
+        SELECT TG_TABLE_NAME, lang, 1
+        FROM (SELECT language AS lang FROM old_rows UNION SELECT '*') AS changed
+        ON CONFLICT (table_name, language)
+        DO UPDATE SET version = content_versions.version + 1, updated_at = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table('content_versions',
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('language', sa.String(length=2), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('table_name', 'language')
+    )
+
+    op.execute(BUMP_FUNCTION)
+
+    for table in CONTENT_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_version_insert AFTER INSERT ON {table} "
+            f"REFERENCING NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_content_versions()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_version_update AFTER UPDATE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_content_versions()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_version_delete AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_content_versions()"
+        )
+
+    # Seed counters for existing content so the first ETags are stable
+    for table in CONTENT_TABLES:
+        op.execute(
+            f"INSERT INTO content_versions (table_name, language, version) "
+            f"SELECT '{table}', language, 1 FROM {table} GROUP BY language "
+            f"UNION ALL SELECT '{table}', '*', 1"
+        )
+
+
+def downgrade() -> None:
+    for table in CONTENT_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_update ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version_insert ON {table}")
+
+    op.execute("DROP FUNCTION IF EXISTS bump_content_versions()")
+    op.drop_table('content_versions')
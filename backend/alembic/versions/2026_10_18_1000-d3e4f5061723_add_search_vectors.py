@@ -0,0 +1,59 @@
+"""add generated tsvector columns and GIN indexes for full-text search
+
+Revision ID: d3e4f5061723
+Revises: c2d3e4f50612
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e4f5061723'
+down_revision: Union[str, None] = 'c2d3e4f50612'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Text search configuration follows the row's language column
+REGCONFIG = (
+    "CASE language WHEN 'en' THEN 'english'::regconfig "
+    "WHEN 'ru' THEN 'russian'::regconfig ELSE 'simple'::regconfig END"
+)
+
+SEARCH_DOCUMENTS = {
+    'lessons': [('title', 'A'), ('summary', 'B'), ('content', 'C')],
+    'fabrics': [('name', 'A'), ('description', 'B')],
+    'garments': [('name', 'A'), ('description', 'B')],
+    'terms': [('term', 'A'), ('definition', 'B')],
+}
+
+
+def search_vector_sql(weighted_columns) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector({REGCONFIG}, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def upgrade() -> None:
+    for table, columns in SEARCH_DOCUMENTS.items():
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(search_vector_sql(columns), persisted=True),
+            nullable=True,
+        ))
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'],
+            unique=False, postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(list(SEARCH_DOCUMENTS)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
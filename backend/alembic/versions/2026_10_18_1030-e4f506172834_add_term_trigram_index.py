@@ -0,0 +1,35 @@
+"""add pg_trgm GIN index on terms.term for autocomplete
+
+Revision ID: e4f506172834
+Revises: d3e4f5061723
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f506172834'
+down_revision: Union[str, None] = 'd3e4f5061723'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigram extraction honours the database's LC_CTYPE; a UTF-8 locale
+    # (the postgres image default) is needed for Cyrillic terms to be indexed
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_terms_term_trgm', 'terms', ['term'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'term': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_terms_term_trgm', table_name='terms')
+    # pg_trgm is left installed; other objects may depend on it
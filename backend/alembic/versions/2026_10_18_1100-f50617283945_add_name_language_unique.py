@@ -0,0 +1,45 @@
+"""add (name, language) unique constraints on fabrics and garments
+
+Revision ID: f50617283945
+Revises: e4f506172834
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f50617283945'
+down_revision: Union[str, None] = 'e4f506172834'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Rows sharing a (name, language) with an older row get " (<id>)" appended, so
+# the constraints can be created without losing rows or the links to them
+RENAME_DUPLICATES = """
+    UPDATE {table} AS t
+    SET name = left(t.name, 200 - length(' (' || t.id || ')')) || ' (' || t.id || ')'
+    FROM (
+        SELECT id, row_number() OVER (PARTITION BY name, language ORDER BY id) AS position
+        FROM {table}
+    ) AS d
+    WHERE d.id = t.id AND d.position > 1
+"""
+
+
+def upgrade() -> None:
+    # Nothing kept (name, language) unique before; rename existing duplicates
+    for table in ('fabrics', 'garments'):
+        op.execute(RENAME_DUPLICATES.format(table=table))
+    # Conflict targets for the bulk upsert endpoints
+    op.create_unique_constraint('uq_fabric_name_language', 'fabrics', ['name', 'language'])
+    op.create_unique_constraint('uq_garment_name_language', 'garments', ['name', 'language'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_garment_name_language', 'garments', type_='unique')
+    op.drop_constraint('uq_fabric_name_language', 'fabrics', type_='unique')
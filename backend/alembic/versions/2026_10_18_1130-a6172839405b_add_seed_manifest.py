@@ -0,0 +1,31 @@
+"""add seed_manifest table for skipping unchanged seed files
+
+Revision ID: a6172839405b
+Revises: f50617283945
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6172839405b'
+down_revision: Union[str, None] = 'f50617283945'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('seed_manifest',
+    sa.Column('filename', sa.String(length=200), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('filename')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_manifest')
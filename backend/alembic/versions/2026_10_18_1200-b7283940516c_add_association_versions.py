@@ -0,0 +1,57 @@
+"""bump content_versions on writes to tags and association tables
+
+Revision ID: b7283940516c
+Revises: a6172839405b
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7283940516c'
+down_revision: Union[str, None] = 'a6172839405b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables without a language column; their counter lives under '*'
+UNVERSIONED_TABLES = [
+    'tags', 'lesson_fabrics', 'lesson_garments', 'lesson_terms', 'lesson_tags', 'fabric_garments',
+]
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO content_versions (table_name, language, version)
+    VALUES (TG_TABLE_NAME, '*', 1)
+    ON CONFLICT (table_name, language)
+    DO UPDATE SET version = content_versions.version + 1, updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(BUMP_FUNCTION)
+
+    for table in UNVERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+            f"ON {table} FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+        op.execute(
+            f"INSERT INTO content_versions (table_name, language, version) "
+            f"VALUES ('{table}', '*', 1)"
+        )
+
+
+def downgrade() -> None:
+    for table in UNVERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_version ON {table}")
+        op.execute(f"DELETE FROM content_versions WHERE table_name = '{table}'")
+
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
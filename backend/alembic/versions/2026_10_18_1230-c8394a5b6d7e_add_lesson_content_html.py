@@ -0,0 +1,32 @@
+"""add lessons.content_html for Markdown rendered at write time
+
+The columns are added empty; scripts/render_lessons.py fills them with the
+application's renderer. Rendering here would tie this revision to whatever
+the renderer and its dependencies do at the time it is run.
+
+Revision ID: c8394a5b6d7e
+Revises: b7283940516c
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8394a5b6d7e'
+down_revision: Union[str, None] = 'b7283940516c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('lessons', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('lessons', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('lessons', 'content_hash')
+    op.drop_column('lessons', 'content_html')
@@ -0,0 +1,26 @@
+"""add lesson_terms.offsets for glossary term positions
+
+Revision ID: d94a5b6c7e8f
+Revises: c8394a5b6d7e
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94a5b6c7e8f'
+down_revision: Union[str, None] = 'c8394a5b6d7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('lesson_terms', sa.Column('offsets', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('lesson_terms', 'offsets')
@@ -0,0 +1,98 @@
+"""add lesson_feature_changes log for incremental related-lesson refreshes
+
+Revision ID: e5f6a7b8c9d0
+Revises: d94a5b6c7e8f
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd94a5b6c7e8f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Entries kept, as LOG_RETENTION in app.models.lesson_feature_change; readers
+# that fell further behind reload everything
+RETENTION = 100000
+
+# The ids of lessons whose tag or term set, language or existence changed.
+# Ids are handed out under a transaction-scoped advisory lock, so they are
+# committed in order and a reader's "last id seen" watermark never skips an
+# entry committed later. A NULL lesson_id (TRUNCATE) means every lesson.
+LOG_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION log_lesson_feature_changes() RETURNS trigger AS $$
+DECLARE
+    changed integer[];
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        changed := ARRAY[NULL::integer];
+    ELSIF TG_TABLE_NAME = 'lessons' AND TG_OP = 'UPDATE' THEN
+        SELECT array_agg(n.id) INTO changed
+        FROM new_rows n JOIN old_rows o ON o.id = n.id
+        WHERE n.language IS DISTINCT FROM o.language;
+    ELSIF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM new_rows', TG_ARGV[0]) INTO changed;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM old_rows', TG_ARGV[0]) INTO changed;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT id) FROM '
+            '(SELECT %1$I AS id FROM new_rows UNION SELECT %1$I FROM old_rows) AS ids',
+            TG_ARGV[0]
+        ) INTO changed;
+    END IF;
+    IF changed IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtext('lesson_feature_changes'));
+    INSERT INTO lesson_feature_changes (lesson_id) SELECT unnest(changed);
+    DELETE FROM lesson_feature_changes
+    WHERE id <= currval(pg_get_serial_sequence('lesson_feature_changes', 'id')) - {RETENTION};
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# table -> its lesson id column
+LOGGED_TABLES = {'lessons': 'id', 'lesson_tags': 'lesson_id', 'lesson_terms': 'lesson_id'}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'lesson_feature_changes',
+        sa.Column('id', sa.BigInteger(), primary_key=True),
+        sa.Column('lesson_id', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+    op.execute(LOG_FUNCTION)
+
+    for table, column in LOGGED_TABLES.items():
+        for event, referencing in (
+            ('INSERT', 'NEW TABLE AS new_rows'),
+            ('UPDATE', 'NEW TABLE AS new_rows OLD TABLE AS old_rows'),
+            ('DELETE', 'OLD TABLE AS old_rows'),
+        ):
+            op.execute(
+                f"CREATE TRIGGER {table}_features_{event.lower()} AFTER {event} ON {table} "
+                f"REFERENCING {referencing} FOR EACH STATEMENT "
+                f"EXECUTE FUNCTION log_lesson_feature_changes('{column}')"
+            )
+        op.execute(
+            f"CREATE TRIGGER {table}_features_truncate AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION log_lesson_feature_changes('{column}')"
+        )
+
+
+def downgrade() -> None:
+    for table in LOGGED_TABLES:
+        for event in ('insert', 'update', 'delete', 'truncate'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_features_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS log_lesson_feature_changes()")
+    op.drop_table('lesson_feature_changes')
@@ -0,0 +1,163 @@
+"""
+Batched ``INSERT ... ON CONFLICT DO UPDATE`` for the bulk endpoints.
+
+Every batch of up to ``BULK_BATCH_SIZE`` rows is a single multi-row INSERT
+whose RETURNING clause reports each row's id and whether it was inserted or
+updated (``xmax = 0`` only holds for freshly inserted tuples). Batches run in
+savepoints, so a batch the database rejects is reported per item without
+losing the batches that succeeded.
+
+Columns passed as ``immutable`` are never rewritten: a row matching an
+existing one that differs in them is left alone (``DO UPDATE ... WHERE``
+returns nothing for it) and reported as an item error.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Type
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import Base
+
+CREATED = "created"
+UPDATED = "updated"
+ERROR = "error"
+
+
+def _error(index: int, detail: str) -> dict:
+    return {"index": index, "status": ERROR, "id": None, "detail": detail}
+
+
+def _database_error(exc: DBAPIError) -> str:
+    # asyncpg errors arrive wrapped; the driver's own message is the readable one
+    orig = exc.orig.__cause__ or exc.orig
+    return str(orig).splitlines()[0]
+
+
+async def _missing_references(
+    db: AsyncSession,
+    rows: Mapping[int, Dict[str, Any]],
+    references: Mapping[str, Type[Base]],
+) -> Dict[int, str]:
+    """Find rows whose foreign keys point nowhere, one query per referenced model."""
+    errors: Dict[int, str] = {}
+    for field, model in references.items():
+        wanted = {row[field] for row in rows.values() if row.get(field) is not None}
+        if not wanted:
+            continue
+        result = await db.execute(select(model.id).where(model.id.in_(wanted)))
+        found = set(result.scalars())
+        for index, row in rows.items():
+            value = row.get(field)
+            if value is not None and value not in found and index not in errors:
+                errors[index] = f"{model.__name__} with id {value} not found"
+    return errors
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Type[Base],
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    constraint: Optional[str] = None,
+    references: Optional[Mapping[str, Type[Base]]] = None,
+    immutable: Sequence[str] = (),
+) -> dict:
+    """
+    Insert ``rows`` into ``model``'s table, updating rows that already exist.
+
+    Existing rows are matched on ``conflict_columns``, using the unique
+    ``constraint`` when given and a unique index on those columns otherwise.
+    ``references`` maps foreign key fields to the models they point at so
+    dangling references are reported as item errors. Existing rows whose
+    ``immutable`` columns differ from the item's, such as a slug matched in
+    another language, are reported as item errors instead of being updated.
+    Returns a `BulkResponse`-shaped dict; the caller commits.
+    """
+    if len(rows) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request",
+        )
+
+    results: List[Optional[dict]] = [None] * len(rows)
+
+    # A statement cannot update the same row twice, so repeated keys are
+    # rejected up front
+    first_index: Dict[tuple, int] = {}
+    for index, row in enumerate(rows):
+        key = tuple(row[column] for column in conflict_columns)
+        if key in first_index:
+            results[index] = _error(index, f"Duplicate of item {first_index[key]}")
+        else:
+            first_index[key] = index
+
+    pending = {index: rows[index] for index in first_index.values()}
+    for index, detail in (await _missing_references(db, pending, references or {})).items():
+        results[index] = _error(index, detail)
+        del pending[index]
+
+    table = model.__table__
+    key_columns = [table.c[column] for column in conflict_columns]
+    indexes = list(pending)
+    for start in range(0, len(indexes), settings.BULK_BATCH_SIZE):
+        batch = indexes[start:start + settings.BULK_BATCH_SIZE]
+        values = [pending[index] for index in batch]
+
+        stmt = insert(table).values(values)
+        updates = {
+            name: stmt.excluded[name]
+            for name in values[0]
+            if name not in conflict_columns and name not in immutable
+        }
+        updates["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            constraint=constraint,
+            index_elements=None if constraint else list(conflict_columns),
+            set_=updates,
+            where=and_(*(table.c[name] == stmt.excluded[name] for name in immutable))
+            if immutable
+            else None,
+        ).returning(table.c.id, *key_columns, literal_column("xmax = 0").label("inserted"))
+
+        try:
+            async with db.begin_nested():
+                returned = (await db.execute(stmt)).all()
+        except DBAPIError as exc:
+            detail = _database_error(exc)
+            for index in batch:
+                results[index] = _error(index, detail)
+            continue
+
+        for row in returned:
+            index = first_index[tuple(row[1:-1])]
+            results[index] = {
+                "index": index,
+                "status": CREATED if row.inserted else UPDATED,
+                "id": row.id,
+                "detail": None,
+            }
+        # Matched an existing row whose immutable columns differ
+        for index in batch:
+            if results[index] is None:
+                results[index] = _error(
+                    index, f"An existing item with this key has a different {', '.join(immutable)}"
+                )
+
+    counts = {CREATED: 0, UPDATED: 0, ERROR: 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "created": counts[CREATED],
+        "updated": counts[UPDATED],
+        "failed": counts[ERROR],
+        "results": results,
+    }
+
+
+def updated_ids(response: dict) -> List[int]:
+    """Ids of the existing rows a bulk upsert changed, for cache invalidation."""
+    return [result["id"] for result in response["results"] if result["status"] == UPDATED]
@@ -0,0 +1,317 @@
+"""
+In-process cache of encoded JSON responses for catalog reads.
+
+Entries are keyed by request path and normalized query string and hold the
+final response bytes together with the ETag they were built under, so a hit
+skips the ORM and pydantic work entirely. Each entry carries tags such as
+``fabrics:lang:ru`` or ``fabrics:id:12``; write handlers invalidate the tags
+they affect.
+
+Before every read the current ETag is derived from the content version
+stamps (one primary-key lookup). A request whose ``If-None-Match`` matches
+gets a 304, and a cached body built under an older ETag is treated as a
+miss, so writes made by other workers or processes are never served stale.
+
+Entries also keep their gzip and brotli variants, compressed on first
+request for that encoding, so hits are never recompressed. Each variant is
+sent with its own ETag, the entry's with an encoding suffix.
+"""
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import Levels, compress, negotiate, route_levels, set_encoding
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, registry
+from app.core.versioning import Stamp, etag_matches, get_versions, make_etag, not_modified
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+    tags: frozenset
+    # Content-Encoding -> compressed body
+    variants: Dict[str, bytes]
+
+
+class CacheLookup(NamedTuple):
+    """Result of `lookup`: ``response`` is set when the request is already served."""
+
+    key: str
+    etag: str
+    response: Optional[Response]
+    # negotiated Content-Encoding, and the levels for this route
+    encoding: Optional[str] = None
+    levels: Optional[Levels] = None
+    # the request's If-None-Match, for ``*`` once the resource is found
+    if_none_match: Optional[str] = None
+
+
+class ResponseCache:
+    """LRU cache of response bodies bounded by entry count, bytes and TTL."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        """Return the body cached for ``key`` under ``etag``, or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.etag != etag:
+            self._remove(key)
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.body
+
+    def set(self, key: str, body: bytes, etag: str, tags: Iterable[str]) -> None:
+        """Store ``body`` under ``key``, evicting least recently used entries."""
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        entry = _Entry(body, etag, time.monotonic() + self.ttl_seconds, frozenset(tags), {})
+        self._entries[key] = entry
+        self.size_bytes += len(body)
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._evict()
+
+    def get_variant(self, key: str, encoding: str) -> Optional[bytes]:
+        """The ``encoding`` variant of the body cached for ``key``, if stored."""
+        entry = self._entries.get(key)
+        return entry.variants.get(encoding) if entry is not None else None
+
+    def set_variant(self, key: str, encoding: str, body: bytes) -> None:
+        """Store the ``encoding`` variant of the body cached for ``key``."""
+        entry = self._entries.get(key)
+        if entry is None or encoding in entry.variants:
+            return
+        entry.variants[encoding] = body
+        self.size_bytes += len(body)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``; returns the number removed."""
+        removed = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size_bytes -= len(entry.body) + sum(map(len, entry.variants.values()))
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+registry.collect(
+    Counter("response_cache_lookups_total", "Response cache lookups, by result."),
+    lambda: [
+        ({"result": "hit"}, response_cache.hits),
+        ({"result": "miss"}, response_cache.misses),
+    ],
+)
+registry.collect(
+    Counter("response_cache_removals_total", "Response cache entries dropped, by reason."),
+    lambda: [
+        ({"reason": "eviction"}, response_cache.evictions),
+        ({"reason": "expiration"}, response_cache.expirations),
+        ({"reason": "invalidation"}, response_cache.invalidations),
+    ],
+)
+registry.collect(
+    Gauge("response_cache_bytes", "Size of the cached response bodies and variants."),
+    lambda: [({}, response_cache.size_bytes)],
+)
+
+
+def resource_tag(resource: str) -> str:
+    """Tag carried by every cached response of ``resource``."""
+    return f"{resource}:*"
+
+
+def list_tag(resource: str, language: Optional[str]) -> str:
+    """Tag for ``resource`` lists in ``language`` (``None`` = all languages)."""
+    return f"{resource}:lang:{language or '*'}"
+
+
+def item_tag(resource: str, item_id: int) -> str:
+    """Tag for the detail response of a single ``resource`` row."""
+    return f"{resource}:id:{item_id}"
+
+
+def request_key(request: Request) -> str:
+    """Cache key for a GET request: path plus sorted query parameters."""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+async def lookup(request: Request, db: AsyncSession, *stamps: Stamp) -> CacheLookup:
+    """
+    Resolve a catalog GET against its version stamps and the response cache.
+
+    ``stamps`` name the ``(table, language)`` pairs the response depends on.
+    The returned ``response`` is a 304 or a cached 200 when the handler can
+    return immediately, otherwise ``None``. ``If-None-Match: *`` gets a 304
+    only once the resource is known to exist: on a cache hit here, otherwise
+    in `store_response`.
+    """
+    key = request_key(request)
+    etag = make_etag(key, await get_versions(db, stamps))
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    levels = route_levels(request.url.path)
+    if_none_match = request.headers.get("if-none-match")
+
+    matched = etag_matches(if_none_match, etag, exists=False)
+    if matched:
+        return CacheLookup(key, etag, not_modified(matched), encoding, levels)
+
+    cache_lookup = CacheLookup(key, etag, None, encoding, levels, if_none_match)
+    if settings.RESPONSE_CACHE_ENABLED:
+        body = response_cache.get(key, etag)
+        if body is not None:
+            matched = etag_matches(if_none_match, etag)
+            if matched:
+                return cache_lookup._replace(response=not_modified(matched))
+            response = _with_etag(Response(content=body, media_type=JSON_MEDIA_TYPE), etag)
+            _encode(cache_lookup, response)
+            return cache_lookup._replace(response=response)
+
+    return cache_lookup
+
+
+def _encode(cache_lookup: CacheLookup, response: Response) -> None:
+    """Swap ``response``'s cached body for its negotiated compressed variant."""
+    body = bytes(response.body)
+    if cache_lookup.encoding is None or len(body) < settings.COMPRESSION_MIN_SIZE:
+        return
+    variant = response_cache.get_variant(cache_lookup.key, cache_lookup.encoding)
+    if variant is None:
+        variant = compress(body, cache_lookup.encoding, cache_lookup.levels)
+        response_cache.set_variant(cache_lookup.key, cache_lookup.encoding, variant)
+    response.body = variant
+    set_encoding(response.headers, cache_lookup.encoding, len(variant))
+
+
+def store_response(
+    cache_lookup: CacheLookup, response: Response, resource: str, *tags: str
+) -> Response:
+    """
+    Cache ``response``'s body with ``tags``, attach its ETag and return it.
+
+    Returns a 304 instead when the request sent ``If-None-Match: *``.
+    """
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.set(
+            cache_lookup.key,
+            bytes(response.body),
+            cache_lookup.etag,
+            (resource_tag(resource), *tags),
+        )
+    matched = etag_matches(cache_lookup.if_none_match, cache_lookup.etag)
+    if matched:
+        return not_modified(matched)
+    _with_etag(response, cache_lookup.etag)
+    if settings.RESPONSE_CACHE_ENABLED:
+        _encode(cache_lookup, response)
+    return response
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def json_response(schema: Any, data: Any) -> Response:
+    """Validate ``data`` against ``schema`` and encode it to a JSON response."""
+    adapter = _type_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+
+def invalidate(resource: str, language: Optional[str], *item_ids: int) -> None:
+    """Invalidate ``resource`` lists in ``language`` and the given details."""
+    tags = [list_tag(resource, language), list_tag(resource, None)]
+    tags.extend(item_tag(resource, item_id) for item_id in item_ids)
+    response_cache.invalidate(*tags)
+
+
+def invalidate_resource(resource: str) -> None:
+    """Invalidate every cached response of ``resource``."""
+    response_cache.invalidate(resource_tag(resource))
@@ -0,0 +1,298 @@
+"""
+gzip and brotli response compression.
+
+Three paths share the negotiation and level settings here:
+
+* cached API responses store each compressed variant next to the identity
+  body in the response cache (`app.core.cache`), so a hot list is compressed
+  once per encoding, not once per request;
+* static files and ``index.html`` are compressed once per file version at
+  the highest levels and kept in `static_variants`;
+* everything else passes through `CompressionMiddleware`, which compresses
+  on the fly, streaming responses included.
+
+Bodies under ``COMPRESSION_MIN_SIZE`` bytes and responses that already carry
+a ``Content-Encoding`` are sent as they are. Levels default to
+``COMPRESSION_GZIP_LEVEL`` / ``COMPRESSION_BROTLI_LEVEL`` and can be tuned per
+path prefix with ``COMPRESSION_ROUTE_LEVELS``.
+"""
+import os
+import zlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+GZIP = "gzip"
+BROTLI = "br"
+# Preference when the client accepts both equally
+ENCODINGS = (BROTLI, GZIP)
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+class Levels(NamedTuple):
+    gzip: int
+    brotli: int
+
+
+DEFAULT_LEVELS = Levels(settings.COMPRESSION_GZIP_LEVEL, settings.COMPRESSION_BROTLI_LEVEL)
+# Static files are compressed once per version, so they get the best ratio
+STATIC_LEVELS = Levels(9, 11)
+
+
+def route_levels(path: str) -> Levels:
+    """Levels for ``path``: the longest matching ``COMPRESSION_ROUTE_LEVELS`` prefix."""
+    matches = [prefix for prefix in settings.COMPRESSION_ROUTE_LEVELS if path.startswith(prefix)]
+    if not matches:
+        return DEFAULT_LEVELS
+    override = settings.COMPRESSION_ROUTE_LEVELS[max(matches, key=len)]
+    return Levels(
+        override.get(GZIP, DEFAULT_LEVELS.gzip), override.get(BROTLI, DEFAULT_LEVELS.brotli)
+    )
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from an ``Accept-Encoding`` header, or ``None``."""
+    if not accept_encoding or not settings.COMPRESSION_ENABLED:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), -position, encoding)
+        for position, encoding in enumerate(ENCODINGS)
+    ]
+    weight, _, encoding = max(candidates)
+    return encoding if weight > 0 else None
+
+
+def compressible(media_type: Optional[str]) -> bool:
+    return bool(media_type) and media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, levels: Levels) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=levels.brotli)
+    compressor = zlib.compressobj(levels.gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class StreamCompressor:
+    """Incremental compressor for streaming bodies."""
+
+    def __init__(self, encoding: str, levels: Levels):
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=levels.brotli)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(levels.gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(chunk)
+        return self._zlib.compress(chunk)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of ``etag``'s representation in ``encoding``: ``"<hash>-br"``."""
+    # Starlette's FileResponse sends its ETags unquoted
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+
+def decoded_etag(etag: str) -> str:
+    """``etag`` without the suffix added by `encoded_etag`."""
+    quote = '"' if etag.endswith('"') else ""
+    for encoding in ENCODINGS:
+        suffix = f"-{encoding}{quote}"
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + quote
+    return etag
+
+
+def set_encoding(headers: MutableHeaders, encoding: Optional[str], length: Optional[int]) -> None:
+    """
+    Mark ``headers`` as carrying a body in ``encoding`` of ``length`` bytes.
+
+    A strong ETag must differ between the identity and compressed bodies, so
+    an ``ETag`` already in ``headers`` gets the encoding suffix.
+    """
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], encoding)
+    if length is None:
+        del headers["Content-Length"]
+    else:
+        headers["Content-Length"] = str(length)
+    headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """Compress responses the cache and static paths have not already encoded."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _Responder(send, encoding, route_levels(scope["path"]))
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    def __init__(self, send: Send, encoding: str, levels: Levels):
+        self._send = send
+        self.encoding = encoding
+        self.levels = levels
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # held back until the first body chunk shows whether to compress
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not compressible(headers.get("content-type"))
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if self.passthrough or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE):
+                if not self.passthrough:
+                    headers.add_vary_header("Accept-Encoding")
+                self.passthrough = True
+            elif not more_body:
+                body = compress(body, self.encoding, self.levels)
+                set_encoding(headers, self.encoding, len(body))
+                self.passthrough = True
+            else:
+                self.compressor = StreamCompressor(self.encoding, self.levels)
+                set_encoding(headers, self.encoding, None)
+            await self._send(start)
+
+        if self.compressor is not None:
+            body = self.compressor.compress(body)
+            if not more_body:
+                body += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+
+class _StaticVariant(NamedTuple):
+    mtime: float
+    size: int
+    body: bytes
+
+
+# (path, encoding) -> compressed file, replaced when the file changes
+static_variants: Dict[Tuple[str, str], _StaticVariant] = {}
+
+
+def static_file_response(
+    path: str, scope: Scope, response: Response, stat_result: os.stat_result
+) -> Response:
+    """
+    Swap a 200 ``FileResponse`` for its precompressed variant when negotiated.
+
+    The file is compressed on first use and again only when its mtime or size
+    changes. ``Last-Modified`` is kept from ``response``, and its ``ETag``
+    with the encoding suffix.
+    """
+    if response.status_code != 200 or stat_result.st_size < settings.COMPRESSION_MIN_SIZE:
+        return response
+    if not compressible(response.media_type):
+        return response
+    encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+    if encoding is None:
+        response.headers.append("Vary", "Accept-Encoding")
+        return response
+
+    key = (str(path), encoding)
+    variant = static_variants.get(key)
+    if variant is None or (variant.mtime, variant.size) != (
+        stat_result.st_mtime,
+        stat_result.st_size,
+    ):
+        with open(path, "rb") as f:
+            body = compress(f.read(), encoding, STATIC_LEVELS)
+        variant = _StaticVariant(stat_result.st_mtime, stat_result.st_size, body)
+        static_variants[key] = variant
+
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name in ("etag", "last-modified", "cache-control")
+    }
+    compressed = Response(
+        content=b"" if scope["method"] == "HEAD" else variant.body,
+        media_type=response.media_type,
+        headers=headers,
+    )
+    set_encoding(compressed.headers, encoding, len(variant.body))
+    return compressed
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """`StaticFiles` that serves compressed files from `static_variants`."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, method=scope["method"]
+        )
+        response = static_file_response(full_path, scope, response, stat_result)
+        # compared against the variant's ETag, which carries the encoding suffix
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompressed_file(path: str, scope: Scope) -> Response:
+    """Serve one file, such as ``index.html``, through `static_variants`."""
+    stat_result = os.stat(path)
+    response = FileResponse(path, stat_result=stat_result, method=scope["method"])
+    return static_file_response(path, scope, response, stat_result)
@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from sqlalchemy.pool import NullPool
+from typing import Any, Dict, Optional
+from uuid import uuid4
 
 
 class Settings(BaseSettings):
@@ -17,6 +19,100 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
 
+    # Database engine, per worker process: each worker holds up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # prepared statements cached per connection
+    # Behind PgBouncer in transaction mode: no statement cache, no app-side pool
+    DB_PGBOUNCER: bool = False
+    # Connections all workers of one server may hold together; scripts/serve.py
+    # refuses to start when SERVER_WORKERS x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # exceeds it. Keep the sum over servers below Postgres' max_connections.
+    DB_CONNECTION_BUDGET: int = 40
+    # Startup: connections each worker opens (and primes the statement cache
+    # of) before serving, capped at DB_POOL_SIZE; 0 opens them lazily. With
+    # DB_WARMUP_INDEXES the graph and related-lesson indexes are loaded too.
+    DB_WARMUP_CONNECTIONS: int = 4
+    DB_WARMUP_INDEXES: bool = True
+    # /ready fails when a database round trip takes longer than this
+    READY_TIMEOUT_SECONDS: float = 2.0
+
+    # Per-request SQL instrumentation: Server-Timing header, and budget
+    # checks that log requests running more than QUERY_BUDGET statements or
+    # the same statement more than QUERY_REPEAT_LIMIT times (N+1 queries);
+    # checks default to on when DEBUG is
+    SERVER_TIMING_ENABLED: bool = True
+    QUERY_BUDGET_CHECKS: Optional[bool] = None
+    QUERY_BUDGET: int = 12
+    QUERY_REPEAT_LIMIT: int = 3
+
+    # Production server (scripts/serve.py): SERVER_WORKERS processes, each
+    # with its own connection pool; keep-alive above the load balancer's
+    # idle timeout, and up to SERVER_GRACEFUL_SHUTDOWN_SECONDS to drain
+    # requests on SIGTERM
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 2
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 75
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    # When set, each worker also serves its own /metrics on a port of
+    # WORKER_METRICS_PORT .. WORKER_METRICS_PORT + SERVER_WORKERS - 1
+    WORKER_METRICS_PORT: Optional[int] = None
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    EXACT_COUNT_THRESHOLD: int = 10000
+
+    # Search
+    SEARCH_LIMIT_DEFAULT: int = 20
+    SEARCH_LIMIT_MAX: int = 100
+    AUTOCOMPLETE_LIMIT_DEFAULT: int = 10
+    AUTOCOMPLETE_LIMIT_MAX: int = 25
+    AUTOCOMPLETE_SIMILARITY_THRESHOLD: float = 0.4
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+
+    # Compression (gzip / brotli)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    # path prefix -> {"gzip": level, "br": level}, e.g. a JSON object in the env
+    COMPRESSION_ROUTE_LEVELS: Dict[str, Dict[str, int]] = {"/api/export": {"br": 2}}
+
+    # Bulk upserts
+    BULK_BATCH_SIZE: int = 500
+    BULK_MAX_ITEMS: int = 5000
+
+    # Export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Import
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 100
+
+    # Related lessons
+    RELATED_TOP_K: int = 10
+    RELATED_TAG_WEIGHT: float = 1.0
+    RELATED_TERM_WEIGHT: float = 0.5
+
+    # Lesson rendering
+    RENDER_BATCH_SIZE: int = 200
+
+    # Glossary linking
+    GLOSSARY_LINK_BATCH_SIZE: int = 200
+
     @property
     def database_url(self) -> str:
         """Construct async PostgreSQL connection URL."""
@@ -25,6 +121,44 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    def database_connections(self, workers: int) -> int:
+        """Most connections ``workers`` worker processes hold at once (0 behind PgBouncer)."""
+        if self.DB_PGBOUNCER:
+            return 0
+        return workers * (self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW)
+
+    @property
+    def query_budget_checks(self) -> bool:
+        return self.DEBUG if self.QUERY_BUDGET_CHECKS is None else self.QUERY_BUDGET_CHECKS
+
+    @property
+    def database_engine_options(self) -> Dict[str, Any]:
+        """Keyword arguments for ``create_async_engine`` from the DB_* settings."""
+        if self.DB_PGBOUNCER:
+            # A transaction-mode pooler hands each transaction a different
+            # server connection, so prepared statements must not outlive one
+            return {
+                "echo": self.DB_ECHO,
+                "poolclass": NullPool,
+                "connect_args": {
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+                },
+            }
+        return {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "connect_args": {
+                "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            },
+        }
+
     @property
     def database_url_sync(self) -> str:
         """Construct sync PostgreSQL connection URL for Alembic."""
@@ -1,13 +1,32 @@
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
+from app.core.metrics import Counter, Gauge, TimedCheckout, instrument_engine, registry
 
-# Create async engine
+
+class TimedQueuePool(TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(TimedCheckout, NullPool):
+    pass
+
+
+# Create async engine; pool and statement cache come from the DB_* settings,
+# with pools that report checkout wait times
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.DEBUG,
     future=True,
+    **{
+        **settings.database_engine_options,
+        "poolclass": TimedNullPool if settings.DB_PGBOUNCER else TimedQueuePool,
+    },
 )
+instrument_engine(engine.sync_engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -21,6 +40,61 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for all models
 Base = declarative_base()
 
+# Pool event counters since startup, reported by `pool_stats`
+_pool_events = {"connects": 0, "checkouts": 0, "invalidations": 0}
+
+
+def _counter(name: str):
+    def count(*args) -> None:
+        _pool_events[name] += 1
+
+    return count
+
+
+event.listen(engine.sync_engine, "connect", _counter("connects"))
+event.listen(engine.sync_engine, "checkout", _counter("checkouts"))
+event.listen(engine.sync_engine, "invalidate", _counter("invalidations"))
+
+
+def pool_stats() -> dict:
+    """Connection pool occupancy and counters for this worker process."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "pgbouncer": settings.DB_PGBOUNCER, **_pool_events}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            open=pool.checkedin() + pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
+registry.collect(
+    Gauge("db_pool_connections", "Open pooled connections, by state."),
+    lambda: [
+        ({"state": state}, value)
+        for state, value in pool_stats().items()
+        if state in ("checked_in", "checked_out")
+    ],
+)
+registry.collect(
+    Counter("db_pool_events_total", "Pool connects, checkouts and invalidations."),
+    lambda: [({"event": name}, value) for name, value in _pool_events.items()],
+)
+
+
+async def commit_unique(db: AsyncSession, detail: str) -> None:
+    """Commit ``db``, answering 409 with ``detail`` if a unique constraint is violated."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
 
 # Dependency to get DB session
 async def get_db():
@@ -0,0 +1,333 @@
+"""
+Glossary linking: find every term of a lesson's language in its content.
+
+Each language gets an Aho–Corasick automaton over its ``Term.term`` values,
+so linking a lesson is one pass over its content however many terms there
+are. Matching is case-insensitive and on whole words; where matches overlap
+the longest leftmost one wins. The result is written to ``lesson_terms``
+together with each term's ``[start, end)`` character offsets into
+``Lesson.content``, for inline tooltips.
+
+Automata are cached per language and updated only for a language whose
+``terms`` counter in ``content_versions`` moved. The update re-reads the
+language's terms, the cheap part, and patches a copy of the cached trie:
+added and renamed terms are inserted, removed ones unmarked, and only the
+failure links and merged outputs are recomputed, one pass over the states.
+Unmarked states stay in the trie until removals outnumber the live terms,
+when the automaton is built from scratch. Building, patching and matching
+are CPU-bound and run in the thread pool.
+"""
+import asyncio
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import String, cast, column, delete, func, insert, or_, select, values
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.search import escape_like, text_search_config
+from app.core.versioning import get_versions
+from app.models.associations import lesson_terms
+from app.models.lesson import Lesson
+from app.models.term import Term
+
+# (start, end, term id)
+Match = Tuple[int, int, int]
+
+# Terms looked up per candidate query in `term_lessons`
+CANDIDATE_TERMS_PER_QUERY = 100
+
+
+def normalize(text: str) -> str:
+    """Lower-case ``text`` without changing its length, so offsets carry over."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class Automaton:
+    """Aho–Corasick automaton over normalized patterns."""
+
+    def __init__(self, patterns: Dict[str, int]):
+        self.goto: List[Dict[str, int]] = [{}]
+        # (pattern length, term id) of the pattern spelled by the state, if any
+        self.ends: List[Optional[Tuple[int, int]]] = [None]
+        self.fail: List[int] = []
+        # (pattern length, term id) for every pattern ending in the state
+        self.output: List[List[Tuple[int, int]]] = []
+        self.patterns: Dict[str, int] = {}
+        # patterns unmarked by `patched` since the last full build
+        self.removed = 0
+        for pattern, term_id in patterns.items():
+            self._add(pattern, term_id)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.goto)
+
+    def patched(self, patterns: Dict[str, int]) -> "Automaton":
+        """
+        A copy of the automaton over ``patterns``, built from this one.
+
+        Only the patterns that changed touch the trie; the failure links are
+        then recomputed. The automaton itself is left as it is, since other
+        threads may be matching with it.
+        """
+        removed = [pattern for pattern in self.patterns if pattern not in patterns]
+        if self.removed + len(removed) > len(patterns):
+            return Automaton(patterns)
+        copy = Automaton.__new__(Automaton)
+        copy.goto = [dict(edges) for edges in self.goto]
+        copy.ends = list(self.ends)
+        copy.patterns = dict(self.patterns)
+        copy.removed = self.removed + len(removed)
+        for pattern in removed:
+            copy._remove(pattern)
+        for pattern, term_id in patterns.items():
+            if copy.patterns.get(pattern) != term_id:
+                copy._add(pattern, term_id)
+        copy._link()
+        return copy
+
+    def _add(self, pattern: str, term_id: int) -> None:
+        state = 0
+        for char in pattern:
+            following = self.goto[state].get(char)
+            if following is None:
+                following = len(self.goto)
+                self.goto[state][char] = following
+                self.goto.append({})
+                self.ends.append(None)
+            state = following
+        self.ends[state] = (len(pattern), term_id)
+        self.patterns[pattern] = term_id
+
+    def _remove(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            state = self.goto[state][char]
+        self.ends[state] = None
+        del self.patterns[pattern]
+
+    def _link(self) -> None:
+        self.fail = [0] * len(self.goto)
+        self.output = [[end] if end is not None else [] for end in self.ends]
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(char, 0)
+                self.output[following] = (
+                    self.output[following] + self.output[self.fail[following]]
+                )
+
+    def find(self, text: str) -> List[Match]:
+        """Whole-word, non-overlapping matches in ``text``, longest leftmost first."""
+        normalized = normalize(text)
+        found: List[Match] = []
+        state = 0
+        for index, char in enumerate(normalized):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, term_id in self.output[state]:
+                start, end = index - length + 1, index + 1
+                if (start == 0 or not normalized[start - 1].isalnum()) and (
+                    end == len(normalized) or not normalized[end].isalnum()
+                ):
+                    found.append((start, end, term_id))
+
+        found.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected: List[Match] = []
+        covered = 0
+        for match in found:
+            if match[0] >= covered:
+                selected.append(match)
+                covered = match[1]
+        return selected
+
+
+def term_offsets(automaton: Automaton, content: str) -> Dict[int, List[List[int]]]:
+    """``{term id: [[start, end], ...]}`` for the terms found in ``content``."""
+    offsets: Dict[int, List[List[int]]] = {}
+    for start, end, term_id in automaton.find(content):
+        offsets.setdefault(term_id, []).append([start, end])
+    return offsets
+
+
+async def _patterns(db: AsyncSession, language: str) -> Dict[str, int]:
+    """Normalized term -> term id for ``language``; the oldest term wins a tie."""
+    result = await db.execute(
+        select(Term.term, Term.id).where(Term.language == language).order_by(Term.id)
+    )
+    patterns: Dict[str, int] = {}
+    for term, term_id in result.tuples():
+        patterns.setdefault(normalize(term.strip()), term_id)
+    patterns.pop("", None)
+    return patterns
+
+
+class GlossaryIndex:
+    """Per-language automata, patched when that language's terms change."""
+
+    def __init__(self):
+        self.automata: Dict[str, Automaton] = {}
+        self.versions: Dict[str, int] = {}
+        self.builds = 0
+        self.patches = 0
+        self._lock = asyncio.Lock()
+
+    async def automaton(self, db: AsyncSession, language: str, cache: bool = True) -> Automaton:
+        """
+        The automaton over ``language``'s terms as ``db`` sees them.
+
+        Pass ``cache=False`` from a transaction that has written terms but not
+        committed yet: the automaton it sees may still be rolled back, so it
+        is built from the cached one but not kept.
+        """
+        (version,) = await get_versions(db, [("terms", language)])
+        if self.versions.get(language) == version:
+            return self.automata[language]
+        async with self._lock:
+            if self.versions.get(language) == version:
+                return self.automata[language]
+            patterns = await _patterns(db, language)
+            current = self.automata.get(language)
+            if current is None:
+                automaton = await run_in_threadpool(Automaton, patterns)
+                self.builds += 1
+            else:
+                automaton = await run_in_threadpool(current.patched, patterns)
+                self.patches += 1
+            if cache:
+                self.automata[language] = automaton
+                self.versions[language] = version
+        return automaton
+
+
+glossary_index = GlossaryIndex()
+
+
+def _match_all(automaton: Automaton, contents: List[str]) -> List[Dict[int, List[List[int]]]]:
+    return [term_offsets(automaton, content) for content in contents]
+
+
+async def term_lessons(
+    db: AsyncSession,
+    language: str,
+    terms: Iterable[str] = (),
+    term_ids: Iterable[int] = (),
+) -> List[int]:
+    """
+    Lessons in ``language`` whose links can change when terms change.
+
+    ``terms`` are the texts of added or renamed terms. A lesson can only gain
+    a link where a term's words appear in it, so candidates come from the
+    ``ix_lessons_search_vector`` index, the term as a phrase query. A term
+    made only of stop words has no query and is matched with ``ILIKE`` on
+    the content. The index follows the text search parser, so an occurrence
+    the parser reads as part of another token, such as a URL or e-mail
+    address, is missed here and linked by the next ``link_glossary.py`` run.
+
+    ``term_ids`` are renamed or removed terms: the lessons already linked to
+    them, where a shorter term they hid may now match.
+    """
+    found = set()
+    term_ids = list(term_ids)
+    if term_ids:
+        result = await db.execute(
+            select(lesson_terms.c.lesson_id).where(lesson_terms.c.term_id.in_(term_ids))
+        )
+        found.update(result.scalars())
+
+    terms = sorted({term.strip() for term in terms} - {""})
+    config = cast(text_search_config(language), REGCONFIG)
+    for start in range(0, len(terms), CANDIDATE_TERMS_PER_QUERY):
+        chunk = terms[start:start + CANDIDATE_TERMS_PER_QUERY]
+        listed = values(column("term", String), name="listed").data([(term,) for term in chunk])
+        result = await db.execute(
+            select(listed.c.term)
+            .where(func.numnode(func.phraseto_tsquery(config, listed.c.term)) == 0)
+        )
+        unindexed = set(result.scalars())
+        conditions = [
+            Lesson.content.ilike("%" + escape_like(term) + "%", escape="\\")
+            if term in unindexed
+            else Lesson.search_vector.op("@@")(func.phraseto_tsquery(config, term))
+            for term in chunk
+        ]
+        result = await db.execute(
+            select(Lesson.id).where(Lesson.language == language, or_(*conditions))
+        )
+        found.update(result.scalars())
+    return sorted(found)
+
+
+async def link_lessons(
+    db: AsyncSession,
+    lesson_ids: Optional[Iterable[int]] = None,
+    language: Optional[str] = None,
+    cache: bool = True,
+) -> int:
+    """
+    Re-link lessons to the glossary terms found in their content.
+
+    Covers every lesson, or only ``lesson_ids`` and/or ``language``, in
+    batches of ``GLOSSARY_LINK_BATCH_SIZE``. ``lesson_terms`` rows are only
+    rewritten for lessons whose terms or offsets changed. Returns the number
+    of lessons whose links changed; the caller commits. Pass ``cache=False``
+    when the transaction has written terms (see `GlossaryIndex.automaton`).
+    """
+    query = (
+        select(Lesson.id, Lesson.language, Lesson.content)
+        .order_by(Lesson.id)
+        .limit(settings.GLOSSARY_LINK_BATCH_SIZE)
+    )
+    if lesson_ids is not None:
+        query = query.where(Lesson.id.in_(list(lesson_ids)))
+    if language is not None:
+        query = query.where(Lesson.language == language)
+
+    changed_total = 0
+    last_id = 0
+    while True:
+        result = await db.execute(query.where(Lesson.id > last_id))
+        rows = result.all()
+        if not rows:
+            return changed_total
+        last_id = rows[-1].id
+
+        links: Dict[int, Dict[int, List[List[int]]]] = {}
+        for batch_language in {row.language for row in rows}:
+            batch = [row for row in rows if row.language == batch_language]
+            automaton = await glossary_index.automaton(db, batch_language, cache)
+            found = await run_in_threadpool(_match_all, automaton, [row.content for row in batch])
+            links.update(zip((row.id for row in batch), found))
+
+        existing: Dict[int, Dict[int, List[List[int]]]] = {row.id: {} for row in rows}
+        result = await db.execute(
+            select(lesson_terms.c.lesson_id, lesson_terms.c.term_id, lesson_terms.c.offsets)
+            .where(lesson_terms.c.lesson_id.in_(list(existing)))
+        )
+        for lesson_id, term_id, offsets in result.tuples():
+            existing[lesson_id][term_id] = offsets
+
+        changed = [lesson_id for lesson_id in links if links[lesson_id] != existing[lesson_id]]
+        if not changed:
+            continue
+        await db.execute(delete(lesson_terms).where(lesson_terms.c.lesson_id.in_(changed)))
+        values = [
+            {"lesson_id": lesson_id, "term_id": term_id, "offsets": offsets}
+            for lesson_id in changed
+            for term_id, offsets in links[lesson_id].items()
+        ]
+        if values:
+            await db.execute(insert(lesson_terms), values)
+        changed_total += len(changed)
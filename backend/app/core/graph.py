@@ -0,0 +1,167 @@
+"""
+In-memory adjacency index over the lesson–fabric and fabric–garment links.
+
+Both association tables are held as forward and reverse adjacency maps
+(``{id: {neighbour id: note}}``), so one- and two-hop traversals are dict
+lookups instead of chains of joins; only the nodes at the end of a walk are
+read from the database, by primary key.
+
+Each relation remembers the ``content_versions`` counter it was loaded at.
+`GraphIndex.refresh` compares those counters with the database (one
+primary-key lookup) and reloads only the relations another process changed.
+Writes made through the API update the maps in place instead: the handler
+locks the relation's counter, reads it before and after its statement and
+hands both to `GraphIndex.apply`, which applies the edge change when the
+index was loaded at the "before" counter and otherwise leaves the relation
+to be reloaded. (The counters cannot simply be compared to "loaded + 1": an
+``INSERT ... ON CONFLICT DO UPDATE`` fires both the insert and the update
+statement triggers.)
+"""
+import asyncio
+from typing import Dict, Optional
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.versioning import ALL_LANGUAGES, get_versions
+from app.models.content_version import ContentVersion
+from app.models.associations import fabric_garments, lesson_fabrics
+
+Adjacency = Dict[int, Dict[int, Optional[str]]]
+
+
+class Relation:
+    """Forward and reverse adjacency of one association table."""
+
+    def __init__(self, table: Table, source_key: str, target_key: str, note: str):
+        self.table = table
+        self.source_key = source_key
+        self.target_key = target_key
+        self.note = note
+        self.forward: Adjacency = {}
+        self.reverse: Adjacency = {}
+        self.version: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    async def load(self, db: AsyncSession, version: int) -> None:
+        columns = self.table.c
+        result = await db.execute(
+            select(columns[self.source_key], columns[self.target_key], columns[self.note])
+        )
+        forward: Adjacency = {}
+        reverse: Adjacency = {}
+        for source, target, note in result.tuples():
+            forward.setdefault(source, {})[target] = note
+            reverse.setdefault(target, {})[source] = note
+        self.forward, self.reverse, self.version = forward, reverse, version
+
+    def link(self, source: int, target: int, note: Optional[str]) -> None:
+        self.forward.setdefault(source, {})[target] = note
+        self.reverse.setdefault(target, {})[source] = note
+
+    def unlink(self, source: int, target: int) -> None:
+        self.forward.get(source, {}).pop(target, None)
+        self.reverse.get(target, {}).pop(source, None)
+
+    def targets(self, source: int) -> Dict[int, Optional[str]]:
+        return self.forward.get(source, {})
+
+    def sources(self, target: int) -> Dict[int, Optional[str]]:
+        return self.reverse.get(target, {})
+
+
+class GraphIndex:
+    """The relations served by the graph endpoints, kept in step with the database."""
+
+    def __init__(self, *relations: Relation):
+        self.relations = {relation.name: relation for relation in relations}
+        self.reloads = 0
+        self.incremental_updates = 0
+        self._lock = asyncio.Lock()
+
+    def __getitem__(self, name: str) -> Relation:
+        return self.relations[name]
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Reload every relation whose table changed since it was loaded."""
+        stamps = [(name, None) for name in self.relations]
+        versions = await get_versions(db, stamps)
+        stale = [
+            (relation, version)
+            for relation, version in zip(self.relations.values(), versions)
+            if relation.version != version
+        ]
+        if not stale:
+            return
+        async with self._lock:
+            for relation, version in stale:
+                # another request may have reloaded it while we waited
+                if relation.version != version:
+                    await relation.load(db, version)
+                    self.reloads += 1
+
+    async def write_version(self, db: AsyncSession, name: str) -> int:
+        """
+        Lock relation ``name``'s counter for the caller's transaction and return it.
+
+        Holding the lock until commit keeps other writers from moving the
+        counter between the caller's "before" and "after" reads.
+        """
+        result = await db.execute(
+            select(ContentVersion.version)
+            .where(
+                (ContentVersion.table_name == name)
+                & (ContentVersion.language == ALL_LANGUAGES)
+            )
+            .with_for_update()
+        )
+        return result.scalar_one_or_none() or 0
+
+    def apply(self, name: str, before: int, after: int, change) -> None:
+        """
+        Apply a committed edge ``change(relation)`` that moved the counter
+        from ``before`` to ``after``.
+
+        If the index was not loaded at ``before``, the relation is marked stale
+        and the next `refresh` reloads it instead.
+        """
+        relation = self.relations[name]
+        if relation.version is not None and relation.version == before:
+            change(relation)
+            relation.version = after
+            self.incremental_updates += 1
+        else:
+            relation.version = None
+
+    def stats(self) -> dict:
+        return {
+            "relations": {
+                name: {
+                    "version": relation.version,
+                    "sources": len(relation.forward),
+                    "edges": sum(len(targets) for targets in relation.forward.values()),
+                }
+                for name, relation in self.relations.items()
+            },
+            "reloads": self.reloads,
+            "incremental_updates": self.incremental_updates,
+        }
+
+
+graph_index = GraphIndex(
+    Relation(lesson_fabrics, "lesson_id", "fabric_id", "note"),
+    Relation(fabric_garments, "fabric_id", "garment_id", "usage_note"),
+)
+
+
+def two_hop(first: Relation, second: Relation, source: int) -> Adjacency:
+    """
+    Walk ``first`` then ``second`` from ``source``.
+
+    Returns ``{middle id: {end id: note on the second edge}}`` for every middle
+    node reached, including ones with no onward edges.
+    """
+    return {middle: dict(second.targets(middle)) for middle in first.targets(source)}
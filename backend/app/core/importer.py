@@ -0,0 +1,270 @@
+"""
+Streaming NDJSON import through a COPY-loaded staging table.
+
+Lines are validated against the resource's ``*Create`` schema in batches of
+``IMPORT_BATCH_SIZE`` and each batch is written with asyncpg's
+``copy_records_to_table`` into a temporary staging table, so the process only
+ever holds one batch. Once the stream ends, rows pointing at missing parents
+are dropped from the staging table and the rest are merged into the target
+with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``. Everything runs in
+the caller's transaction; nothing is visible until it commits.
+"""
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from asyncpg import PostgresError
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import JSON, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.glossary import link_lessons
+from app.core.rendering import render_stale_lessons
+from app.models.category import Category
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.models.term import Term
+from app.models.topic import Topic
+from app.schemas.category import CategoryCreate
+from app.schemas.fabric import FabricCreate
+from app.schemas.garment import GarmentCreate
+from app.schemas.lesson import LessonCreate
+from app.schemas.term import TermCreate
+from app.schemas.topic import TopicCreate
+
+STAGING_LINE_COLUMN = "import_line"
+
+
+class ImportTarget(NamedTuple):
+    model: Type[Base]
+    schema: Type[BaseModel]
+    # ON CONFLICT target clause and the unique key it enforces
+    conflict: str
+    key_columns: Tuple[str, ...]
+    # foreign key field -> referenced model
+    references: Dict[str, Type[Base]]
+
+
+IMPORT_TARGETS = {
+    "categories": ImportTarget(
+        Category, CategoryCreate, "(slug)", ("slug",), {"parent_id": Category}
+    ),
+    "topics": ImportTarget(
+        Topic, TopicCreate, "(slug)", ("slug",), {"category_id": Category}
+    ),
+    "lessons": ImportTarget(
+        Lesson, LessonCreate, "(slug)", ("slug",), {"topic_id": Topic}
+    ),
+    "fabrics": ImportTarget(
+        Fabric, FabricCreate, "ON CONSTRAINT uq_fabric_name_language", ("name", "language"), {}
+    ),
+    "garments": ImportTarget(
+        Garment, GarmentCreate, "ON CONSTRAINT uq_garment_name_language", ("name", "language"), {}
+    ),
+    "terms": ImportTarget(
+        Term, TermCreate, "ON CONSTRAINT uq_term_language", ("term", "language"), {}
+    ),
+}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without reading it whole."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def gunzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Decompress a gzip byte stream incrementally."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+class _Importer:
+    def __init__(self, session: AsyncSession, target: ImportTarget, language: str):
+        self.session = session
+        self.target = target
+        self.language = language
+        table = target.model.__table__
+        self.table = table.name
+        self.staging = f"import_{table.name}"
+        self.columns = [*target.schema.model_fields, "language"]
+        self.json_columns = {
+            name for name in self.columns if isinstance(table.c[name].type, JSON)
+        }
+        self.received = 0
+        self.staged = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def error(self, line: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    async def create_staging(self) -> None:
+        column_list = ", ".join(self.columns)
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE {self.staging} ON COMMIT DROP AS "
+            f"SELECT {column_list}, NULL::bigint AS {STAGING_LINE_COLUMN} "
+            f"FROM {self.table} WITH NO DATA"
+        ))
+
+    def record(self, line_number: int, line: bytes) -> Optional[tuple]:
+        try:
+            payload = json.loads(line)
+        except ValueError as exc:
+            self.error(line_number, f"Invalid JSON: {exc}")
+            return None
+        if not isinstance(payload, dict):
+            self.error(line_number, "Expected a JSON object")
+            return None
+        try:
+            item = self.target.schema.model_validate(payload)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            self.error(line_number, f"{location}: {first['msg']}")
+            return None
+
+        values: Dict[str, Any] = item.model_dump()
+        values["language"] = payload.get("language") or self.language
+        if not isinstance(values["language"], str) or len(values["language"]) != 2:
+            self.error(line_number, "language: must be a two-letter code")
+            return None
+        return (
+            *(
+                json.dumps(values[name]) if name in self.json_columns and values[name] is not None
+                else values[name]
+                for name in self.columns
+            ),
+            line_number,
+        )
+
+    async def copy(self, records: List[tuple]) -> None:
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            self.staging, records=records, columns=[*self.columns, STAGING_LINE_COLUMN]
+        )
+        self.staged += len(records)
+
+    async def load(self, lines: AsyncIterator[bytes]) -> None:
+        batch: List[tuple] = []
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            self.received += 1
+            record = self.record(line_number, line)
+            if record is not None:
+                batch.append(record)
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await self.copy(batch)
+                batch = []
+        if batch:
+            await self.copy(batch)
+
+    async def drop_dangling(self) -> None:
+        for field, model in self.target.references.items():
+            result = await self.session.execute(text(
+                f"DELETE FROM {self.staging} AS s WHERE s.{field} IS NOT NULL "
+                f"AND NOT EXISTS (SELECT 1 FROM {model.__tablename__} AS p WHERE p.id = s.{field}) "
+                f"RETURNING s.{STAGING_LINE_COLUMN}, s.{field}"
+            ))
+            for line, value in sorted(result.all()):
+                self.staged -= 1
+                self.error(line, f"{model.__name__} with id {value} not found")
+
+    def _compared(self, prefix: str, name: str) -> str:
+        # json has no equality operator; compare as jsonb
+        return f"{prefix}.{name}::jsonb" if name in self.json_columns else f"{prefix}.{name}"
+
+    async def merge(self) -> Tuple[int, int, int]:
+        if not self.staged:
+            return 0, 0, 0
+        column_list = ", ".join(self.columns)
+        key_list = ", ".join(self.target.key_columns)
+        changing = [name for name in self.columns if name not in self.target.key_columns]
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in changing)
+        current = ", ".join(self._compared(self.table, name) for name in changing)
+        incoming = ", ".join(self._compared("EXCLUDED", name) for name in changing)
+        # DISTINCT ON keeps the last line for each key, since one statement may
+        # not update a row twice. Rows whose values are unchanged are left
+        # alone, which keeps re-imports from rewriting every tuple and index.
+        result = await self.session.execute(text(
+            f"WITH source AS ("
+            f" SELECT DISTINCT ON ({key_list}) {column_list} FROM {self.staging}"
+            f" ORDER BY {key_list}, {STAGING_LINE_COLUMN} DESC"
+            f"), merged AS ("
+            f" INSERT INTO {self.table} ({column_list}) SELECT {column_list} FROM source"
+            f" ON CONFLICT {self.target.conflict}"
+            f" DO UPDATE SET {updates}, updated_at = now()"
+            f" WHERE ({current}) IS DISTINCT FROM ({incoming})"
+            f" RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted),"
+            f" (SELECT count(*) FROM source) FROM merged"
+        ))
+        created, updated, distinct = result.one()
+        return created, updated, distinct - created - updated
+
+
+async def import_ndjson(
+    session: AsyncSession, resource: str, lines: AsyncIterator[bytes], language: str = "en"
+) -> dict:
+    """
+    Import NDJSON ``lines`` into ``resource`` and return an `ImportResponse` dict.
+
+    Each line is a ``*Create`` object; ``language`` applies to lines without
+    their own. Existing rows are updated, matched on the same keys as the bulk
+    endpoints, unless every value is unchanged, and when a key repeats the
+    last line wins. Imported lessons are rendered and linked to the glossary,
+    and imported terms re-link every lesson. Lines that fail validation or
+    point at missing parents are reported and skipped. The caller commits.
+    """
+    target = IMPORT_TARGETS[resource]
+    importer = _Importer(session, target, language)
+    try:
+        await importer.create_staging()
+        await importer.load(lines)
+        await importer.drop_dangling()
+        created, updated, unchanged = await importer.merge()
+        if target.model is Lesson:
+            await link_lessons(session, await render_stale_lessons(session))
+        elif target.model is Term:
+            await link_lessons(session)
+    except (DBAPIError, PostgresError) as exc:
+        # e.g. a value longer than its column; the whole import is rolled back
+        orig = getattr(exc, "orig", exc)
+        message = str(getattr(orig, "__cause__", None) or orig).splitlines()[0]
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Import aborted: {message}",
+        )
+    importer.errors.sort(key=lambda error: error["line"])
+    return {
+        "resource": resource,
+        "received": importer.received,
+        "created": created,
+        "updated": updated,
+        "unchanged": unchanged,
+        "failed": importer.failed,
+        "errors": importer.errors,
+    }
@@ -0,0 +1,149 @@
+"""
+Relationship expansion for ``?include=`` on lesson, fabric and garment reads.
+
+Related rows are loaded the way ``selectinload`` does it, one query per
+relationship with the parent ids in an ``IN`` list, so a page costs one extra
+query per include however many rows it has. Queries go through the
+association tables directly because the relationships use ``secondary`` and
+would not expose the ``note``, ``usage_note`` and ``offsets`` columns.
+"""
+from typing import Dict, List, NamedTuple, Optional, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import JSON_MEDIA_TYPE, list_tag
+from app.core.projection import encode_json
+from app.core.versioning import Stamp
+from app.models.associations import (
+    fabric_garments,
+    lesson_fabrics,
+    lesson_garments,
+    lesson_tags,
+    lesson_terms,
+)
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.tag import Tag
+from app.models.term import Term
+from app.schemas.includes import (
+    FabricGarment,
+    GarmentFabric,
+    LessonFabric,
+    LessonGarment,
+    LessonTerm,
+)
+from app.schemas.tag import TagResponse
+
+
+class Include(NamedTuple):
+    association: Table
+    parent_key: str  # association column pointing at the row being expanded
+    child_key: str  # association column pointing at the related row
+    model: Type
+    resource: str
+    schema: Type[BaseModel]
+    note: Optional[str] = None  # association column returned with each related row
+
+
+LESSON_INCLUDES = {
+    "fabrics": Include(
+        lesson_fabrics, "lesson_id", "fabric_id", Fabric, "fabrics", LessonFabric, "note"
+    ),
+    "garments": Include(
+        lesson_garments, "lesson_id", "garment_id", Garment, "garments", LessonGarment, "note"
+    ),
+    "terms": Include(
+        lesson_terms, "lesson_id", "term_id", Term, "terms", LessonTerm, "offsets"
+    ),
+    "tags": Include(lesson_tags, "lesson_id", "tag_id", Tag, "tags", TagResponse),
+}
+FABRIC_INCLUDES = {
+    "garments": Include(
+        fabric_garments, "fabric_id", "garment_id", Garment, "garments", FabricGarment, "usage_note"
+    ),
+}
+GARMENT_INCLUDES = {
+    "fabrics": Include(
+        fabric_garments, "garment_id", "fabric_id", Fabric, "fabrics", GarmentFabric, "usage_note"
+    ),
+}
+
+_PARENT_LABEL = "include_parent_id"
+
+
+def resolve_includes(include: Optional[str], available: Dict[str, Include]) -> List[str]:
+    """Parse ``include=`` into relationship names, rejecting unknown ones."""
+    if not include:
+        return []
+    requested = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(available))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown includes: {', '.join(unknown)}",
+        )
+    return list(dict.fromkeys(requested))
+
+
+def include_stamps(names: List[str], available: Dict[str, Include]) -> List[Stamp]:
+    """Version stamps the included relationships add to a response's ETag."""
+    stamps: List[Stamp] = []
+    for name in names:
+        spec = available[name]
+        stamps.append((spec.association.name, None))
+        stamps.append((spec.resource, None))
+    return stamps
+
+
+def include_tags(names: List[str], available: Dict[str, Include]) -> List[str]:
+    """Cache tags that evict a response when an included resource changes."""
+    return [list_tag(available[name].resource, None) for name in names]
+
+
+async def load_includes(
+    db: AsyncSession, rows: List[dict], names: List[str], available: Dict[str, Include]
+) -> None:
+    """Attach each included relationship to ``rows`` in place."""
+    by_id = {row["id"]: row for row in rows}
+    for row in rows:
+        for name in names:
+            row[name] = []
+    if not by_id:
+        return
+
+    for name in names:
+        spec = available[name]
+        table = spec.model.__table__
+        parent = spec.association.c[spec.parent_key]
+        columns = [table.c[field] for field in spec.schema.model_fields if field != spec.note]
+        if spec.note:
+            columns.append(spec.association.c[spec.note])
+
+        child = spec.association.c[spec.child_key]
+        query = (
+            select(parent.label(_PARENT_LABEL), *columns)
+            .select_from(spec.association.join(table, table.c.id == child))
+            .where(parent.in_(list(by_id)))
+            .order_by(parent, table.c.id)
+        )
+        result = await db.execute(query)
+        for related in result.mappings():
+            by_id[related[_PARENT_LABEL]][name].append(
+                {field: related[field] for field in spec.schema.model_fields}
+            )
+
+
+async def expanded_item(
+    db: AsyncSession,
+    item,
+    schema: Type[BaseModel],
+    names: List[str],
+    available: Dict[str, Include],
+) -> Response:
+    """Encode one ORM row with its included relationships."""
+    data = schema.model_validate(item).model_dump()
+    await load_includes(db, [data], names, available)
+    return Response(content=encode_json(data), media_type=JSON_MEDIA_TYPE)
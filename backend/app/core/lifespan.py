@@ -0,0 +1,128 @@
+"""
+Worker startup and shutdown, and the readiness probe behind ``/ready``.
+
+On startup each worker opens ``DB_WARMUP_CONNECTIONS`` pooled connections
+(at most ``DB_POOL_SIZE``) at once, so the first burst of traffic after a
+deploy does not pay for connection setup, and runs the ``content_versions``
+lookup on each of them: every catalog GET starts with it, and asyncpg
+prepares statements per connection and per statement text, which for the
+lookup's ``IN`` list means per number of stamps. With ``DB_WARMUP_INDEXES``
+the in-memory graph and related-lesson indexes are loaded as well, instead of
+by the first request that needs them.
+
+A worker whose database is unreachable at startup still starts, logs the
+error and reports not ready; connections then open lazily as before. On
+shutdown the engine is disposed, closing the pooled connections.
+
+With ``WORKER_METRICS_PORT`` set, the worker's own metrics endpoint is
+started after warm-up and closed on shutdown (see `app.core.metrics`).
+"""
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Tuple
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, pool_stats
+from app.core.graph import graph_index
+from app.core.metrics import serve_worker_metrics
+from app.core.related import related_index
+from app.core.versioning import get_versions
+
+logger = logging.getLogger(__name__)
+
+# Stamp counts of the version lookups run by the catalog routes
+WARMUP_STAMP_COUNTS = (1, 2, 3)
+
+warmup_state = {"complete": False, "connections": 0, "seconds": None, "error": None}
+
+
+async def _prime(session: AsyncSession) -> None:
+    for count in WARMUP_STAMP_COUNTS:
+        await get_versions(session, [("lessons", None)] * count)
+
+
+async def warm_up() -> None:
+    """Open and prime the pooled connections, then load the in-memory indexes."""
+    started = time.perf_counter()
+    connections = 0
+    if isinstance(engine.pool, QueuePool):
+        connections = max(0, min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+    async with AsyncExitStack() as stack:
+        # each session keeps its connection until the stack closes, so the
+        # pool has to open a new one for every session
+        sessions = [
+            await stack.enter_async_context(AsyncSessionLocal()) for _ in range(connections)
+        ]
+        await asyncio.gather(*(_prime(session) for session in sessions))
+    if settings.DB_WARMUP_INDEXES:
+        async with AsyncSessionLocal() as session:
+            await graph_index.refresh(session)
+            await related_index.refresh(session)
+    warmup_state.update(connections=connections, seconds=round(time.perf_counter() - started, 3))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await warm_up()
+    except Exception as exc:
+        warmup_state["error"] = repr(exc)
+        logger.error("Database warm-up failed: %r", exc)
+    else:
+        logger.info(
+            "Warmed %d database connections in %.3fs",
+            warmup_state["connections"],
+            warmup_state["seconds"],
+        )
+    warmup_state["complete"] = True
+    metrics_server = None
+    if settings.WORKER_METRICS_PORT is not None:
+        metrics_server = await serve_worker_metrics(
+            settings.SERVER_HOST, settings.WORKER_METRICS_PORT, settings.SERVER_WORKERS
+        )
+    try:
+        yield
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        await engine.dispose()
+
+
+async def readiness() -> Tuple[bool, dict]:
+    """
+    Whether this worker should receive traffic, with the details behind it.
+
+    Ready once startup has finished and a database round trip succeeds
+    within ``READY_TIMEOUT_SECONDS``.
+
+    Only the pool checkout is bounded here. Cancelling a query mid-call
+    would return a connection in an unknown state to the pool, so the query
+    is bounded by Postgres instead, with a ``statement_timeout`` for the
+    time left.
+    """
+    report = {"warmup": dict(warmup_state)}
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as session:
+            await asyncio.wait_for(session.connection(), timeout=settings.READY_TIMEOUT_SECONDS)
+            remaining = settings.READY_TIMEOUT_SECONDS - (time.perf_counter() - started)
+            # 0 would disable the timeout
+            timeout_ms = max(1, int(remaining * 1000))
+            await session.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+            await session.execute(text("SELECT 1"))
+        database_ok = True
+    except Exception as exc:
+        database_ok = False
+        report["database_error"] = repr(exc)
+    report["database_latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    report["pool"] = pool_stats()
+    ready = database_ok and warmup_state["complete"]
+    report["status"] = "ready" if ready else "not ready"
+    return ready, report
@@ -0,0 +1,445 @@
+"""
+Prometheus metrics, served as text at ``GET /metrics``.
+
+Recording is meant to stay on under full load: every metric lives in this
+worker process and is only touched from the event loop thread, so there
+are no locks. Recording a sample is one dict lookup, a `bisect` into the
+bucket bounds and a few integer increments. Label values are bounded:
+routes are reported by their path template (``/api/lessons/{lesson_id}``),
+never the raw path, and unmatched paths share one label.
+
+Sources:
+
+* `MetricsMiddleware` records request latency per method, route and status,
+  and the requests in flight;
+* `instrument_engine` hooks the SQLAlchemy engine so every statement is
+  timed, both on its own and added to the request that ran it
+  (`current_request`). The middleware reports each request's SQL work in a
+  ``Server-Timing`` header and, with ``QUERY_BUDGET_CHECKS``, logs requests
+  over the statement budget or repeating one statement in a loop;
+* `TimedCheckout` pools time how long a request waits for a connection;
+* collectors registered with `registry.collect` (response cache, pool
+  occupancy) are read when the endpoint is scraped.
+
+Under `scripts/serve.py` several worker processes share the API port, so
+``GET /metrics`` there answers for whichever worker took the connection.
+With ``WORKER_METRICS_PORT`` set, each worker also serves its own metrics
+(`serve_worker_metrics`) on the first free port of ``WORKER_METRICS_PORT``
+to ``WORKER_METRICS_PORT + SERVER_WORKERS - 1``; scrape every port in that
+range as its own target, and aggregate across them in queries.
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Starlette appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# (labels, value) as produced by a collector
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Histogram with fixed upper bounds; counts are kept per bucket, not cumulative."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.bounds = tuple(buckets)
+        # labels -> [count per bucket..., count above the last bound, sum]
+        self.values: Dict[tuple, List[float]] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.bounds) + 1) + [0.0]
+        counts[bisect_left(self.bounds, value)] += 1
+        counts[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, counts in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(counts[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics recorded in this process plus collectors read at scrape time."""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Tuple[Metric, Callable[[], Iterable[Sample]]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def collect(self, metric: Metric, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Fill ``metric`` from ``collector`` on every scrape."""
+        self.collectors.append((metric, collector))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for metric, collector in self.collectors:
+            lines.extend(metric.header())
+            for labels, value in collector():
+                label_text = _labels(tuple(labels), tuple(labels.values()))
+                lines.append(f"{metric.name}{label_text} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+async def _metrics_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.split()
+        if len(parts) >= 2 and parts[0] in (b"GET", b"HEAD") and parts[1] == b"/metrics":
+            status, body = b"200 OK", registry.render().encode()
+        else:
+            status, body = b"404 Not Found", b"Not Found\n"
+        headers = (
+            f"Content-Type: {CONTENT_TYPE}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        ).encode()
+        writer.write(b"HTTP/1.1 " + status + b"\r\n" + headers)
+        if parts[:1] != [b"HEAD"]:
+            writer.write(body)
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_worker_metrics(
+    host: str, first_port: int, ports: int
+) -> Optional[asyncio.AbstractServer]:
+    """
+    Serve this process's ``/metrics`` on the first free port of
+    ``first_port`` .. ``first_port + ports - 1``.
+
+    Each worker binds its own port (binding is atomic, so two workers never
+    get the same one) and a restarted worker takes over the port its
+    predecessor freed. Returns ``None`` when every port is taken.
+    """
+    for port in range(first_port, first_port + ports):
+        try:
+            server = await asyncio.start_server(_metrics_connection, host, port)
+        except OSError:
+            continue
+        logger.info("Serving worker metrics on port %d", port)
+        return server
+    logger.warning("No free worker metrics port in %d-%d", first_port, first_port + ports - 1)
+    return None
+
+
+http_requests_in_progress = registry.register(
+    Gauge("http_requests_in_progress", "HTTP requests being served.", ["method"])
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency until the last body byte is sent.",
+        ["method", "route", "status"],
+    )
+)
+http_request_db_statements = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "SQL statements executed per HTTP request.",
+        ["route"],
+        COUNT_BUCKETS,
+    )
+)
+http_request_db_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent executing SQL per HTTP request.",
+        ["route"],
+        DB_BUCKETS,
+    )
+)
+db_statement_duration = registry.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "SQL statement execution time, by leading keyword.",
+        ["operation"],
+        DB_BUCKETS,
+    )
+)
+db_pool_checkout_wait = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled database connection.",
+        (),
+        DB_BUCKETS,
+    )
+)
+
+
+class RequestStats:
+    """
+    SQL work done while serving one request.
+
+    ``shapes`` counts executions per SQL text; it is only kept when budget
+    checks are on.
+    """
+
+    __slots__ = ("statements", "db_seconds", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Optional[Dict[str, int]] = {} if track_shapes else None
+
+    def repeated(self, limit: int) -> List[Tuple[int, str]]:
+        """``(count, statement)`` for statements run more than ``limit`` times."""
+        if self.shapes is None:
+            return []
+        return sorted(
+            ((count, statement) for statement, count in self.shapes.items() if count > limit),
+            reverse=True,
+        )
+
+    def budget_problems(self) -> List[str]:
+        """Why this request breaks the query budget; empty when it does not."""
+        problems = []
+        if self.statements > settings.QUERY_BUDGET:
+            problems.append(f"{self.statements} statements (budget {settings.QUERY_BUDGET})")
+        for count, statement in self.repeated(settings.QUERY_REPEAT_LIMIT):
+            shape = " ".join(statement.split())[:160]
+            problems.append(f"same statement {count} times, possible N+1: {shape}")
+        return problems
+
+    def server_timing(self, app_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.3f};desc="{self.statements} statements", '
+            f"app;dur={app_seconds * 1000:.3f}"
+        )
+
+
+# Set by `MetricsMiddleware` for the duration of each request; the greenlets
+# SQLAlchemy runs statements in inherit it
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+@contextmanager
+def count_statements() -> Iterator[RequestStats]:
+    """
+    Count the SQL run inside the block, for tests asserting query counts.
+
+    Over HTTP the same numbers are in each response's ``Server-Timing``
+    header (``db;dur=...;desc="N statements"``).
+    """
+    stats = RequestStats(track_shapes=True)
+    token = current_request.set(stats)
+    try:
+        yield stats
+    finally:
+        current_request.reset(token)
+
+
+_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "EXPLAIN"})
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip()[:8].split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in _OPERATIONS else "OTHER"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_statement_duration.observe((_operation(statement),), elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        if stats.shapes is not None:
+            stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement ``engine`` executes (pass ``AsyncEngine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    event.listen(engine, "after_cursor_execute", _after_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class TimedCheckout:
+    """Pool mixin recording how long each connection checkout waits."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.observe((), time.perf_counter() - started)
+
+
+def route_label(scope: Scope) -> str:
+    """Path template of the route that handled ``scope``, bounded in cardinality."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope and "app_root_path" in scope:
+        # a mounted app, such as static files
+        return scope["root_path"] + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record latency, in-flight requests and per-request SQL work."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = (scope["method"],)
+        started = time.perf_counter()
+        checks = settings.query_budget_checks
+        stats = RequestStats(track_shapes=checks)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # SQL a streaming body runs after this point is not included
+                headers = MutableHeaders(scope=message)
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append(
+                        "Server-Timing", stats.server_timing(time.perf_counter() - started)
+                    )
+                problems = stats.budget_problems() if checks else None
+                if problems:
+                    headers["X-Query-Budget"] = "exceeded"
+                    logger.warning(
+                        "Query budget exceeded by %s %s: %s",
+                        scope["method"],
+                        route_label(scope),
+                        "; ".join(problems),
+                    )
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec(method)
+            current_request.reset(token)
+            route = route_label(scope)
+            http_request_duration.observe(
+                (scope["method"], route, str(status_code)), time.perf_counter() - started
+            )
+            http_request_db_statements.observe((route,), stats.statements)
+            http_request_db_duration.observe((route,), stats.db_seconds)
@@ -0,0 +1,153 @@
+"""Keyset (cursor) pagination helpers shared by the list endpoints."""
+import base64
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, Integer, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last returned row as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _valid_key(value: Any, column: Any) -> bool:
+    """Whether ``value`` can be compared with ``column`` without a database error."""
+    if isinstance(column.type, Integer):
+        bits = 64 if isinstance(column.type, BigInteger) else 32
+        return (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
+        )
+    try:
+        return isinstance(value, column.type.python_type)
+    except NotImplementedError:
+        return True
+
+
+def decode_cursor(cursor: str, key_columns: Sequence[Any]) -> list:
+    """
+    Decode a cursor produced by `encode_cursor`, rejecting malformed input
+    and values that do not fit their key column.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(key_columns)
+        or not all(_valid_key(value, column) for value, column in zip(values, key_columns))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return values
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Apply the server-side page size default and cap."""
+    if limit is None:
+        return settings.PAGE_SIZE_DEFAULT
+    return max(1, min(limit, settings.PAGE_SIZE_MAX))
+
+
+def _selects_entity(query: Select) -> bool:
+    """True when ``query`` loads whole ORM objects rather than plain columns."""
+    descriptions = query.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
+
+def _key_value(item: Any, column: Any) -> Any:
+    if isinstance(item, dict):
+        return item[column.key]
+    return getattr(item, column.key)
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> tuple[int, bool]:
+    """
+    Return ``(total, is_estimate)`` for the rows matched by ``query``.
+
+    The planner's row estimate is read via ``EXPLAIN``; only when it is below
+    ``EXACT_COUNT_THRESHOLD`` do we pay for a real ``COUNT(*)``, which is
+    cheap at that size and avoids showing rough numbers for small tables.
+    """
+    # the engine's own dialect: psycopg2's paramstyle would double every % in
+    # the literals, and the planner would estimate a different predicate
+    compiled = query.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    if estimate >= settings.EXACT_COUNT_THRESHOLD:
+        return estimate, True
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    total = (await db.execute(count_query)).scalar_one()
+    return total, False
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    key_columns: Sequence[Any],
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Run ``query`` as one keyset page ordered by ``key_columns``.
+
+    ``query`` may select a whole entity (items are ORM objects) or a list of
+    columns (items are dicts); column queries must include ``key_columns``.
+
+    ``key_columns`` must be unique together (end with the primary key) and
+    should be backed by a composite index so each page is a single index
+    range scan regardless of how deep the client has paged.
+
+    ``total`` is only counted for the first page; pages fetched with
+    ``after`` report ``None``, so walking a list costs one statement a page.
+    """
+    limit = clamp_limit(limit)
+    total, total_is_estimate = None, False
+    if not after:
+        total, total_is_estimate = await estimate_count(db, query)
+
+    page_query = query
+    if after:
+        values = decode_cursor(after, key_columns)
+        page_query = page_query.where(tuple_(*key_columns) > tuple_(*values))
+    page_query = page_query.order_by(*key_columns).limit(limit + 1)
+
+    result = await db.execute(page_query)
+    if _selects_entity(page_query):
+        items = list(result.scalars().all())
+    else:
+        items = [dict(row) for row in result.mappings().all()]
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([_key_value(last, col) for col in key_columns])
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+    }
@@ -0,0 +1,275 @@
+"""
+Precomputed "related lessons" from shared tags and glossary terms.
+
+Every lesson is a set of features, its tags and its terms, and two lessons in
+the same language are scored by weighted Jaccard overlap::
+
+    sum(w(f) for f in A & B) / sum(w(f) for f in A | B)
+
+with ``w`` set per feature kind (``RELATED_TAG_WEIGHT``,
+``RELATED_TERM_WEIGHT``). The top ``RELATED_TOP_K`` matches of each lesson are
+kept in memory, so serving them is a dict lookup.
+
+Candidates come from an inverted index (feature -> lessons), so a lesson is
+only ever compared with lessons it shares a feature with.
+
+Database triggers log the id of every lesson whose tags, terms, language or
+existence changed to ``lesson_feature_changes`` (plain text edits are not
+logged). `RelatedIndex.refresh` reads the log past the last entry it applied,
+one index range scan that is usually empty, re-reads the feature sets of the
+logged lessons only, and re-ranks them plus the lessons sharing a feature with
+their old or new sets; a score depends on nothing but the two sets, so every
+other top-K list is still exact. Everything is re-read on the first refresh,
+after a TRUNCATE, when more than ``INCREMENTAL_MAX_LESSONS`` lessons changed at
+once, or when the log was pruned past the index's watermark.
+
+Ranking is CPU-bound and runs in the thread pool, so a full reload does not
+stall the worker's other requests. It builds new dicts (copying only the
+posting sets it changes) that are swapped in once it is done; readers never
+see a half-applied index.
+
+The ``RELATED_STAMPS`` counters are only used for the response ETags.
+"""
+import asyncio
+import heapq
+from typing import (
+    Collection, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple,
+)
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.associations import lesson_tags, lesson_terms
+from app.models.lesson import Lesson
+from app.models.lesson_feature_change import LOG_RETENTION, LessonFeatureChange
+
+# (kind, id), e.g. ("tag", 4)
+Feature = Tuple[str, int]
+
+RELATED_STAMPS = (("lessons", None), ("lesson_tags", None), ("lesson_terms", None))
+
+# Changed lessons re-read by id; above this a full read is cheaper
+INCREMENTAL_MAX_LESSONS = 5000
+
+
+class _Update(NamedTuple):
+    """The index after `RelatedIndex._apply`, ready to be swapped in."""
+
+    languages: Dict[int, str]
+    features: Dict[int, FrozenSet[Feature]]
+    postings: Dict[Feature, Set[int]]
+    top: Dict[int, List[Tuple[int, float]]]
+    ranked: int
+
+
+class RelatedIndex:
+    """Top-K related lessons per lesson, re-ranked incrementally."""
+
+    def __init__(self, top_k: int, weights: Dict[str, float]):
+        self.top_k = top_k
+        self.weights = weights
+        self.languages: Dict[int, str] = {}
+        self.features: Dict[int, FrozenSet[Feature]] = {}
+        self.postings: Dict[Feature, Set[int]] = {}
+        self.top: Dict[int, List[Tuple[int, float]]] = {}
+        # id of the last lesson_feature_changes entry applied
+        self.watermark: Optional[int] = None
+        self.refreshes = 0
+        self.full_reloads = 0
+        self.lessons_reloaded = 0
+        self.lessons_ranked = 0
+        self._lock = asyncio.Lock()
+
+    def related(self, lesson_id: int) -> List[Tuple[int, float]]:
+        """``(lesson id, score)`` pairs for ``lesson_id``, best first."""
+        return self.top.get(lesson_id, [])
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Re-rank the lessons affected by writes since the last refresh."""
+        if self.watermark is not None and not await self._pending(db):
+            return
+        async with self._lock:
+            # another request may have refreshed while we waited
+            if self.watermark is None:
+                await self._reload(db)
+                return
+            result = await db.execute(
+                select(LessonFeatureChange.id, LessonFeatureChange.lesson_id)
+                .where(LessonFeatureChange.id > self.watermark)
+                .order_by(LessonFeatureChange.id)
+            )
+            changes = result.all()
+            if not changes:
+                return
+            lesson_ids = {lesson_id for _, lesson_id in changes}
+            # the triggers prune entries more than LOG_RETENTION ids old
+            pruned = changes[-1].id - LOG_RETENTION > self.watermark
+            if None in lesson_ids or len(lesson_ids) > INCREMENTAL_MAX_LESSONS or pruned:
+                await self._reload(db)
+                return
+            languages, features = await self._load(db, lesson_ids)
+            self._swap(await run_in_threadpool(self._apply, lesson_ids, languages, features))
+            self.watermark = changes[-1].id
+            self.refreshes += 1
+            self.lessons_reloaded += len(lesson_ids)
+
+    async def _pending(self, db: AsyncSession) -> bool:
+        result = await db.execute(
+            select(exists().where(LessonFeatureChange.id > self.watermark))
+        )
+        return result.scalar()
+
+    async def _reload(self, db: AsyncSession) -> None:
+        # read before the lessons, so later changes are applied next time
+        result = await db.execute(select(func.max(LessonFeatureChange.id)))
+        watermark = result.scalar() or 0
+        languages, features = await self._load(db)
+        lesson_ids = set(features) | set(self.features)
+        self._swap(await run_in_threadpool(self._apply, lesson_ids, languages, features))
+        self.watermark = watermark
+        self.refreshes += 1
+        self.full_reloads += 1
+        self.lessons_reloaded += len(features)
+
+    async def _load(self, db: AsyncSession, lesson_ids: Optional[Collection[int]] = None):
+        """Language and feature set of ``lesson_ids`` (every lesson when ``None``)."""
+        query = select(Lesson.id, Lesson.language)
+        if lesson_ids is not None:
+            query = query.where(Lesson.id.in_(list(lesson_ids)))
+        result = await db.execute(query)
+        languages = dict(result.tuples().all())
+        features: Dict[int, Set[Feature]] = {lesson_id: set() for lesson_id in languages}
+        for kind, table, key in (
+            ("tag", lesson_tags, "tag_id"),
+            ("term", lesson_terms, "term_id"),
+        ):
+            query = select(table.c.lesson_id, table.c[key])
+            if lesson_ids is not None:
+                query = query.where(table.c.lesson_id.in_(list(languages)))
+            result = await db.execute(query)
+            for lesson_id, feature_id in result.tuples():
+                if lesson_id in features:
+                    features[lesson_id].add((kind, feature_id))
+        return languages, {lesson_id: frozenset(found) for lesson_id, found in features.items()}
+
+    def _swap(self, update: _Update) -> None:
+        self.languages, self.features, self.postings, self.top = update[:4]
+        self.lessons_ranked += update.ranked
+
+    def _apply(
+        self,
+        lesson_ids: Iterable[int],
+        languages: Dict[int, str],
+        features: Dict[int, FrozenSet[Feature]],
+    ) -> _Update:
+        """
+        The index with the sets of ``lesson_ids`` replaced by ``features``
+        (absent ids were deleted) and the lessons that may have moved
+        re-ranked. Runs in the thread pool and leaves the current index as
+        it is.
+        """
+        changed = {
+            lesson_id
+            for lesson_id in lesson_ids
+            if features.get(lesson_id) != self.features.get(lesson_id)
+            or languages.get(lesson_id) != self.languages.get(lesson_id)
+        }
+
+        # Lessons that shared a feature with a changed lesson before the write
+        affected = set(changed)
+        for lesson_id in changed:
+            for feature in self.features.get(lesson_id, ()):
+                affected.update(self.postings.get(feature, ()))
+
+        new_languages = dict(self.languages)
+        new_features = dict(self.features)
+        postings = dict(self.postings)
+        top = dict(self.top)
+        # features whose posting set is already a copy
+        copied: Set[Feature] = set()
+
+        def posting(feature: Feature) -> Set[int]:
+            if feature not in copied:
+                copied.add(feature)
+                postings[feature] = set(postings.get(feature, ()))
+            return postings.setdefault(feature, set())
+
+        for lesson_id in changed:
+            for feature in self.features.get(lesson_id, ()):
+                lessons = posting(feature)
+                lessons.discard(lesson_id)
+                if not lessons:
+                    del postings[feature]
+            for feature in features.get(lesson_id, ()):
+                posting(feature).add(lesson_id)
+            if lesson_id in features:
+                new_features[lesson_id] = features[lesson_id]
+                new_languages[lesson_id] = languages[lesson_id]
+            else:
+                new_features.pop(lesson_id, None)
+                new_languages.pop(lesson_id, None)
+
+        # ... and the ones that share a feature with it now
+        for lesson_id in changed:
+            for feature in features.get(lesson_id, ()):
+                affected.update(postings[feature])
+
+        ranked = 0
+        for lesson_id in affected:
+            if lesson_id in new_features:
+                top[lesson_id] = self._rank(lesson_id, new_languages, new_features, postings)
+                ranked += 1
+            else:
+                top.pop(lesson_id, None)
+        return _Update(new_languages, new_features, postings, top, ranked)
+
+    def _weight(self, features: Iterable[Feature]) -> float:
+        return sum(self.weights[kind] for kind, _ in features)
+
+    def _rank(
+        self,
+        lesson_id: int,
+        languages: Dict[int, str],
+        features: Dict[int, FrozenSet[Feature]],
+        postings: Dict[Feature, Set[int]],
+    ) -> List[Tuple[int, float]]:
+        own = features[lesson_id]
+        if not own:
+            return []
+        language = languages[lesson_id]
+        own_weight = self._weight(own)
+        candidates = set()
+        for feature in own:
+            candidates.update(postings.get(feature, ()))
+        candidates.discard(lesson_id)
+
+        scored = []
+        for other in candidates:
+            if languages[other] != language:
+                continue
+            other_features = features[other]
+            shared = self._weight(own & other_features)
+            union = own_weight + self._weight(other_features) - shared
+            scored.append((shared / union, other))
+        best = heapq.nlargest(self.top_k, scored, key=lambda item: (item[0], -item[1]))
+        return [(other, score) for score, other in best]
+
+    def stats(self) -> dict:
+        return {
+            "lessons": len(self.features),
+            "features": len(self.postings),
+            "top_k": self.top_k,
+            "watermark": self.watermark,
+            "refreshes": self.refreshes,
+            "full_reloads": self.full_reloads,
+            "lessons_reloaded": self.lessons_reloaded,
+            "lessons_ranked": self.lessons_ranked,
+        }
+
+
+related_index = RelatedIndex(
+    top_k=settings.RELATED_TOP_K,
+    weights={"tag": settings.RELATED_TAG_WEIGHT, "term": settings.RELATED_TERM_WEIGHT},
+)
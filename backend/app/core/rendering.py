@@ -0,0 +1,125 @@
+"""
+Lesson Markdown rendered to sanitized HTML at write time.
+
+``Lesson.content_html`` holds the rendered body and ``Lesson.content_hash``
+the SHA-256 of the Markdown it was rendered from, so readers are served the
+stored HTML and a write only renders again when the content actually
+changed. The hash matches Postgres' ``sha256()``, which lets
+`render_stale_lessons` find rows written by the bulk endpoints, the NDJSON
+import or the seeder in SQL.
+
+Rendering is CPU-bound and always runs in the thread pool, never on the
+event loop.
+"""
+import hashlib
+from typing import Iterable, List, Optional
+
+import nh3
+from markdown_it import MarkdownIt
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.lesson import Lesson
+
+# Raw HTML in the source is escaped by the parser; nh3 then enforces the
+# allowlist on the output regardless of parser options
+_markdown = MarkdownIt("commonmark", {"html": False, "breaks": True}).enable("table")
+
+ALLOWED_TAGS = {
+    "a", "blockquote", "br", "code", "em", "h1", "h2", "h3", "h4", "h5", "h6",
+    "hr", "img", "li", "ol", "p", "pre", "strong",
+    "table", "tbody", "td", "th", "thead", "tr", "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title"},
+    "ol": {"start"},
+}
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of ``content``, as Postgres computes it."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def render_markdown(content: str) -> str:
+    """Render Markdown ``content`` to sanitized HTML."""
+    return nh3.clean(
+        _markdown.render(content),
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes={"http", "https", "mailto"},
+    )
+
+
+def _render_all(contents: List[str]) -> List[str]:
+    return [render_markdown(content) for content in contents]
+
+
+async def render_lesson(lesson: Lesson) -> bool:
+    """
+    Set ``lesson.content_html`` if its content changed since it was last rendered.
+
+    Returns whether it did.
+    """
+    digest = content_hash(lesson.content)
+    if digest == lesson.content_hash and lesson.content_html is not None:
+        return False
+    lesson.content_html = await run_in_threadpool(render_markdown, lesson.content)
+    lesson.content_hash = digest
+    return True
+
+
+def _stale_condition():
+    current = func.encode(func.sha256(func.convert_to(Lesson.content, "UTF8")), "hex")
+    return Lesson.content_hash.is_distinct_from(current) | Lesson.content_html.is_(None)
+
+
+async def render_stale_lessons(
+    db: AsyncSession, lesson_ids: Optional[Iterable[int]] = None
+) -> List[int]:
+    """
+    Render lessons whose stored HTML is missing or older than their content.
+
+    Works through ``RENDER_BATCH_SIZE`` rows at a time, optionally limited to
+    ``lesson_ids``. Returns the ids of the lessons rendered; the caller commits.
+    """
+    table = Lesson.__table__
+    query = (
+        select(Lesson.id, Lesson.content)
+        .where(_stale_condition())
+        .order_by(Lesson.id)
+        .limit(settings.RENDER_BATCH_SIZE)
+    )
+    if lesson_ids is not None:
+        query = query.where(Lesson.id.in_(list(lesson_ids)))
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("lesson_id"))
+        # rendering is not an edit; keep updated_at as it was
+        .values(
+            content_html=bindparam("html"),
+            content_hash=bindparam("digest"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+    rendered: List[int] = []
+    last_id = 0
+    while True:
+        result = await db.execute(query.where(Lesson.id > last_id))
+        rows = result.all()
+        if not rows:
+            return rendered
+        html = await run_in_threadpool(_render_all, [row.content for row in rows])
+        await db.execute(
+            statement,
+            [
+                {"lesson_id": row.id, "html": body, "digest": content_hash(row.content)}
+                for row, body in zip(rows, html)
+            ],
+        )
+        rendered.extend(row.id for row in rows)
+        last_id = rows[-1].id
@@ -0,0 +1,41 @@
+"""Full-text search configuration shared by the models, migrations and routes."""
+from typing import Sequence, Tuple
+
+# Content language -> PostgreSQL text search configuration
+TEXT_SEARCH_CONFIGS = {
+    "en": "english",
+    "ru": "russian",
+}
+DEFAULT_TEXT_SEARCH_CONFIG = "simple"
+
+
+def text_search_config(language: str) -> str:
+    return TEXT_SEARCH_CONFIGS.get(language, DEFAULT_TEXT_SEARCH_CONFIG)
+
+
+def escape_like(value: str) -> str:
+    """Escape ``value`` for a ``LIKE`` pattern with ``\\`` as the escape character."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def regconfig_sql(language_column: str = "language") -> str:
+    """SQL picking the text search configuration from a row's language column."""
+    branches = " ".join(
+        f"WHEN '{language}' THEN '{config}'::regconfig"
+        for language, config in TEXT_SEARCH_CONFIGS.items()
+    )
+    return f"CASE {language_column} {branches} ELSE '{DEFAULT_TEXT_SEARCH_CONFIG}'::regconfig END"
+
+
+def search_vector_sql(weighted_columns: Sequence[Tuple[str, str]]) -> str:
+    """
+    Expression for a generated ``tsvector`` column.
+
+    ``weighted_columns`` pairs a column name with its rank weight (A-D), e.g.
+    ``[("title", "A"), ("content", "C")]``.
+    """
+    config = regconfig_sql()
+    return " || ".join(
+        f"setweight(to_tsvector({config}, coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
@@ -0,0 +1,72 @@
+"""Per-table, per-language version stamps used to build strong ETags."""
+import hashlib
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Response, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import decoded_etag
+from app.core.config import settings
+from app.models.content_version import ContentVersion
+
+ALL_LANGUAGES = "*"
+
+# (table name, language or None for any language)
+Stamp = Tuple[str, Optional[str]]
+
+
+async def get_versions(db: AsyncSession, stamps: Sequence[Stamp]) -> list:
+    """
+    Read the change counters for ``stamps`` in a single primary-key lookup.
+
+    Counters are maintained by statement-level triggers on the content
+    tables, so they move on every committed write, including ones made by
+    other workers, the seeder or psql.
+    """
+    pairs = [(table, language or ALL_LANGUAGES) for table, language in stamps]
+    result = await db.execute(
+        select(ContentVersion.table_name, ContentVersion.language, ContentVersion.version)
+        .where(tuple_(ContentVersion.table_name, ContentVersion.language).in_(pairs))
+    )
+    versions = {(row.table_name, row.language): row.version for row in result}
+    return [versions.get(pair, 0) for pair in pairs]
+
+
+def make_etag(key: str, versions: Sequence[int]) -> str:
+    """Build a strong ETag from the request key and the version stamps."""
+    source = f"{settings.APP_VERSION}|{key}|{','.join(map(str, versions))}"
+    return '"' + hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, exists: bool = True) -> Optional[str]:
+    """
+    Evaluate an ``If-None-Match`` header (weak comparison, per RFC 9110).
+
+    Returns the entry that matched, which is the ETag the client holds, or
+    ``None``. Entries are compared without the encoding suffix of compressed
+    variants (`app.core.compression.encoded_etag`), since every variant
+    decodes to the same representation. ``*`` matches any current
+    representation, so only when ``exists``; pass ``exists=False`` before
+    the resource has been found.
+    """
+    if not if_none_match:
+        return None
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            if exists:
+                return etag
+            continue
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if decoded_etag(candidate) == etag:
+            return candidate
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
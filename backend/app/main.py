@@ -1,16 +1,34 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+import os
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.cache import response_cache
+from app.core.compression import CompressionMiddleware, PrecompressedStaticFiles, precompressed_file
 from app.core.config import settings
-from app.routes import categories, lessons, fabrics, garments, terms
+from app.core.database import pool_stats
+from app.core.graph import graph_index
+from app.core.lifespan import lifespan, readiness
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.routes import (
+    categories,
+    lessons,
+    fabrics,
+    garments,
+    terms,
+    search,
+    export,
+    imports,
+    graph,
+)
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="EdTailor - Fashion Education Platform API",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -22,8 +40,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for responses not already compressed by the response cache
+# or the static file handlers
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so request latency includes compression
+app.add_middleware(MetricsMiddleware)
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 
 # Include routers
 app.include_router(categories.router, prefix="/api")
@@ -31,18 +56,55 @@ app.include_router(lessons.router, prefix="/api")
 app.include_router(fabrics.router, prefix="/api")
 app.include_router(garments.router, prefix="/api")
 app.include_router(terms.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
+app.include_router(graph.router, prefix="/api")
 
 # Mount frontend
-app.mount("/js", StaticFiles(directory="/frontend/js"), name="js")
+app.mount("/js", PrecompressedStaticFiles(directory="/frontend/js"), name="js")
 
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the frontend application."""
-    return FileResponse("/frontend/index.html")
+    return precompressed_file("/frontend/index.html", request.scope)
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check: the process answers; see /ready for the database."""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def ready_check():
+    """Readiness check: database round trip, pool state and startup warm-up."""
+    ready, report = await readiness()
+    return JSONResponse(
+        report, status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache counters of the worker that answers, for sizing RESPONSE_CACHE_* settings."""
+    return {"worker_pid": os.getpid(), **response_cache.stats()}
+
+
+@app.get("/db/stats")
+async def db_stats():
+    """Connection pool occupancy of the worker that answers, for sizing DB_POOL_* settings."""
+    return {"worker_pid": os.getpid(), **pool_stats()}
+
+
+@app.get("/graph/stats")
+async def graph_stats():
+    """Adjacency index size and reload counters."""
+    return graph_index.stats()
@@ -5,6 +5,9 @@ from app.models.fabric import Fabric
 from app.models.garment import Garment
 from app.models.term import Term
 from app.models.tag import Tag
+from app.models.content_version import ContentVersion
+from app.models.lesson_feature_change import LessonFeatureChange
+from app.models.seed_manifest import SeedManifest
 from app.models.associations import (
     lesson_fabrics,
     lesson_garments,
@@ -21,6 +24,9 @@ __all__ = [
     "Garment",
     "Term",
     "Tag",
+    "ContentVersion",
+    "LessonFeatureChange",
+    "SeedManifest",
     "lesson_fabrics",
     "lesson_garments",
     "lesson_terms",
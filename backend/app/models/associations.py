@@ -1,5 +1,5 @@
 """Association tables for many-to-many relationships."""
-from sqlalchemy import Table, Column, Integer, ForeignKey, Text
+from sqlalchemy import Table, Column, Integer, ForeignKey, JSON, Text
 from app.core.database import Base
 
 # Lesson <-> Fabric
@@ -26,6 +26,8 @@ lesson_terms = Table(
     Base.metadata,
     Column("lesson_id", Integer, ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True),
     Column("term_id", Integer, ForeignKey("terms.id", ondelete="CASCADE"), primary_key=True),
+    # [[start, end], ...] character offsets of the term in the lesson content
+    Column("offsets", JSON, nullable=True),
 )
 
 # Lesson <-> Tag
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,6 +8,10 @@ class Category(Base):
     """Top-level organization for content (e.g., Fabrics, Tailoring, Styling)."""
 
     __tablename__ = "categories"
+    __table_args__ = (
+        # Keyset pagination scans
+        Index('ix_categories_language_id', 'language', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
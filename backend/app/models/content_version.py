@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ContentVersion(Base):
+    """
+    Change counter per content table and language, bumped by database triggers.
+
+    ``language`` is ``'*'`` for the row counting changes in any language.
+    """
+
+    __tablename__ = "content_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    language = Column(String(2), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ContentVersion {self.table_name}:{self.language}={self.version}>"
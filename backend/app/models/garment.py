@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Index, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.search import search_vector_sql
 from app.models.associations import lesson_garments, fabric_garments
 
 
@@ -9,6 +11,13 @@ class Garment(Base):
     """Clothing items encyclopedia with construction and styling details."""
 
     __tablename__ = "garments"
+    __table_args__ = (
+        UniqueConstraint('name', 'language', name='uq_garment_name_language'),
+        # Keyset pagination scans
+        Index('ix_garments_language_id', 'language', 'id'),
+        # Full-text search
+        Index('ix_garments_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
@@ -24,6 +33,13 @@ class Garment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Full-text search document, generated by Postgres; deferred so list and
+    # detail queries never load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql([("name", "A"), ("description", "B")]), persisted=True),
+    ))
+
     # Relationships
     lessons = relationship("Lesson", secondary=lesson_garments, back_populates="garments")
     fabrics = relationship("Fabric", secondary=fabric_garments, back_populates="garments")
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Index, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.search import search_vector_sql
 from app.models.associations import lesson_fabrics, lesson_garments, lesson_terms, lesson_tags
 
 
@@ -9,6 +11,13 @@ class Lesson(Base):
     """Individual learning units with content."""
 
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Keyset pagination scans
+        Index('ix_lessons_language_id', 'language', 'id'),
+        Index('ix_lessons_topic_language_id', 'topic_id', 'language', 'id'),
+        # Full-text search
+        Index('ix_lessons_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     topic_id = Column(Integer, ForeignKey("topics.id", ondelete="CASCADE"), nullable=False)
@@ -16,6 +25,9 @@ class Lesson(Base):
     slug = Column(String(300), unique=True, nullable=False, index=True)
     summary = Column(Text, nullable=True)
     content = Column(Text, nullable=False)
+    # Sanitized HTML rendered from `content`, and the SHA-256 it was rendered from
+    content_html = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
     reading_time_minutes = Column(Integer, nullable=True)
     difficulty_level = Column(String(50), nullable=True)  # Beginner, Intermediate, Advanced
     image_url = Column(String(500), nullable=True)
@@ -23,6 +35,13 @@ class Lesson(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Full-text search document, generated by Postgres; deferred so list and
+    # detail queries never load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql([("title", "A"), ("summary", "B"), ("content", "C")]), persisted=True),
+    ))
+
     # Relationships
     topic = relationship("Topic", back_populates="lessons")
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, BigInteger, Integer, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# Entries the triggers keep, by id (see the migration that creates them)
+LOG_RETENTION = 100000
+
+
+class LessonFeatureChange(Base):
+    """
+    Log of lessons whose tags, glossary terms, language or existence changed,
+    written by database triggers and read by the related-lessons index.
+
+    ``lesson_id`` is ``NULL`` when every lesson may have changed (TRUNCATE).
+    """
+
+    __tablename__ = "lesson_feature_changes"
+
+    id = Column(BigInteger, primary_key=True)
+    lesson_id = Column(Integer, nullable=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<LessonFeatureChange {self.id}: {self.lesson_id}>"
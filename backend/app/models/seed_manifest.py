@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class SeedManifest(Base):
+    """Content hash of each seed file the seeder has applied."""
+
+    __tablename__ = "seed_manifest"
+
+    filename = Column(String(200), primary_key=True)  # e.g. fabrics_enhanced_ru.json
+    content_hash = Column(String(64), nullable=False)  # SHA-256 hex digest
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SeedManifest {self.filename}>"
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Index, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.search import search_vector_sql
 from app.models.associations import lesson_terms
 
 
@@ -11,6 +13,15 @@ class Term(Base):
     __tablename__ = "terms"
     __table_args__ = (
         UniqueConstraint('term', 'language', name='uq_term_language'),
+        # Keyset pagination scans
+        Index('ix_terms_language_id', 'language', 'id'),
+        # Full-text search
+        Index('ix_terms_search_vector', 'search_vector', postgresql_using='gin'),
+        # Typeahead prefix and fuzzy matching (pg_trgm)
+        Index(
+            'ix_terms_term_trgm', 'term',
+            postgresql_using='gin', postgresql_ops={'term': 'gin_trgm_ops'},
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -23,6 +34,13 @@ class Term(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Full-text search document, generated by Postgres; deferred so list and
+    # detail queries never load it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(search_vector_sql([("term", "A"), ("definition", "B")]), persisted=True),
+    ))
+
     # Relationships
     lessons = relationship("Lesson", secondary=lesson_terms, back_populates="terms")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -8,6 +8,11 @@ class Topic(Base):
     """Topics within categories (e.g., Natural Fibers, Suit Construction)."""
 
     __tablename__ = "topics"
+    __table_args__ = (
+        # Keyset pagination scans
+        Index('ix_topics_language_id', 'language', 'id'),
+        Index('ix_topics_category_language_id', 'category_id', 'language', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
@@ -1,29 +1,205 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import JSON, any_, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array
+from sqlalchemy.orm import aliased
+from typing import List, Optional
 
+from app.core.bulk import bulk_upsert, updated_ids
+from app.core.cache import (
+    invalidate,
+    invalidate_resource,
+    item_tag,
+    json_response,
+    list_tag,
+    lookup,
+    resource_tag,
+    store_response,
+)
 from app.core.database import get_db
+from app.core.pagination import paginate
+from app.core.projection import projected_page, projection_query
 from app.models.category import Category
+from app.models.lesson import Lesson
 from app.models.topic import Topic
-from app.schemas.category import CategoryCreate, CategoryResponse
+from app.schemas.category import CategoryCreate, CategoryResponse, CategoryTreeNode
 from app.schemas.topic import TopicResponse
+from app.schemas.bulk import BulkResponse
+from app.schemas.pagination import Page
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
-@router.get("/", response_model=List[CategoryResponse])
-async def get_categories(language: str = 'en', db: AsyncSession = Depends(get_db)):
-    """Get all categories, optionally filtered by language."""
-    query = select(Category).where(Category.language == language)
-    result = await db.execute(query)
-    categories = result.scalars().all()
-    return categories
+@router.get("/", response_model=Page[CategoryResponse])
+async def get_categories(
+    request: Request,
+    language: str = 'en',
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a page of categories, optionally filtered by language."""
+    cache_lookup = await lookup(request, db, ("categories", language))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = list(CategoryResponse.model_fields)
+    key_columns = (Category.language, Category.id)
+    query = projection_query(Category, field_names, key_columns).where(
+        Category.language == language
+    )
+    page = await paginate(db, query, key_columns, after, limit)
+    response = projected_page(page, field_names)
+    return store_response(
+        cache_lookup,
+        response,
+        "categories",
+        list_tag("categories", language),
+    )
+
+
+def _category_tree_query(language: str):
+    """
+    One statement returning every category in ``language`` in tree order.
+
+    A recursive CTE walks down from the roots (categories without a parent
+    in the same language), and each row carries its topics with lesson
+    counts as a JSON array.
+    """
+    parent = aliased(Category)
+    roots = select(
+        Category.id,
+        Category.parent_id,
+        literal(0).label("depth"),
+        array([Category.id]).label("path"),
+    ).where(
+        (Category.language == language)
+        & ~exists().where((parent.id == Category.parent_id) & (parent.language == language))
+    )
+    tree = roots.cte("tree", recursive=True)
+    child = aliased(Category)
+    tree = tree.union_all(
+        select(
+            child.id,
+            child.parent_id,
+            tree.c.depth + 1,
+            func.array_append(tree.c.path, child.id),
+        ).where(
+            (child.parent_id == tree.c.id)
+            & (child.language == language)
+            & ~(child.id == any_(tree.c.path))
+        )
+    )
+
+    topic_stats = (
+        select(
+            Topic.id,
+            Topic.category_id,
+            Topic.name,
+            Topic.slug,
+            Topic.description,
+            func.count(Lesson.id).label("lesson_count"),
+        )
+        .outerjoin(Lesson, (Lesson.topic_id == Topic.id) & (Lesson.language == language))
+        .where(Topic.language == language)
+        .group_by(Topic.id)
+        .subquery()
+    )
+    topic_json = func.json_build_object(
+        "id", topic_stats.c.id,
+        "name", topic_stats.c.name,
+        "slug", topic_stats.c.slug,
+        "description", topic_stats.c.description,
+        "lesson_count", topic_stats.c.lesson_count,
+    )
+    topics = func.json_agg(
+        aggregate_order_by(topic_json, topic_stats.c.id), type_=JSON
+    ).filter(topic_stats.c.id.isnot(None))
+
+    return (
+        select(
+            tree.c.id,
+            tree.c.parent_id,
+            tree.c.depth,
+            Category.name,
+            Category.slug,
+            Category.description,
+            Category.icon_url,
+            topics.label("topics"),
+        )
+        .join_from(tree, Category, Category.id == tree.c.id)
+        .outerjoin(topic_stats, topic_stats.c.category_id == tree.c.id)
+        .group_by(tree.c.id, tree.c.parent_id, tree.c.depth, tree.c.path, Category.id)
+        .order_by(tree.c.path)
+    )
+
+
+@router.get("/tree", response_model=List[CategoryTreeNode])
+async def get_category_tree(
+    request: Request, language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the category hierarchy with topics and lesson counts.
+
+    Each topic carries its lesson count; each category's `lesson_count`
+    includes its subcategories.
+    """
+    cache_lookup = await lookup(
+        request, db, ("categories", language), ("topics", language), ("lessons", language)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    result = await db.execute(_category_tree_query(language))
+
+    # Rows arrive in path order, so parents are seen before their children
+    nodes = {}
+    roots = []
+    for row in result:
+        topics = row.topics or []
+        node = {
+            "id": row.id,
+            "name": row.name,
+            "slug": row.slug,
+            "description": row.description,
+            "icon_url": row.icon_url,
+            "parent_id": row.parent_id,
+            "depth": row.depth,
+            "topic_count": len(topics),
+            "lesson_count": sum(topic["lesson_count"] for topic in topics),
+            "topics": topics,
+            "children": [],
+        }
+        nodes[row.id] = node
+        parent = nodes.get(row.parent_id) if row.depth else None
+        (parent["children"] if parent else roots).append(node)
+
+    for node in reversed(list(nodes.values())):
+        if node["depth"]:
+            nodes[node["parent_id"]]["lesson_count"] += node["lesson_count"]
+
+    response = json_response(List[CategoryTreeNode], roots)
+    return store_response(
+        cache_lookup,
+        response,
+        "categories",
+        list_tag("categories", language),
+        list_tag("topics", language),
+        list_tag("lessons", language),
+        resource_tag("topics"),
+        resource_tag("lessons"),
+    )
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-async def get_category(category_id: int, db: AsyncSession = Depends(get_db)):
+async def get_category(
+    category_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
     """Get a specific category by ID."""
+    cache_lookup = await lookup(request, db, ("categories", None))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
     result = await db.execute(select(Category).where(Category.id == category_id))
     category = result.scalar_one_or_none()
 
@@ -33,7 +209,13 @@ async def get_category(category_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Category with id {category_id} not found",
         )
 
-    return category
+    response = json_response(CategoryResponse, category)
+    return store_response(
+        cache_lookup,
+        response,
+        "categories",
+        item_tag("categories", category_id),
+    )
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -45,9 +227,28 @@ async def create_category(
     db.add(category)
     await db.commit()
     await db.refresh(category)
+    invalidate("categories", category.language, category.id)
     return category
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_categories(
+    categories: List[CategoryCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many categories in `language` with a few statements.
+
+    Existing categories are matched on slug; a slug used by a category in
+    another language is reported as an error. Results are reported per item,
+    in request order.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in categories]
+    response = await bulk_upsert(db, Category, rows, ("slug",), immutable=("language",))
+    await db.commit()
+    invalidate("categories", language, *updated_ids(response))
+    return response
+
+
 @router.put("/{category_id}", response_model=CategoryResponse)
 async def update_category(
     category_id: int, category_data: CategoryCreate, db: AsyncSession = Depends(get_db)
@@ -67,6 +268,7 @@ async def update_category(
 
     await db.commit()
     await db.refresh(category)
+    invalidate("categories", category.language, category.id)
     return category
 
 
@@ -84,27 +286,48 @@ async def delete_category(category_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(category)
     await db.commit()
+    invalidate("categories", category.language, category_id)
+    # Topics and lessons are removed by cascade
+    invalidate_resource("topics")
+    invalidate_resource("lessons")
 
 
-@router.get("/{category_id}/topics", response_model=List[TopicResponse])
+@router.get("/{category_id}/topics", response_model=Page[TopicResponse])
 async def get_category_topics(
-    category_id: int, language: str = 'en', db: AsyncSession = Depends(get_db)
+    category_id: int,
+    request: Request,
+    language: str = 'en',
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all topics for a specific category."""
-    # First check if category exists
-    result = await db.execute(select(Category).where(Category.id == category_id))
-    category = result.scalar_one_or_none()
-
-    if not category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Category with id {category_id} not found",
-        )
+    """Get a page of topics for a specific category."""
+    cache_lookup = await lookup(request, db, ("topics", language), ("categories", None))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
 
     # Get topics for this category filtered by language
-    query = select(Topic).where(
+    field_names = list(TopicResponse.model_fields)
+    key_columns = (Topic.language, Topic.id)
+    query = projection_query(Topic, field_names, key_columns).where(
         (Topic.category_id == category_id) & (Topic.language == language)
     )
-    result = await db.execute(query)
-    topics = result.scalars().all()
-    return topics
+    page = await paginate(db, query, key_columns, after, limit)
+
+    # Only an empty page can mean the category does not exist
+    if not page["items"]:
+        result = await db.execute(select(Category.id).where(Category.id == category_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category with id {category_id} not found",
+            )
+
+    response = projected_page(page, field_names)
+    return store_response(
+        cache_lookup,
+        response,
+        "topics",
+        list_tag("topics", language),
+        item_tag("categories", category_id),
+    )
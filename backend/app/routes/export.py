@@ -0,0 +1,97 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.projection import encode_json
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.models.term import Term
+from app.schemas.fabric import FabricResponse
+from app.schemas.garment import GarmentResponse
+from app.schemas.lesson import LessonResponse
+from app.schemas.term import TermResponse
+
+router = APIRouter(tags=["export"])
+
+# type -> (model, schema describing the exported fields)
+EXPORT_SOURCES = {
+    "lessons": (Lesson, LessonResponse),
+    "fabrics": (Fabric, FabricResponse),
+    "garments": (Garment, GarmentResponse),
+    "terms": (Term, TermResponse),
+}
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _export_lines(type_names: List[str], language: Optional[str]) -> AsyncIterator[bytes]:
+    """
+    Yield NDJSON chunks of up to ``EXPORT_BATCH_SIZE`` rows.
+
+    Rows come from a server-side cursor, so memory use does not grow with
+    table size. Every type is read in one REPEATABLE READ transaction and
+    therefore from the same snapshot. Column rows are encoded straight to
+    JSON with orjson, as the list endpoints do.
+    """
+    async with AsyncSessionLocal() as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        for name in type_names:
+            model, schema = EXPORT_SOURCES[name]
+            field_names = list(schema.model_fields)
+            columns = [model.__table__.c[field] for field in field_names]
+            query = select(model.language, *columns).order_by(model.language, model.id)
+            if language:
+                query = query.where(model.language == language)
+
+            result = await session.stream(
+                query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.mappings().partitions():
+                yield b"".join(
+                    encode_json(
+                        {
+                            "type": name,
+                            "language": row["language"],
+                            **{field: row[field] for field in field_names},
+                        }
+                    ) + b"\n"
+                    for row in rows
+                )
+
+
+@router.get("/export")
+async def export_catalog(
+    # also names the download, so it must be safe in a header
+    language: Optional[str] = Query(None, pattern="^[a-z]{2}$"),
+    types: Optional[str] = None,
+):
+    """
+    Stream lessons, fabrics, garments and terms as newline-delimited JSON.
+
+    Each line is one row with its `type` and `language`. `language=` limits
+    the export to one language and `types=` to a comma-separated subset.
+    The body is compressed with gzip or brotli when the client accepts it.
+    """
+    if types:
+        requested = (name.strip() for name in types.split(","))
+        type_names = list(dict.fromkeys(name for name in requested if name))
+        unknown = sorted(set(type_names) - set(EXPORT_SOURCES))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown export types: {', '.join(unknown)}",
+            )
+    else:
+        type_names = list(EXPORT_SOURCES)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="edtailor-{language or "all"}.ndjson"',
+    }
+    # compressed on the fly by CompressionMiddleware
+    return StreamingResponse(
+        _export_lines(type_names, language), media_type=NDJSON_MEDIA_TYPE, headers=headers
+    )
@@ -1,27 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
-
-from app.core.database import get_db
+from typing import List, Optional
+
+from app.core.bulk import bulk_upsert, updated_ids
+from app.core.cache import (
+    invalidate,
+    item_tag,
+    json_response,
+    list_tag,
+    lookup,
+    store_response,
+)
+from app.core.database import commit_unique, get_db
+from app.core.includes import (
+    FABRIC_INCLUDES,
+    expanded_item,
+    include_stamps,
+    include_tags,
+    load_includes,
+    resolve_includes,
+)
+from app.core.pagination import paginate
+from app.core.projection import (
+    VIEW_FULL,
+    VIEW_PATTERN,
+    projected_page,
+    projection_query,
+    resolve_fields,
+)
 from app.models.fabric import Fabric
-from app.schemas.fabric import FabricCreate, FabricResponse
+from app.schemas.fabric import FabricCreate, FabricResponse, FabricSummary
+from app.schemas.bulk import BulkResponse
+from app.schemas.includes import FabricExpanded
+from app.schemas.pagination import Page
 
 router = APIRouter(prefix="/fabrics", tags=["fabrics"])
 
 
-@router.get("/", response_model=List[FabricResponse])
-async def get_fabrics(language: str = 'en', db: AsyncSession = Depends(get_db)):
-    """Get all fabrics, optionally filtered by language."""
-    query = select(Fabric).where(Fabric.language == language)
-    result = await db.execute(query)
-    fabrics = result.scalars().all()
-    return fabrics
-
+@router.get("/", response_model=Page[FabricExpanded])
+async def get_fabrics(
+    request: Request,
+    language: str = 'en',
+    view: str = Query(VIEW_FULL, pattern=VIEW_PATTERN),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a page of fabrics, optionally filtered by language.
+
+    `view=summary` omits the care instructions and properties;
+    `fields=` selects specific fields; `include=garments` adds related garments.
+    """
+    includes = resolve_includes(include, FABRIC_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("fabrics", language), *include_stamps(includes, FABRIC_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = resolve_fields(view, fields, FabricResponse, FabricSummary)
+    key_columns = (Fabric.language, Fabric.id)
+    query = projection_query(Fabric, field_names, key_columns).where(
+        Fabric.language == language
+    )
+
+    page = await paginate(db, query, key_columns, after, limit)
+    await load_includes(db, page["items"], includes, FABRIC_INCLUDES)
+    response = projected_page(page, field_names + includes)
+    return store_response(
+        cache_lookup,
+        response,
+        "fabrics",
+        list_tag("fabrics", language),
+        *include_tags(includes, FABRIC_INCLUDES),
+    )
+
+
+@router.get("/{fabric_id}", response_model=FabricExpanded)
+async def get_fabric(
+    fabric_id: int,
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a specific fabric by ID.
+
+    `include=` expands related records: `garments`, with usage notes.
+    """
+    includes = resolve_includes(include, FABRIC_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("fabrics", None), *include_stamps(includes, FABRIC_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
 
-@router.get("/{fabric_id}", response_model=FabricResponse)
-async def get_fabric(fabric_id: int, db: AsyncSession = Depends(get_db)):
-    """Get a specific fabric by ID."""
     result = await db.execute(select(Fabric).where(Fabric.id == fabric_id))
     fabric = result.scalar_one_or_none()
 
@@ -31,7 +108,17 @@ async def get_fabric(fabric_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Fabric with id {fabric_id} not found",
         )
 
-    return fabric
+    if includes:
+        response = await expanded_item(db, fabric, FabricResponse, includes, FABRIC_INCLUDES)
+    else:
+        response = json_response(FabricResponse, fabric)
+    return store_response(
+        cache_lookup,
+        response,
+        "fabrics",
+        item_tag("fabrics", fabric_id),
+        *include_tags(includes, FABRIC_INCLUDES),
+    )
 
 
 @router.post("/", response_model=FabricResponse, status_code=status.HTTP_201_CREATED)
@@ -39,11 +126,31 @@ async def create_fabric(fabric_data: FabricCreate, db: AsyncSession = Depends(ge
     """Create a new fabric."""
     fabric = Fabric(**fabric_data.model_dump())
     db.add(fabric)
-    await db.commit()
+    await commit_unique(db, f"A fabric named {fabric_data.name!r} already exists in this language")
     await db.refresh(fabric)
+    invalidate("fabrics", fabric.language, fabric.id)
     return fabric
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_fabrics(
+    fabrics: List[FabricCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many fabrics in `language` with a few statements.
+
+    Existing fabrics are matched on (name, language). Results are reported per
+    item, in request order.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in fabrics]
+    response = await bulk_upsert(
+        db, Fabric, rows, ("name", "language"), constraint="uq_fabric_name_language",
+    )
+    await db.commit()
+    invalidate("fabrics", language, *updated_ids(response))
+    return response
+
+
 @router.put("/{fabric_id}", response_model=FabricResponse)
 async def update_fabric(
     fabric_id: int, fabric_data: FabricCreate, db: AsyncSession = Depends(get_db)
@@ -61,8 +168,9 @@ async def update_fabric(
     for field, value in fabric_data.model_dump().items():
         setattr(fabric, field, value)
 
-    await db.commit()
+    await commit_unique(db, f"A fabric named {fabric_data.name!r} already exists in this language")
     await db.refresh(fabric)
+    invalidate("fabrics", fabric.language, fabric.id)
     return fabric
 
 
@@ -80,3 +188,4 @@ async def delete_fabric(fabric_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(fabric)
     await db.commit()
+    invalidate("fabrics", fabric.language, fabric_id)
@@ -1,27 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
-
-from app.core.database import get_db
+from typing import List, Optional
+
+from app.core.bulk import bulk_upsert, updated_ids
+from app.core.cache import (
+    invalidate,
+    item_tag,
+    json_response,
+    list_tag,
+    lookup,
+    store_response,
+)
+from app.core.database import commit_unique, get_db
+from app.core.includes import (
+    GARMENT_INCLUDES,
+    expanded_item,
+    include_stamps,
+    include_tags,
+    load_includes,
+    resolve_includes,
+)
+from app.core.pagination import paginate
+from app.core.projection import (
+    VIEW_FULL,
+    VIEW_PATTERN,
+    projected_page,
+    projection_query,
+    resolve_fields,
+)
 from app.models.garment import Garment
-from app.schemas.garment import GarmentCreate, GarmentResponse
+from app.schemas.garment import GarmentCreate, GarmentResponse, GarmentSummary
+from app.schemas.bulk import BulkResponse
+from app.schemas.includes import GarmentExpanded
+from app.schemas.pagination import Page
 
 router = APIRouter(prefix="/garments", tags=["garments"])
 
 
-@router.get("/", response_model=List[GarmentResponse])
-async def get_garments(language: str = 'en', db: AsyncSession = Depends(get_db)):
-    """Get all garments, optionally filtered by language."""
-    query = select(Garment).where(Garment.language == language)
-    result = await db.execute(query)
-    garments = result.scalars().all()
-    return garments
-
+@router.get("/", response_model=Page[GarmentExpanded])
+async def get_garments(
+    request: Request,
+    language: str = 'en',
+    view: str = Query(VIEW_FULL, pattern=VIEW_PATTERN),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a page of garments, optionally filtered by language.
+
+    `view=summary` omits the construction, history and styling text;
+    `fields=` selects specific fields; `include=fabrics` adds related fabrics.
+    """
+    includes = resolve_includes(include, GARMENT_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("garments", language), *include_stamps(includes, GARMENT_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = resolve_fields(view, fields, GarmentResponse, GarmentSummary)
+    key_columns = (Garment.language, Garment.id)
+    query = projection_query(Garment, field_names, key_columns).where(
+        Garment.language == language
+    )
+
+    page = await paginate(db, query, key_columns, after, limit)
+    await load_includes(db, page["items"], includes, GARMENT_INCLUDES)
+    response = projected_page(page, field_names + includes)
+    return store_response(
+        cache_lookup,
+        response,
+        "garments",
+        list_tag("garments", language),
+        *include_tags(includes, GARMENT_INCLUDES),
+    )
+
+
+@router.get("/{garment_id}", response_model=GarmentExpanded)
+async def get_garment(
+    garment_id: int,
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a specific garment by ID.
+
+    `include=` expands related records: `fabrics`, with usage notes.
+    """
+    includes = resolve_includes(include, GARMENT_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("garments", None), *include_stamps(includes, GARMENT_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
 
-@router.get("/{garment_id}", response_model=GarmentResponse)
-async def get_garment(garment_id: int, db: AsyncSession = Depends(get_db)):
-    """Get a specific garment by ID."""
     result = await db.execute(select(Garment).where(Garment.id == garment_id))
     garment = result.scalar_one_or_none()
 
@@ -31,7 +108,17 @@ async def get_garment(garment_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Garment with id {garment_id} not found",
         )
 
-    return garment
+    if includes:
+        response = await expanded_item(db, garment, GarmentResponse, includes, GARMENT_INCLUDES)
+    else:
+        response = json_response(GarmentResponse, garment)
+    return store_response(
+        cache_lookup,
+        response,
+        "garments",
+        item_tag("garments", garment_id),
+        *include_tags(includes, GARMENT_INCLUDES),
+    )
 
 
 @router.post("/", response_model=GarmentResponse, status_code=status.HTTP_201_CREATED)
@@ -39,11 +126,33 @@ async def create_garment(garment_data: GarmentCreate, db: AsyncSession = Depends
     """Create a new garment."""
     garment = Garment(**garment_data.model_dump())
     db.add(garment)
-    await db.commit()
+    await commit_unique(
+        db, f"A garment named {garment_data.name!r} already exists in this language"
+    )
     await db.refresh(garment)
+    invalidate("garments", garment.language, garment.id)
     return garment
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_garments(
+    garments: List[GarmentCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many garments in `language` with a few statements.
+
+    Existing garments are matched on (name, language). Results are reported per
+    item, in request order.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in garments]
+    response = await bulk_upsert(
+        db, Garment, rows, ("name", "language"), constraint="uq_garment_name_language",
+    )
+    await db.commit()
+    invalidate("garments", language, *updated_ids(response))
+    return response
+
+
 @router.put("/{garment_id}", response_model=GarmentResponse)
 async def update_garment(
     garment_id: int, garment_data: GarmentCreate, db: AsyncSession = Depends(get_db)
@@ -61,8 +170,11 @@ async def update_garment(
     for field, value in garment_data.model_dump().items():
         setattr(garment, field, value)
 
-    await db.commit()
+    await commit_unique(
+        db, f"A garment named {garment_data.name!r} already exists in this language"
+    )
     await db.refresh(garment)
+    invalidate("garments", garment.language, garment.id)
     return garment
 
 
@@ -80,3 +192,4 @@ async def delete_garment(garment_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(garment)
     await db.commit()
+    invalidate("garments", garment.language, garment_id)
@@ -0,0 +1,209 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Iterable, List, Optional, Type
+
+from app.core.cache import invalidate_resource, json_response, list_tag, lookup, store_response
+from app.core.database import get_db
+from app.core.graph import graph_index, two_hop
+from app.models.associations import fabric_garments
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.schemas.fabric import FabricSummary
+from app.schemas.garment import GarmentSummary
+from app.schemas.graph import FabricGarmentLink, LessonFabricGarments
+from app.schemas.includes import FabricGarment, GarmentFabric
+
+router = APIRouter(tags=["graph"])
+
+# Stamps graph responses depend on: the links walked and the node tables read
+FABRIC_GARMENT_STAMPS = (("fabric_garments", None), ("fabrics", None), ("garments", None))
+LESSON_GRAPH_STAMPS = (("lesson_fabrics", None), ("lessons", None), *FABRIC_GARMENT_STAMPS)
+GRAPH_TAGS = (list_tag("fabrics", None), list_tag("garments", None))
+
+
+async def _require(db: AsyncSession, model, item_id: int) -> None:
+    result = await db.execute(select(model.id).where(model.id == item_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} with id {item_id} not found",
+        )
+
+
+async def _summaries(
+    db: AsyncSession, model, schema: Type[BaseModel], ids: Iterable[int]
+) -> Dict[int, dict]:
+    """Summary rows for ``ids`` in one primary-key lookup."""
+    ids = set(ids)
+    if not ids:
+        return {}
+    table = model.__table__
+    result = await db.execute(
+        select(*(table.c[name] for name in schema.model_fields)).where(table.c.id.in_(ids))
+    )
+    return {row["id"]: dict(row) for row in result.mappings()}
+
+
+def _with_notes(
+    nodes: Dict[int, dict], notes: Dict[int, Optional[str]], note_field: str
+) -> List[dict]:
+    return [
+        {**nodes[node_id], note_field: note}
+        for node_id, note in sorted(notes.items())
+        if node_id in nodes
+    ]
+
+
+@router.get("/fabrics/{fabric_id}/garments", response_model=List[FabricGarment])
+async def get_fabric_garments(
+    fabric_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    """Garments a fabric suits, with the usage note of each link."""
+    cache_lookup = await lookup(request, db, *FABRIC_GARMENT_STAMPS)
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    await _require(db, Fabric, fabric_id)
+    await graph_index.refresh(db)
+    notes = graph_index["fabric_garments"].targets(fabric_id)
+    garments = await _summaries(db, Garment, GarmentSummary, notes)
+
+    response = json_response(List[FabricGarment], _with_notes(garments, notes, "usage_note"))
+    return store_response(cache_lookup, response, "graph", *GRAPH_TAGS)
+
+
+@router.get("/garments/{garment_id}/fabrics", response_model=List[GarmentFabric])
+async def get_garment_fabrics(
+    garment_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    """Fabrics suited to a garment, with the usage note of each link."""
+    cache_lookup = await lookup(request, db, *FABRIC_GARMENT_STAMPS)
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    await _require(db, Garment, garment_id)
+    await graph_index.refresh(db)
+    notes = graph_index["fabric_garments"].sources(garment_id)
+    fabrics = await _summaries(db, Fabric, FabricSummary, notes)
+
+    response = json_response(List[GarmentFabric], _with_notes(fabrics, notes, "usage_note"))
+    return store_response(cache_lookup, response, "graph", *GRAPH_TAGS)
+
+
+@router.get("/lessons/{lesson_id}/fabric-garments", response_model=List[LessonFabricGarments])
+async def get_lesson_fabric_garments(
+    lesson_id: int,
+    request: Request,
+    garment_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Fabrics a lesson recommends, each with the garments it suits.
+
+    `garment_id=` keeps only the fabrics suited to that garment, answering
+    "which fabrics does this lesson recommend for a coat".
+    """
+    cache_lookup = await lookup(request, db, *LESSON_GRAPH_STAMPS)
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    await _require(db, Lesson, lesson_id)
+    await graph_index.refresh(db)
+    walk = two_hop(graph_index["lesson_fabrics"], graph_index["fabric_garments"], lesson_id)
+    if garment_id is not None:
+        walk = {
+            fabric_id: {garment_id: targets[garment_id]}
+            for fabric_id, targets in walk.items()
+            if garment_id in targets
+        }
+
+    fabric_notes = graph_index["lesson_fabrics"].targets(lesson_id)
+    fabrics = await _summaries(db, Fabric, FabricSummary, walk)
+    garments = await _summaries(
+        db, Garment, GarmentSummary, (g for targets in walk.values() for g in targets)
+    )
+    items = [
+        {
+            **fabrics[fabric_id],
+            "note": fabric_notes.get(fabric_id),
+            "garments": _with_notes(garments, walk[fabric_id], "usage_note"),
+        }
+        for fabric_id in sorted(walk)
+        if fabric_id in fabrics
+    ]
+
+    response = json_response(List[LessonFabricGarments], items)
+    return store_response(
+        cache_lookup, response, "graph", list_tag("lessons", None), *GRAPH_TAGS
+    )
+
+
+@router.put("/fabrics/{fabric_id}/garments/{garment_id}", response_model=FabricGarment)
+async def link_fabric_garment(
+    fabric_id: int,
+    garment_id: int,
+    link: FabricGarmentLink,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create or update the link between a fabric and a garment."""
+    await _require(db, Fabric, fabric_id)
+    await _require(db, Garment, garment_id)
+
+    before = await graph_index.write_version(db, "fabric_garments")
+    statement = insert(fabric_garments).values(
+        fabric_id=fabric_id, garment_id=garment_id, usage_note=link.usage_note
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[fabric_garments.c.fabric_id, fabric_garments.c.garment_id],
+            set_={"usage_note": statement.excluded.usage_note},
+        )
+    )
+    after = await graph_index.write_version(db, "fabric_garments")
+    garments = await _summaries(db, Garment, GarmentSummary, [garment_id])
+    await db.commit()
+
+    graph_index.apply(
+        "fabric_garments",
+        before,
+        after,
+        lambda relation: relation.link(fabric_id, garment_id, link.usage_note),
+    )
+    invalidate_resource("graph")
+    return {**garments[garment_id], "usage_note": link.usage_note}
+
+
+@router.delete(
+    "/fabrics/{fabric_id}/garments/{garment_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def unlink_fabric_garment(
+    fabric_id: int, garment_id: int, db: AsyncSession = Depends(get_db)
+):
+    """Remove the link between a fabric and a garment."""
+    before = await graph_index.write_version(db, "fabric_garments")
+    result = await db.execute(
+        delete(fabric_garments).where(
+            (fabric_garments.c.fabric_id == fabric_id)
+            & (fabric_garments.c.garment_id == garment_id)
+        )
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Fabric {fabric_id} is not linked to garment {garment_id}",
+        )
+    after = await graph_index.write_version(db, "fabric_garments")
+    await db.commit()
+
+    graph_index.apply(
+        "fabric_garments",
+        before,
+        after,
+        lambda relation: relation.unlink(fabric_id, garment_id),
+    )
+    invalidate_resource("graph")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_resource
+from app.core.database import get_db
+from app.core.importer import IMPORT_TARGETS, gunzip, import_ndjson, iter_lines
+from app.schemas.bulk import ImportResponse
+
+router = APIRouter(tags=["import"])
+
+NDJSON_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+    }
+}
+
+
+@router.post("/import/{resource}", response_model=ImportResponse, openapi_extra=NDJSON_BODY)
+async def import_resource(
+    resource: str,
+    request: Request,
+    language: str = 'en',
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import a newline-delimited JSON upload into `resource`.
+
+    Each line is an object in the resource's create format, optionally with
+    its own `language`; `/api/export` output is accepted as is. The body is
+    streamed and may be gzip-compressed (`Content-Encoding: gzip`). Existing
+    rows are updated, matched on the same keys as the bulk endpoints.
+    """
+    if resource not in IMPORT_TARGETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown import resource: {resource}",
+        )
+
+    chunks = request.stream()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        chunks = gunzip(chunks)
+
+    result = await import_ndjson(db, resource, iter_lines(chunks), language)
+    await db.commit()
+    invalidate_resource(resource)
+    return result
@@ -1,27 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional
 
+from app.core.bulk import bulk_upsert, updated_ids
+from app.core.cache import (
+    invalidate,
+    item_tag,
+    json_response,
+    list_tag,
+    lookup,
+    store_response,
+)
 from app.core.database import get_db
+from app.core.glossary import link_lessons
+from app.core.includes import (
+    LESSON_INCLUDES,
+    expanded_item,
+    include_stamps,
+    include_tags,
+    load_includes,
+    resolve_includes,
+)
+from app.core.pagination import paginate
+from app.core.projection import (
+    VIEW_FULL,
+    VIEW_PATTERN,
+    projected_page,
+    projection_query,
+    resolve_fields,
+)
+from app.core.related import RELATED_STAMPS, related_index
+from app.core.rendering import render_lesson, render_stale_lessons
+from app.models.category import Category
 from app.models.lesson import Lesson
 from app.models.topic import Topic
-from app.schemas.lesson import LessonCreate, LessonResponse
+from app.schemas.lesson import LessonCreate, LessonResponse, LessonSummary, RelatedLesson
+from app.schemas.topic import TopicCreate
+from app.schemas.bulk import BulkResponse
+from app.schemas.includes import LessonExpanded
+from app.schemas.pagination import Page
 
 router = APIRouter(tags=["lessons"])
 
 
-@router.get("/lessons", response_model=List[LessonResponse])
-async def get_lessons(db: AsyncSession = Depends(get_db)):
-    """Get all lessons."""
-    result = await db.execute(select(Lesson))
-    lessons = result.scalars().all()
-    return lessons
+@router.get("/lessons", response_model=Page[LessonExpanded])
+async def get_lessons(
+    request: Request,
+    language: Optional[str] = None,
+    view: str = Query(VIEW_FULL, pattern=VIEW_PATTERN),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a page of lessons across all languages, or only the given one.
+
+    `view=summary` omits the content body; `fields=` selects specific fields;
+    `include=` adds related `fabrics`, `garments`, `terms` or `tags`.
+    """
+    includes = resolve_includes(include, LESSON_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("lessons", language), *include_stamps(includes, LESSON_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = resolve_fields(view, fields, LessonResponse, LessonSummary)
+    key_columns = (Lesson.language, Lesson.id)
+    query = projection_query(Lesson, field_names, key_columns)
+    if language is not None:
+        query = query.where(Lesson.language == language)
+
+    page = await paginate(db, query, key_columns, after, limit)
+    await load_includes(db, page["items"], includes, LESSON_INCLUDES)
+    response = projected_page(page, field_names + includes)
+    return store_response(
+        cache_lookup,
+        response,
+        "lessons",
+        list_tag("lessons", language),
+        *include_tags(includes, LESSON_INCLUDES),
+    )
+
 
+@router.get("/lessons/{lesson_id}", response_model=LessonExpanded)
+async def get_lesson(
+    lesson_id: int,
+    request: Request,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a specific lesson by ID.
+
+    `include=` expands related records: `fabrics`, `garments`, `terms`, `tags`.
+    """
+    includes = resolve_includes(include, LESSON_INCLUDES)
+    cache_lookup = await lookup(
+        request, db, ("lessons", None), *include_stamps(includes, LESSON_INCLUDES)
+    )
+    if cache_lookup.response is not None:
+        return cache_lookup.response
 
-@router.get("/lessons/{lesson_id}", response_model=LessonResponse)
-async def get_lesson(lesson_id: int, db: AsyncSession = Depends(get_db)):
-    """Get a specific lesson by ID."""
     result = await db.execute(select(Lesson).where(Lesson.id == lesson_id))
     lesson = result.scalar_one_or_none()
 
@@ -31,19 +114,77 @@ async def get_lesson(lesson_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Lesson with id {lesson_id} not found",
         )
 
-    return lesson
+    if includes:
+        response = await expanded_item(db, lesson, LessonResponse, includes, LESSON_INCLUDES)
+    else:
+        response = json_response(LessonResponse, lesson)
+    return store_response(
+        cache_lookup,
+        response,
+        "lessons",
+        item_tag("lessons", lesson_id),
+        *include_tags(includes, LESSON_INCLUDES),
+    )
 
 
 @router.post("/lessons", response_model=LessonResponse, status_code=status.HTTP_201_CREATED)
 async def create_lesson(lesson_data: LessonCreate, db: AsyncSession = Depends(get_db)):
     """Create a new lesson."""
     lesson = Lesson(**lesson_data.model_dump())
+    await render_lesson(lesson)
     db.add(lesson)
+    await db.flush()
+    await link_lessons(db, [lesson.id])
     await db.commit()
     await db.refresh(lesson)
+    invalidate("lessons", lesson.language, lesson.id)
     return lesson
 
 
+@router.post("/lessons/bulk", response_model=BulkResponse)
+async def bulk_upsert_lessons(
+    lessons: List[LessonCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many lessons in `language` with a few statements.
+
+    Existing lessons are matched on slug; lessons whose topic does not exist
+    or whose slug is used in another language are reported as errors.
+    Results are reported per item, in request order.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in lessons]
+    response = await bulk_upsert(
+        db, Lesson, rows, ("slug",), references={"topic_id": Topic}, immutable=("language",)
+    )
+    rendered = await render_stale_lessons(
+        db, [result["id"] for result in response["results"] if result["id"] is not None]
+    )
+    await link_lessons(db, rendered)
+    await db.commit()
+    invalidate("lessons", language, *updated_ids(response))
+    return response
+
+
+@router.post("/topics/bulk", response_model=BulkResponse)
+async def bulk_upsert_topics(
+    topics: List[TopicCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many topics in `language` with a few statements.
+
+    Existing topics are matched on slug; topics whose category does not exist
+    or whose slug is used in another language are reported as errors.
+    Results are reported per item, in request order.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in topics]
+    response = await bulk_upsert(
+        db, Topic, rows, ("slug",), references={"category_id": Category}, immutable=("language",)
+    )
+    await db.commit()
+    invalidate("topics", language, *updated_ids(response))
+    return response
+
+
 @router.put("/lessons/{lesson_id}", response_model=LessonResponse)
 async def update_lesson(
     lesson_id: int, lesson_data: LessonCreate, db: AsyncSession = Depends(get_db)
@@ -60,9 +201,13 @@ async def update_lesson(
 
     for field, value in lesson_data.model_dump().items():
         setattr(lesson, field, value)
+    if await render_lesson(lesson):
+        await db.flush()
+        await link_lessons(db, [lesson.id])
 
     await db.commit()
     await db.refresh(lesson)
+    invalidate("lessons", lesson.language, lesson.id)
     return lesson
 
 
@@ -80,27 +225,86 @@ async def delete_lesson(lesson_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(lesson)
     await db.commit()
+    invalidate("lessons", lesson.language, lesson_id)
 
 
-@router.get("/topics/{topic_id}/lessons", response_model=List[LessonResponse])
-async def get_topic_lessons(
-    topic_id: int, language: str = 'en', db: AsyncSession = Depends(get_db)
+@router.get("/lessons/{lesson_id}/related", response_model=List[RelatedLesson])
+async def get_related_lessons(
+    lesson_id: int,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Get all lessons for a specific topic."""
-    # First check if topic exists
-    result = await db.execute(select(Topic).where(Topic.id == topic_id))
-    topic = result.scalar_one_or_none()
+    """
+    Other lessons in the same language that share tags and glossary terms.
+
+    Ranked by weighted Jaccard overlap, precomputed for the top
+    `RELATED_TOP_K` matches; `limit` returns fewer.
+    """
+    cache_lookup = await lookup(request, db, *RELATED_STAMPS)
+    if cache_lookup.response is not None:
+        return cache_lookup.response
 
-    if not topic:
+    await related_index.refresh(db)
+    if lesson_id not in related_index.features:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Topic with id {topic_id} not found",
+            detail=f"Lesson with id {lesson_id} not found",
         )
 
+    scores = dict(related_index.related(lesson_id)[:limit])
+    lessons = []
+    if scores:
+        columns = [Lesson.__table__.c[name] for name in LessonSummary.model_fields]
+        result = await db.execute(select(*columns).where(Lesson.id.in_(scores)))
+        rows = {row["id"]: row for row in result.mappings()}
+        lessons = [
+            {**rows[related_id], "score": score}
+            for related_id, score in scores.items()
+            if related_id in rows
+        ]
+
+    response = json_response(List[RelatedLesson], lessons)
+    return store_response(cache_lookup, response, "lessons", list_tag("lessons", None))
+
+
+@router.get("/topics/{topic_id}/lessons", response_model=Page[LessonResponse])
+async def get_topic_lessons(
+    topic_id: int,
+    request: Request,
+    language: str = 'en',
+    view: str = Query(VIEW_FULL, pattern=VIEW_PATTERN),
+    fields: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get a page of lessons for a specific topic.
+
+    `view=summary` omits the content body; `fields=` selects specific fields.
+    """
+    cache_lookup = await lookup(request, db, ("lessons", language), ("topics", None))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = resolve_fields(view, fields, LessonResponse, LessonSummary)
+
     # Get lessons for this topic filtered by language
-    query = select(Lesson).where(
+    key_columns = (Lesson.language, Lesson.id)
+    query = projection_query(Lesson, field_names, key_columns).where(
         (Lesson.topic_id == topic_id) & (Lesson.language == language)
     )
-    result = await db.execute(query)
-    lessons = result.scalars().all()
-    return lessons
+    page = await paginate(db, query, key_columns, after, limit)
+
+    # Only an empty page can mean the topic does not exist
+    if not page["items"]:
+        result = await db.execute(select(Topic.id).where(Topic.id == topic_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Topic with id {topic_id} not found",
+            )
+
+    response = projected_page(page, field_names)
+    return store_response(cache_lookup, response, "lessons", list_tag("lessons", language))
@@ -0,0 +1,130 @@
+import html
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import cast, desc, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from typing import Optional
+
+from app.core.cache import json_response, list_tag, lookup, store_response
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.search import text_search_config
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.models.term import Term
+from app.schemas.search import SearchResponse
+
+router = APIRouter(tags=["search"])
+
+# type -> (model, title column, column the snippet is cut from)
+SEARCH_SOURCES = {
+    "lessons": (Lesson, Lesson.title, Lesson.content),
+    "fabrics": (Fabric, Fabric.name, Fabric.description),
+    "garments": (Garment, Garment.name, Garment.description),
+    "terms": (Term, Term.term, Term.definition),
+}
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter= … "
+)
+_HIGHLIGHT_SPLIT = re.compile(f"({re.escape(HIGHLIGHT_START)}|{re.escape(HIGHLIGHT_STOP)})")
+
+
+def _escape_snippet(snippet: Optional[str]) -> str:
+    """HTML-escape a headline while keeping the highlight tags."""
+    if not snippet:
+        return ""
+    return "".join(
+        part if part in (HIGHLIGHT_START, HIGHLIGHT_STOP) else html.escape(part, quote=False)
+        for part in _HIGHLIGHT_SPLIT.split(snippet)
+    )
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    language: str = 'en',
+    types: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Full-text search across lessons, fabrics, garments and terms.
+
+    `types=` limits the search to a comma-separated subset. Results are
+    ranked by `ts_rank_cd`, and snippets wrap matches in `<mark>` tags.
+    """
+    if types:
+        requested = (name.strip() for name in types.split(","))
+        type_names = list(dict.fromkeys(name for name in requested if name))
+        unknown = sorted(set(type_names) - set(SEARCH_SOURCES))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {', '.join(unknown)}",
+            )
+    else:
+        type_names = list(SEARCH_SOURCES)
+
+    cache_lookup = await lookup(request, db, *((name, language) for name in type_names))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    limit = min(limit or settings.SEARCH_LIMIT_DEFAULT, settings.SEARCH_LIMIT_MAX)
+    config = cast(text_search_config(language), REGCONFIG)
+    ts_query = func.websearch_to_tsquery(config, q)
+
+    # Rank every match through the GIN indexes, keep the top `limit`, and
+    # only then pay for ts_headline on those few rows
+    matches = []
+    for name in type_names:
+        model, title_column, body_column = SEARCH_SOURCES[name]
+        matches.append(
+            select(
+                literal(name).label("type"),
+                model.id.label("id"),
+                title_column.label("title"),
+                body_column.label("body"),
+                func.ts_rank_cd(model.search_vector, ts_query).label("rank"),
+            ).where(
+                (model.language == language)
+                & model.search_vector.bool_op("@@")(ts_query)
+            )
+        )
+    top = union_all(*matches).order_by(desc("rank")).limit(limit).subquery()
+    query = select(
+        top.c.type,
+        top.c.id,
+        top.c.title,
+        top.c.rank,
+        func.ts_headline(config, top.c.body, ts_query, HEADLINE_OPTIONS).label("snippet"),
+    ).order_by(top.c.rank.desc(), top.c.type, top.c.id)
+
+    result = await db.execute(query)
+    results = [
+        {
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "snippet": _escape_snippet(row.snippet),
+            "rank": row.rank,
+        }
+        for row in result
+    ]
+
+    response = json_response(
+        SearchResponse, {"query": q, "language": language, "results": results}
+    )
+    return store_response(
+        cache_lookup,
+        response,
+        "search",
+        *(list_tag(name, language) for name in type_names),
+    )
@@ -1,27 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
-
+from sqlalchemy import func, literal, select
+from typing import Iterable, List, Optional
+
+from app.core.bulk import CREATED, bulk_upsert, updated_ids
+from app.core.cache import (
+    invalidate,
+    item_tag,
+    json_response,
+    list_tag,
+    lookup,
+    store_response,
+)
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.glossary import link_lessons, term_lessons
+from app.core.pagination import paginate
+from app.core.projection import projected_page, projection_query
+from app.core.search import escape_like
 from app.models.term import Term
-from app.schemas.term import TermCreate, TermResponse
+from app.schemas.term import TermCreate, TermResponse, TermSuggestion
+from app.schemas.bulk import BulkResponse
+from app.schemas.pagination import Page
 
 router = APIRouter(prefix="/terms", tags=["terms"])
 
 
-@router.get("/", response_model=List[TermResponse])
-async def get_terms(language: str = 'en', db: AsyncSession = Depends(get_db)):
-    """Get all terms, optionally filtered by language."""
-    query = select(Term).where(Term.language == language)
+@router.get("/", response_model=Page[TermResponse])
+async def get_terms(
+    request: Request,
+    language: str = 'en',
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a page of terms, optionally filtered by language."""
+    cache_lookup = await lookup(request, db, ("terms", language))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    field_names = list(TermResponse.model_fields)
+    key_columns = (Term.language, Term.id)
+    query = projection_query(Term, field_names, key_columns).where(Term.language == language)
+    page = await paginate(db, query, key_columns, after, limit)
+    response = projected_page(page, field_names)
+    return store_response(cache_lookup, response, "terms", list_tag("terms", language))
+
+
+@router.get("/autocomplete", response_model=List[TermSuggestion])
+async def autocomplete_terms(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    language: str = 'en',
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Suggest glossary terms for a partial query.
+
+    Prefix matches come first, then fuzzy matches ranked by trigram word
+    similarity, so "bastng" still finds "Basting". Both conditions are
+    served by the `ix_terms_term_trgm` GIN index, for Latin and Cyrillic.
+    """
+    cache_lookup = await lookup(request, db, ("terms", language))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
+    limit = min(limit or settings.AUTOCOMPLETE_LIMIT_DEFAULT, settings.AUTOCOMPLETE_LIMIT_MAX)
+    q = q.strip()
+
+    # Threshold for the `<%` operator below, scoped to this transaction
+    await db.execute(select(func.set_config(
+        "pg_trgm.word_similarity_threshold",
+        str(settings.AUTOCOMPLETE_SIMILARITY_THRESHOLD),
+        True,
+    )))
+
+    is_prefix = Term.term.ilike(escape_like(q) + "%", escape="\\")
+    score = func.word_similarity(q, Term.term)
+    query = (
+        select(Term.id, Term.term, Term.category, score.label("score"))
+        .where(
+            (Term.language == language)
+            & (is_prefix | literal(q).bool_op("<%")(Term.term))
+        )
+        .order_by(is_prefix.desc(), score.desc(), Term.term)
+        .limit(limit)
+    )
     result = await db.execute(query)
-    terms = result.scalars().all()
-    return terms
+
+    response = json_response(List[TermSuggestion], result.mappings().all())
+    return store_response(cache_lookup, response, "terms", list_tag("terms", language))
 
 
 @router.get("/{term_id}", response_model=TermResponse)
-async def get_term(term_id: int, db: AsyncSession = Depends(get_db)):
+async def get_term(
+    term_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
     """Get a specific term by ID."""
+    cache_lookup = await lookup(request, db, ("terms", None))
+    if cache_lookup.response is not None:
+        return cache_lookup.response
+
     result = await db.execute(select(Term).where(Term.id == term_id))
     term = result.scalar_one_or_none()
 
@@ -31,19 +111,63 @@ async def get_term(term_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Term with id {term_id} not found",
         )
 
-    return term
+    response = json_response(TermResponse, term)
+    return store_response(cache_lookup, response, "terms", item_tag("terms", term_id))
+
+
+async def _relink(
+    db: AsyncSession, language: str, terms: Iterable[str] = (), term_ids: Iterable[int] = ()
+) -> None:
+    """
+    Re-link the lessons a term write can affect, in the write's transaction.
+
+    The caller commits both together; the automaton seen here includes the
+    uncommitted terms, so it is not cached.
+    """
+    lesson_ids = await term_lessons(db, language, terms, term_ids)
+    if lesson_ids:
+        await link_lessons(db, lesson_ids, language, cache=False)
 
 
 @router.post("/", response_model=TermResponse, status_code=status.HTTP_201_CREATED)
 async def create_term(term_data: TermCreate, db: AsyncSession = Depends(get_db)):
-    """Create a new term."""
+    """Create a new term and link it in the lessons that contain it."""
     term = Term(**term_data.model_dump())
     db.add(term)
+    await db.flush()
+    await _relink(db, term.language, terms=[term.term])
     await db.commit()
     await db.refresh(term)
+    invalidate("terms", term.language, term.id)
     return term
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert_terms(
+    terms: List[TermCreate], language: str = 'en', db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update many terms in `language` with a few statements.
+
+    Existing terms are matched on (term, language). Results are reported per
+    item, in request order. Lessons are re-linked for the created terms only,
+    since an update keeps the term's text.
+    """
+    rows = [dict(item.model_dump(), language=language) for item in terms]
+    response = await bulk_upsert(
+        db, Term, rows, ("term", "language"), constraint="uq_term_language",
+    )
+    created = [
+        rows[result["index"]]["term"]
+        for result in response["results"]
+        if result["status"] == CREATED
+    ]
+    await _relink(db, language, terms=created)
+    await db.commit()
+    invalidate("terms", language, *updated_ids(response))
+    return response
+
+
 @router.put("/{term_id}", response_model=TermResponse)
 async def update_term(
     term_id: int, term_data: TermCreate, db: AsyncSession = Depends(get_db)
@@ -58,11 +182,16 @@ async def update_term(
             detail=f"Term with id {term_id} not found",
         )
 
+    renamed = term_data.term != term.term
     for field, value in term_data.model_dump().items():
         setattr(term, field, value)
 
+    if renamed:
+        await db.flush()
+        await _relink(db, term.language, terms=[term.term], term_ids=[term.id])
     await db.commit()
     await db.refresh(term)
+    invalidate("terms", term.language, term.id)
     return term
 
 
@@ -78,5 +207,12 @@ async def delete_term(term_id: int, db: AsyncSession = Depends(get_db)):
             detail=f"Term with id {term_id} not found",
         )
 
+    # read before the delete cascades to lesson_terms
+    lesson_ids = await term_lessons(db, term.language, term_ids=[term_id])
     await db.delete(term)
+    await db.flush()
+    # a shorter term the deleted one used to overlap may now match
+    if lesson_ids:
+        await link_lessons(db, lesson_ids, term.language, cache=False)
     await db.commit()
+    invalidate("terms", term.language, term_id)
@@ -1,31 +1,81 @@
-from app.schemas.category import CategoryBase, CategoryCreate, CategoryResponse
+from app.schemas.category import (
+    CategoryBase,
+    CategoryCreate,
+    CategoryResponse,
+    CategoryTreeNode,
+    CategoryTreeTopic,
+)
 from app.schemas.topic import TopicBase, TopicCreate, TopicResponse
-from app.schemas.lesson import LessonBase, LessonCreate, LessonResponse
-from app.schemas.fabric import FabricBase, FabricCreate, FabricResponse
-from app.schemas.garment import GarmentBase, GarmentCreate, GarmentResponse
-from app.schemas.term import TermBase, TermCreate, TermResponse
+from app.schemas.lesson import (
+    LessonBase,
+    LessonCreate,
+    LessonResponse,
+    LessonSummary,
+    RelatedLesson,
+)
+from app.schemas.fabric import FabricBase, FabricCreate, FabricResponse, FabricSummary
+from app.schemas.garment import GarmentBase, GarmentCreate, GarmentResponse, GarmentSummary
+from app.schemas.term import TermBase, TermCreate, TermResponse, TermSuggestion
 from app.schemas.tag import TagBase, TagCreate, TagResponse
+from app.schemas.pagination import Page
+from app.schemas.search import SearchResult, SearchResponse
+from app.schemas.bulk import BulkItemResult, BulkResponse, ImportRowError, ImportResponse
+from app.schemas.includes import (
+    FabricExpanded,
+    FabricGarment,
+    GarmentExpanded,
+    GarmentFabric,
+    LessonExpanded,
+    LessonFabric,
+    LessonGarment,
+    LessonTerm,
+)
+from app.schemas.graph import FabricGarmentLink, LessonFabricGarments
 
 __all__ = [
     "CategoryBase",
     "CategoryCreate",
     "CategoryResponse",
+    "CategoryTreeNode",
+    "CategoryTreeTopic",
     "TopicBase",
     "TopicCreate",
     "TopicResponse",
     "LessonBase",
     "LessonCreate",
     "LessonResponse",
+    "LessonSummary",
+    "RelatedLesson",
     "FabricBase",
     "FabricCreate",
     "FabricResponse",
+    "FabricSummary",
     "GarmentBase",
     "GarmentCreate",
     "GarmentResponse",
+    "GarmentSummary",
     "TermBase",
     "TermCreate",
     "TermResponse",
+    "TermSuggestion",
     "TagBase",
     "TagCreate",
     "TagResponse",
+    "Page",
+    "SearchResult",
+    "SearchResponse",
+    "BulkItemResult",
+    "BulkResponse",
+    "ImportRowError",
+    "ImportResponse",
+    "LessonFabric",
+    "LessonGarment",
+    "LessonTerm",
+    "FabricGarment",
+    "GarmentFabric",
+    "LessonExpanded",
+    "FabricExpanded",
+    "GarmentExpanded",
+    "FabricGarmentLink",
+    "LessonFabricGarments",
 ]
@@ -0,0 +1,39 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item in a bulk upsert, in request order."""
+
+    index: int
+    status: str  # created, updated, error
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Schema for bulk upsert responses."""
+
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class ImportRowError(BaseModel):
+    """A line of an NDJSON import that was skipped."""
+
+    line: int
+    detail: str
+
+
+class ImportResponse(BaseModel):
+    """Schema for NDJSON import responses."""
+
+    resource: str
+    received: int
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: List[ImportRowError]
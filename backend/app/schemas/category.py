@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -27,3 +27,29 @@ class CategoryResponse(CategoryBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryTreeTopic(BaseModel):
+    """Schema for a topic inside the category tree."""
+
+    id: int
+    name: str
+    slug: str
+    description: Optional[str] = None
+    lesson_count: int
+
+
+class CategoryTreeNode(BaseModel):
+    """Schema for a category with its topics and subcategories."""
+
+    id: int
+    name: str
+    slug: str
+    description: Optional[str] = None
+    icon_url: Optional[str] = None
+    parent_id: Optional[int] = None
+    depth: int
+    topic_count: int
+    lesson_count: int  # lessons in this category and all its subcategories
+    topics: List[CategoryTreeTopic]
+    children: List["CategoryTreeNode"]
@@ -35,3 +35,24 @@ class FabricResponse(FabricBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FabricSummary(BaseModel):
+    """Schema for Fabric list entries without care instructions and properties."""
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    fiber_content: Optional[str] = None
+    fiber_type: Optional[str] = None
+    weight: Optional[str] = None
+    weave_type: Optional[str] = None
+    drape: Optional[str] = None
+    texture: Optional[str] = None
+    common_uses: Optional[str] = None
+    season: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
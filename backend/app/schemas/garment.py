@@ -31,3 +31,19 @@ class GarmentResponse(GarmentBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class GarmentSummary(BaseModel):
+    """Schema for Garment list entries without the long-form text sections."""
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    garment_type: Optional[str] = None
+    formality_level: Optional[str] = None
+    key_features: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
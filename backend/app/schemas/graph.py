@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from app.schemas.includes import FabricGarment, LessonFabric
+
+
+class FabricGarmentLink(BaseModel):
+    """Schema for creating or updating a fabric–garment link."""
+
+    usage_note: Optional[str] = None
+
+
+class LessonFabricGarments(LessonFabric):
+    """Schema for a fabric a lesson recommends, with the garments it suits."""
+
+    garments: List[FabricGarment]
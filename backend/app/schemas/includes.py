@@ -0,0 +1,58 @@
+from typing import List, Optional
+
+from app.schemas.fabric import FabricResponse, FabricSummary
+from app.schemas.garment import GarmentResponse, GarmentSummary
+from app.schemas.lesson import LessonResponse
+from app.schemas.tag import TagResponse
+from app.schemas.term import TermResponse
+
+
+class LessonFabric(FabricSummary):
+    """Schema for a fabric expanded into a lesson, with the lesson's note."""
+
+    note: Optional[str] = None
+
+
+class LessonGarment(GarmentSummary):
+    """Schema for a garment expanded into a lesson, with the lesson's note."""
+
+    note: Optional[str] = None
+
+
+class FabricGarment(GarmentSummary):
+    """Schema for a garment expanded into a fabric, with the usage note."""
+
+    usage_note: Optional[str] = None
+
+
+class GarmentFabric(FabricSummary):
+    """Schema for a fabric expanded into a garment, with the usage note."""
+
+    usage_note: Optional[str] = None
+
+
+class LessonTerm(TermResponse):
+    """Schema for a glossary term linked to a lesson, with its offsets in the content."""
+
+    offsets: Optional[List[List[int]]] = None
+
+
+class LessonExpanded(LessonResponse):
+    """Schema for Lesson responses; relationships appear only when included."""
+
+    fabrics: Optional[List[LessonFabric]] = None
+    garments: Optional[List[LessonGarment]] = None
+    terms: Optional[List[LessonTerm]] = None
+    tags: Optional[List[TagResponse]] = None
+
+
+class FabricExpanded(FabricResponse):
+    """Schema for Fabric responses; relationships appear only when included."""
+
+    garments: Optional[List[FabricGarment]] = None
+
+
+class GarmentExpanded(GarmentResponse):
+    """Schema for Garment responses; relationships appear only when included."""
+
+    fabrics: Optional[List[GarmentFabric]] = None
@@ -26,7 +26,31 @@ class LessonResponse(LessonBase):
     """Schema for Lesson responses."""
 
     id: int
+    content_html: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class LessonSummary(BaseModel):
+    """Schema for Lesson list entries without the content body."""
+
+    id: int
+    topic_id: int
+    title: str
+    slug: str
+    summary: Optional[str] = None
+    reading_time_minutes: Optional[int] = None
+    difficulty_level: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RelatedLesson(LessonSummary):
+    """Schema for a related lesson with its tag and term overlap score."""
+
+    score: float
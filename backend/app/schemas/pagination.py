@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Schema for a single page of a cursor-paginated list."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    # Only on the first page (no cursor)
+    total: Optional[int] = None
+    total_is_estimate: bool = False
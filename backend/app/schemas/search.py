@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class SearchResult(BaseModel):
+    """Schema for a single full-text search hit."""
+
+    type: str
+    id: int
+    title: str
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Schema for full-text search responses."""
+
+    query: str
+    language: str
+    results: List[SearchResult]
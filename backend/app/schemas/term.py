@@ -27,3 +27,12 @@ class TermResponse(TermBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TermSuggestion(BaseModel):
+    """Schema for glossary autocomplete suggestions."""
+
+    id: int
+    term: str
+    category: Optional[str] = None
+    score: float
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list response path: ORM + pydantic against Core rows + orjson.
+
+Run from backend directory:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --rows 50000 --repeat 5
+
+Inserts ``--rows`` synthetic terms and lessons in a scratch language, then
+reads all of them back the way ``get_terms`` and ``get_lessons`` build their
+pages, once per path:
+
+* ``orm``  - ``select(Model)``, ORM objects validated and dumped by pydantic
+  (the previous path);
+* ``core`` - ``projection_query`` column rows encoded by `projected_page`.
+
+Two figures are reported per path, both in rows per second and best of
+``--repeat`` runs: walking every page of ``PAGE_SIZE_MAX`` rows with a fresh
+session per page (query, count and encoding, as a request pays for it), and
+encoding a single page holding every row (serialization alone). The
+synthetic rows are deleted afterwards.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.cache import json_response
+from app.core.config import settings
+from app.core.pagination import paginate
+from app.core.projection import projected_page, projection_query
+from app.models.lesson import Lesson
+from app.models.term import Term
+from app.models.topic import Topic
+from app.schemas.lesson import LessonResponse
+from app.schemas.pagination import Page
+from app.schemas.term import TermResponse
+
+# Not a language the catalog or the load benchmark's synthetic catalog
+# (scripts/generate_catalog.py, "zz") uses, so cleaning up deletes nothing else
+LANGUAGE = "zy"
+
+LESSON_CONTENT = (
+    "## Pressing as you sew\n\n"
+    "Press every seam before it is crossed by another. Use a **pressing cloth** "
+    "on wool and keep the iron moving along the grain.\n\n"
+    "- Open the seam allowances with the point of the iron\n"
+    "- Let the fabric cool flat before moving it\n"
+    "- Steam, then clap with a wooden clapper to set the crease\n\n"
+) * 4
+
+
+def term_rows(count: int):
+    return [
+        {
+            "term": f"Benchmark term {i}",
+            "definition": f"Synthetic glossary definition number {i} for the serialization benchmark.",
+            "category": "Construction",
+            "pronunciation": f"term-{i}",
+            "image_url": f"https://example.com/terms/{i}.jpg",
+            "language": LANGUAGE,
+        }
+        for i in range(count)
+    ]
+
+
+def lesson_rows(count: int, topic_id: int):
+    return [
+        {
+            "topic_id": topic_id,
+            "title": f"Benchmark lesson {i}",
+            "slug": f"benchmark-lesson-{LANGUAGE}-{i}",
+            "summary": f"Synthetic lesson {i} for the serialization benchmark",
+            "content": LESSON_CONTENT,
+            "content_html": f"<p>Synthetic lesson {i}</p>",
+            "reading_time_minutes": 5 + i % 20,
+            "difficulty_level": ("Beginner", "Intermediate", "Advanced")[i % 3],
+            "image_url": f"https://example.com/lessons/{i}.jpg",
+            "language": LANGUAGE,
+        }
+        for i in range(count)
+    ]
+
+
+def orm_query(model, response_schema):
+    return select(model).where(model.language == LANGUAGE)
+
+
+def core_query(model, response_schema):
+    key_columns = (model.language, model.id)
+    return projection_query(model, list(response_schema.model_fields), key_columns).where(
+        model.language == LANGUAGE
+    )
+
+
+def orm_encode(page, response_schema):
+    return json_response(Page[response_schema], page)
+
+
+def core_encode(page, response_schema):
+    return projected_page(page, list(response_schema.model_fields))
+
+
+PATHS = {
+    "orm": (orm_query, orm_encode),
+    "core": (core_query, core_encode),
+}
+
+
+async def walk_pages(session_maker, model, response_schema, path: str) -> int:
+    """Read every synthetic row page by page, as a client paging the list would."""
+    build_query, encode = PATHS[path]
+    key_columns = (model.language, model.id)
+    rows = 0
+    after = None
+    while True:
+        async with session_maker() as session:
+            page = await paginate(
+                session,
+                build_query(model, response_schema),
+                key_columns,
+                after,
+                settings.PAGE_SIZE_MAX,
+            )
+            rows += len(page["items"])
+            encode(page, response_schema)
+        after = page["next_cursor"]
+        if after is None:
+            return rows
+
+
+async def encode_one_page(session_maker, model, response_schema, path: str) -> tuple:
+    """Fetch every synthetic row, then time encoding them as a single page."""
+    build_query, encode = PATHS[path]
+    async with session_maker() as session:
+        result = await session.execute(
+            build_query(model, response_schema).order_by(model.language, model.id)
+        )
+        if path == "orm":
+            items = list(result.scalars().all())
+        else:
+            items = [dict(row) for row in result.mappings().all()]
+        page = {"items": items, "next_cursor": None, "total": len(items), "total_is_estimate": False}
+        started = time.perf_counter()
+        response = encode(page, response_schema)
+        return len(items), time.perf_counter() - started, len(response.body)
+
+
+async def benchmark(session_maker, name: str, model, response_schema, repeat: int) -> None:
+    print(f"\n{name}")
+    results = {}
+    for path in PATHS:
+        best_walk = best_encode = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = await walk_pages(session_maker, model, response_schema, path)
+            best_walk = min(best_walk, time.perf_counter() - started)
+            rows, elapsed, size = await encode_one_page(session_maker, model, response_schema, path)
+            best_encode = min(best_encode, elapsed)
+        results[path] = (rows / best_walk, rows / best_encode)
+        print(
+            f"  {path:<5} pages: {rows / best_walk:>10,.0f} rows/s   "
+            f"encode: {rows / best_encode:>10,.0f} rows/s   ({rows} rows, {size:,} bytes)"
+        )
+    (orm_walk, orm_encode_rate), (core_walk, core_encode_rate) = results["orm"], results["core"]
+    print(
+        f"  speedup pages: {core_walk / orm_walk:.2f}x   "
+        f"encode: {core_encode_rate / orm_encode_rate:.2f}x"
+    )
+
+
+async def main(rows: int, repeat: int):
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with session_maker() as session:
+            topic_id = (await session.execute(select(Topic.id).limit(1))).scalar()
+            if topic_id is None:
+                print("✗ No topics found; seed the database first")
+                return
+            await session.execute(insert(Term), term_rows(rows))
+            await session.execute(insert(Lesson), lesson_rows(rows, topic_id))
+            await session.commit()
+
+        print(f"{rows} synthetic rows per table, pages of {settings.PAGE_SIZE_MAX}, best of {repeat}")
+        await benchmark(session_maker, "get_terms", Term, TermResponse, repeat)
+        await benchmark(session_maker, "get_lessons", Lesson, LessonResponse, repeat)
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(Term).where(Term.language == LANGUAGE))
+            await session.execute(delete(Lesson).where(Lesson.language == LANGUAGE))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark EdTailor list serialization.")
+    parser.add_argument('--rows', type=int, default=10000, help="synthetic rows per table")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per path; the best is kept")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic catalog for load benchmarks.
+
+Run from backend directory:
+    python scripts/generate_catalog.py --scale 10000
+    python scripts/generate_catalog.py --scale 1000000 --language zx
+    python scripts/generate_catalog.py --drop
+
+Rows are copies of the seed files in ``scripts/seed_data`` (every language),
+renamed to stay unique, so text lengths and shapes match the real catalog.
+``--scale`` is the number of lessons and of terms, from 1k to 1M; the other
+tables are sized from it:
+
+    categories  scale / 1000   (at least 4)
+    topics      scale / 100    (at least 8)
+    fabrics     scale / 10     (at least 10)
+    garments    scale / 10     (at least 10)
+    tags        scale / 100    (at least 10)
+
+Each lesson links two fabrics, one garment and three tags, and each fabric
+three garments. Everything is written in one language code (``zz`` by
+default) that the real catalog does not use, and ``--drop`` removes it.
+Rows are loaded with COPY in batches, with ids reserved from the table
+sequences, and lesson HTML is rendered once per template. Glossary links are
+not generated; run ``scripts/link_glossary.py --language zz`` if needed.
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.rendering import content_hash, render_markdown
+from app.models.category import Category
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.models.tag import Tag
+from app.models.term import Term
+from app.models.topic import Topic
+
+SEED_DATA = Path(__file__).parent / "seed_data"
+# scripts/benchmark_serialization.py writes and deletes "zy"
+DEFAULT_LANGUAGE = "zz"
+MIN_SCALE = 1_000
+MAX_SCALE = 1_000_000
+BATCH_SIZE = 5_000
+
+LESSON_FABRICS = 2
+LESSON_GARMENTS = 1
+LESSON_TAGS = 3
+FABRIC_GARMENTS = 3
+
+
+def table_sizes(scale: int) -> Dict[str, int]:
+    return {
+        "categories": max(4, scale // 1000),
+        "topics": max(8, scale // 100),
+        "lessons": scale,
+        "terms": scale,
+        "fabrics": max(10, scale // 10),
+        "garments": max(10, scale // 10),
+        "tags": max(10, scale // 100),
+    }
+
+
+def load_templates() -> Dict[str, List[dict]]:
+    """Every seed record, grouped by the key it is listed under."""
+    templates: Dict[str, List[dict]] = {}
+    for path in sorted(SEED_DATA.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for key, records in data.items():
+            templates.setdefault(key, []).extend(records)
+    return templates
+
+
+class Generator:
+    def __init__(self, session: AsyncSession, language: str, seed: int):
+        self.session = session
+        self.language = language
+        self.random = random.Random(seed)
+        self.templates = load_templates()
+        self.rows: Dict[str, int] = {}
+
+    async def reserve_ids(self, table: str, count: int) -> List[int]:
+        sequence = f"pg_get_serial_sequence('{table}', 'id')"
+        result = await self.session.execute(
+            text(f"SELECT nextval({sequence}) FROM generate_series(1, :n)"), {"n": count}
+        )
+        return list(result.scalars())
+
+    async def copy(self, table: str, columns: List[str], records: List[tuple]) -> None:
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table, records=records, columns=columns)
+        self.rows[table] = self.rows.get(table, 0) + len(records)
+
+    async def generate(self, table: str, count: int, columns: List[str], make_record) -> List[int]:
+        """Insert ``count`` rows built by ``make_record(index)``; returns their ids."""
+        ids: List[int] = []
+        for start in range(0, count, BATCH_SIZE):
+            batch_ids = await self.reserve_ids(table, min(BATCH_SIZE, count - start))
+            records = [
+                (row_id, *make_record(start + offset))
+                for offset, row_id in enumerate(batch_ids)
+            ]
+            await self.copy(table, ["id", *columns], records)
+            ids.extend(batch_ids)
+            print(f"  {table}: {len(ids)}/{count}", end="\r")
+        print(f"  {table}: {count} rows" + " " * 10)
+        return ids
+
+    async def link(self, table: str, columns: List[str], pairs) -> None:
+        batch = []
+        for pair in pairs:
+            batch.append(pair)
+            if len(batch) >= BATCH_SIZE:
+                await self.copy(table, columns, batch)
+                batch = []
+        if batch:
+            await self.copy(table, columns, batch)
+        print(f"  {table}: {self.rows.get(table, 0)} links")
+
+    def pick(self, key: str, index: int) -> dict:
+        records = self.templates[key]
+        return records[index % len(records)]
+
+    async def run(self, scale: int) -> None:
+        sizes = table_sizes(scale)
+        language = self.language
+
+        def category(i):
+            t = self.pick("categories", i)
+            return (f"{t['name']} {i}", t.get("description"), f"{t['slug']}-{language}-{i}",
+                    t.get("icon_url"), language)
+
+        category_ids = await self.generate(
+            "categories", sizes["categories"],
+            ["name", "description", "slug", "icon_url", "language"], category,
+        )
+
+        def topic(i):
+            t = self.pick("topics", i)
+            return (category_ids[i % len(category_ids)], f"{t['name']} {i}", t.get("description"),
+                    f"{t['slug']}-{language}-{i}", language)
+
+        topic_ids = await self.generate(
+            "topics", sizes["topics"],
+            ["category_id", "name", "description", "slug", "language"], topic,
+        )
+
+        lesson_templates = self.templates["lessons"]
+        rendered = [
+            (render_markdown(t["content"]), content_hash(t["content"])) for t in lesson_templates
+        ]
+
+        def lesson(i):
+            t = lesson_templates[i % len(lesson_templates)]
+            html, digest = rendered[i % len(lesson_templates)]
+            return (topic_ids[i % len(topic_ids)], f"{t['title']} {i}", f"{t['slug']}-{language}-{i}",
+                    t.get("summary"), t["content"], html, digest, t.get("reading_time_minutes"),
+                    t.get("difficulty_level"), t.get("image_url"), language)
+
+        lesson_ids = await self.generate(
+            "lessons", sizes["lessons"],
+            ["topic_id", "title", "slug", "summary", "content", "content_html", "content_hash",
+             "reading_time_minutes", "difficulty_level", "image_url", "language"],
+            lesson,
+        )
+
+        def term(i):
+            t = self.pick("terms", i)
+            return (f"{t['term']} {i}", t["definition"], t.get("category"), t.get("pronunciation"),
+                    t.get("image_url"), language)
+
+        await self.generate(
+            "terms", sizes["terms"],
+            ["term", "definition", "category", "pronunciation", "image_url", "language"], term,
+        )
+
+        fabric_columns = ["name", "description", "fiber_content", "fiber_type", "weight",
+                          "weave_type", "drape", "texture", "care_instructions", "common_uses",
+                          "properties", "season", "image_url"]
+
+        def fabric(i):
+            t = self.pick("fabrics", i)
+            t = dict(t, name=f"{t['name']} #{i}")
+            if t.get("properties") is not None:
+                t["properties"] = json.dumps(t["properties"])
+            return (*(t.get(column) for column in fabric_columns), language)
+
+        fabric_ids = await self.generate(
+            "fabrics", sizes["fabrics"], [*fabric_columns, "language"], fabric
+        )
+
+        garment_columns = ["name", "description", "garment_type", "formality_level",
+                           "construction_details", "key_features", "historical_context",
+                           "styling_tips", "image_url"]
+
+        def garment(i):
+            t = self.pick("garments", i)
+            t = dict(t, name=f"{t['name']} #{i}")
+            return (*(t.get(column) for column in garment_columns), language)
+
+        garment_ids = await self.generate(
+            "garments", sizes["garments"], [*garment_columns, "language"], garment
+        )
+
+        tag_ids = await self.generate(
+            "tags", sizes["tags"], ["name"], lambda i: (f"{language}-bench-{i}",)
+        )
+
+        sample = self.random.sample
+        await self.link(
+            "fabric_garments", ["fabric_id", "garment_id", "usage_note"],
+            ((fabric_id, garment_id, "Synthetic usage note")
+             for fabric_id in fabric_ids
+             for garment_id in sample(garment_ids, FABRIC_GARMENTS)),
+        )
+        await self.link(
+            "lesson_fabrics", ["lesson_id", "fabric_id", "note"],
+            ((lesson_id, fabric_id, None)
+             for lesson_id in lesson_ids
+             for fabric_id in sample(fabric_ids, LESSON_FABRICS)),
+        )
+        await self.link(
+            "lesson_garments", ["lesson_id", "garment_id", "note"],
+            ((lesson_id, garment_id, None)
+             for lesson_id in lesson_ids
+             for garment_id in sample(garment_ids, LESSON_GARMENTS)),
+        )
+        await self.link(
+            "lesson_tags", ["lesson_id", "tag_id"],
+            ((lesson_id, tag_id)
+             for lesson_id in lesson_ids
+             for tag_id in sample(tag_ids, LESSON_TAGS)),
+        )
+
+
+async def drop(session: AsyncSession, language: str) -> None:
+    # Association rows go with their lessons, fabrics and garments (ON DELETE CASCADE)
+    for model in (Lesson, Topic, Category, Term, Fabric, Garment):
+        result = await session.execute(delete(model).where(model.language == language))
+        print(f"  {model.__tablename__}: {result.rowcount} rows deleted")
+    result = await session.execute(delete(Tag).where(Tag.name.like(f"{language}-bench-%")))
+    print(f"  tags: {result.rowcount} rows deleted")
+
+
+async def main(scale: int, language: str, seed: int, drop_only: bool):
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    async_session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    started = time.perf_counter()
+    try:
+        async with async_session_maker() as session:
+            if drop_only:
+                print(f"Dropping the synthetic '{language}' catalog...")
+                await drop(session, language)
+                await session.commit()
+            else:
+                existing = await session.execute(
+                    select(func.count()).select_from(Lesson).where(Lesson.language == language)
+                )
+                if existing.scalar_one():
+                    print(f"✗ A '{language}' catalog already exists; remove it with --drop first")
+                    sys.exit(1)
+                print(f"Generating a '{language}' catalog at scale {scale}...")
+                await Generator(session, language, seed).run(scale)
+                await session.commit()
+        if not drop_only:
+            # Fresh planner statistics, so counts and plans match the new size
+            async with engine.connect() as connection:
+                await connection.execution_options(isolation_level="AUTOCOMMIT")
+                await connection.execute(text("ANALYZE"))
+    finally:
+        await engine.dispose()
+
+    print(f"✓ Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic EdTailor catalog.")
+    parser.add_argument('--scale', type=int, default=10_000,
+                        help=f"lessons and terms to generate ({MIN_SCALE}-{MAX_SCALE})")
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE,
+                        help="language code of the synthetic catalog")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the links")
+    parser.add_argument('--drop', action='store_true', help="delete the synthetic catalog")
+    args = parser.parse_args()
+    if not args.drop and not MIN_SCALE <= args.scale <= MAX_SCALE:
+        parser.error(f"--scale must be between {MIN_SCALE} and {MAX_SCALE}")
+    asyncio.run(main(args.scale, args.language, args.seed, args.drop))
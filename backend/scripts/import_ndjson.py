@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Import a newline-delimited JSON file into one content table.
+
+Run from backend directory:
+    python scripts/import_ndjson.py terms terms_de.ndjson --language de
+    python scripts/import_ndjson.py fabrics catalog.ndjson.gz
+
+Each line is an object in the resource's create format (``/api/export``
+output works as is). Rows are validated in batches and loaded with COPY, so
+memory use stays flat however large the file is.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.importer import IMPORT_TARGETS, gunzip, import_ndjson, iter_lines
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def read_chunks(path: Path):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def main(resource: str, path: Path, language: str):
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    async_session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    chunks = read_chunks(path)
+    if path.suffix == '.gz':
+        chunks = gunzip(chunks)
+
+    started = time.perf_counter()
+    try:
+        async with async_session_maker() as session:
+            result = await import_ndjson(session, resource, iter_lines(chunks), language)
+            await session.commit()
+    except HTTPException as e:
+        print(f"✗ {e.detail}")
+        sys.exit(1)
+    finally:
+        await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✓ {resource}: {result['received']} lines, {result['created']} created, "
+        f"{result['updated']} updated, {result['unchanged']} unchanged, {result['failed']} failed "
+        f"in {elapsed:.2f}s ({result['received'] / elapsed:,.0f} rows/s)"
+    )
+    for error in result['errors']:
+        print(f"  line {error['line']}: {error['detail']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import NDJSON into an EdTailor content table.")
+    parser.add_argument('resource', choices=sorted(IMPORT_TARGETS))
+    parser.add_argument('path', type=Path, help="NDJSON file, optionally gzip-compressed (.gz)")
+    parser.add_argument(
+        '--language', default='en', help="language for lines that do not set their own",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.resource, args.path, args.language))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Re-link every lesson to the glossary terms found in its content.
+
+Run from backend directory:
+    python scripts/link_glossary.py
+    python scripts/link_glossary.py --language ru
+
+Lessons are linked on write and re-linked when terms change; run this once
+after upgrading, or after editing terms directly in the database. Each
+lesson is one pass of its language's Aho–Corasick automaton, and only
+lessons whose links changed are rewritten.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.glossary import link_lessons
+
+
+async def main(language: str = None):
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    async_session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    started = time.perf_counter()
+    try:
+        async with async_session_maker() as session:
+            changed = await link_lessons(session, language=language)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print(f"✓ {changed} lessons re-linked in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Link EdTailor lessons to glossary terms.")
+    parser.add_argument('--language', help="only lessons in this language")
+    args = parser.parse_args()
+    asyncio.run(main(args.language))
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+HTTP load benchmark: latency percentiles and throughput per route.
+
+Run from backend directory, after ``scripts/generate_catalog.py``:
+    python scripts/load_benchmark.py
+    python scripts/load_benchmark.py --url http://localhost:8000 --concurrency 64
+    python scripts/load_benchmark.py --routes lessons,terms --duration 30
+    python scripts/load_benchmark.py --compare bench/before.json bench/after.json
+
+Every scenario below is driven for ``--duration`` seconds by
+``--concurrency`` clients, each sending its next request as soon as the
+previous one completes. Detail routes pick random ids from the synthetic
+catalog, so they mix response cache hits and misses the way real traffic
+does; list routes hit the same pages and mostly measure the cached path
+unless ``--no-cache`` is given (in-process only).
+
+Without ``--url`` the app runs in this process through an ASGI transport:
+no sockets, so the numbers are the app and the database, but clients and
+server share one event loop. Point ``--url`` at uvicorn for end-to-end
+numbers.
+
+Results (p50/p95/p99/mean/max latency in ms, requests per second, errors)
+are written to ``--output``, by default ``bench/<commit>.json``, together
+with the commit, settings and catalog size, so runs can be compared with
+``--compare``.
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.fabric import Fabric
+from app.models.garment import Garment
+from app.models.lesson import Lesson
+from app.models.term import Term
+from app.models.topic import Topic
+
+DEFAULT_LANGUAGE = "zz"
+# Ids sampled per table to pick detail requests from
+ID_SAMPLE = 10_000
+
+
+class Scenario(NamedTuple):
+    name: str
+    # formatted with {lang}, a random {id} from ``table`` and a random {q}
+    path: str
+    table: Optional[str] = None
+    queries: Sequence[str] = ()
+
+    def url(self, rng: random.Random, ids: Dict[str, List[int]], language: str) -> str:
+        return self.path.format(
+            lang=language,
+            id=rng.choice(ids[self.table]) if self.table else None,
+            q=rng.choice(self.queries) if self.queries else None,
+        )
+
+
+SCENARIOS = [
+    Scenario("categories_list", "/api/categories/?language={lang}"),
+    Scenario("categories_tree", "/api/categories/tree?language={lang}"),
+    Scenario("category_topics", "/api/categories/{id}/topics?language={lang}", "categories"),
+    Scenario("topic_lessons", "/api/topics/{id}/lessons?language={lang}&view=summary", "topics"),
+    Scenario("lessons_list", "/api/lessons?language={lang}"),
+    Scenario(
+        "lessons_list_include",
+        "/api/lessons?language={lang}&include=fabrics,garments,tags&limit=20",
+    ),
+    Scenario("lesson_detail", "/api/lessons/{id}", "lessons"),
+    Scenario("lesson_related", "/api/lessons/{id}/related", "lessons"),
+    Scenario("lesson_fabric_garments", "/api/lessons/{id}/fabric-garments", "lessons"),
+    Scenario("fabrics_list", "/api/fabrics/?language={lang}"),
+    Scenario("fabric_detail", "/api/fabrics/{id}", "fabrics"),
+    Scenario("fabric_garments", "/api/fabrics/{id}/garments", "fabrics"),
+    Scenario("garments_list", "/api/garments/?language={lang}"),
+    Scenario("garment_detail", "/api/garments/{id}", "garments"),
+    Scenario("terms_list", "/api/terms/?language={lang}"),
+    Scenario("term_detail", "/api/terms/{id}", "terms"),
+    Scenario(
+        "terms_autocomplete",
+        "/api/terms/autocomplete?q={q}&language={lang}",
+        queries=("ba", "lap", "dart", "seam"),
+    ),
+    Scenario(
+        "search", "/api/search?q={q}&language={lang}", queries=("stitch", "wool", "jacket", "press")
+    ),
+]
+
+TABLES = {
+    "categories": Category,
+    "topics": Topic,
+    "lessons": Lesson,
+    "fabrics": Fabric,
+    "garments": Garment,
+    "terms": Term,
+}
+
+
+async def catalog(language: str):
+    """Row counts and a sample of ids per table in ``language``."""
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    counts: Dict[str, int] = {}
+    ids: Dict[str, List[int]] = {}
+    try:
+        async with sessions() as session:
+            for name, model in TABLES.items():
+                where = model.language == language
+                counts[name] = (
+                    await session.execute(select(func.count()).select_from(model).where(where))
+                ).scalar_one()
+                result = await session.execute(
+                    select(model.id).where(where).order_by(func.random()).limit(ID_SAMPLE)
+                )
+                ids[name] = list(result.scalars())
+    finally:
+        await engine.dispose()
+    return counts, ids
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ids: Dict[str, List[int]],
+    language: str,
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            path = scenario.url(rng, ids, language)
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+            except Exception:
+                # in-process, unhandled app errors surface here instead of as a 500
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 3)  # noqa: E731
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> None:
+    counts, ids = await catalog(args.language)
+    if not ids["lessons"]:
+        print(f"✗ No '{args.language}' catalog; run scripts/generate_catalog.py first")
+        sys.exit(1)
+
+    scenarios = SCENARIOS
+    if args.routes:
+        wanted = [name.strip() for name in args.routes.split(",") if name.strip()]
+        scenarios = [s for s in SCENARIOS if any(name in s.name for name in wanted)]
+
+    if args.url:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=args.concurrency)
+        )
+        base_url = args.url.rstrip("/")
+        mode = "http"
+    else:
+        if args.no_cache:
+            settings.RESPONSE_CACHE_ENABLED = False
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+        mode = "in-process"
+
+    print(
+        f"{mode} {args.url or ''} | catalog '{args.language}': "
+        + ", ".join(f"{name} {count}" for name, count in counts.items())
+    )
+    print(f"{args.concurrency} clients, {args.duration:g}s per route\n")
+    print(f"{'route':<24}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+    results: Dict[str, dict] = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30.0) as client:
+        for scenario in scenarios:
+            if args.warmup:
+                await drive(client, scenario, ids, args.language, args.concurrency, args.warmup, 0)
+            result = await drive(
+                client, scenario, ids, args.language, args.concurrency, args.duration, args.seed
+            )
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<24}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}"
+            )
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": mode,
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "response_cache": settings.RESPONSE_CACHE_ENABLED and not args.no_cache,
+            "language": args.language,
+            "catalog": counts,
+            "python": platform.python_version(),
+        },
+        "routes": results,
+    }
+    output = Path(args.output or f"bench/{commit or 'results'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n✓ Results written to {output}")
+
+
+def compare(before_path: str, after_path: str) -> None:
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}\n")
+    print(f"{'route':<24}{'rps':>20}{'p50 ms':>20}{'p99 ms':>20}")
+    for name, new in after["routes"].items():
+        old = before["routes"].get(name)
+        if old is None:
+            continue
+        cells = []
+        for key in ("rps", "p50_ms", "p99_ms"):
+            change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            cells.append(f"{new[key]:>10.1f} {change:>+7.1f}%")
+        print(f"{name:<24}" + "".join(f"{cell:>20}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the EdTailor API per route.")
+    parser.add_argument('--url', help="base URL of a running server; in-process when omitted")
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE,
+                        help="language code of the synthetic catalog")
+    parser.add_argument('--concurrency', type=int, default=32, help="concurrent clients")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per route")
+    parser.add_argument('--warmup', type=float, default=1.0, help="unrecorded seconds per route")
+    parser.add_argument('--routes', help="comma-separated substrings of route names to run")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for the requests")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="disable the response cache (in-process only)")
+    parser.add_argument('--output', help="results file (default: bench/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two results files instead of running")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        asyncio.run(run(args))
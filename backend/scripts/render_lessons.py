@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Render the Markdown of every lesson whose stored HTML is missing or stale.
+
+Run from backend directory:
+    python scripts/render_lessons.py
+
+Lessons are rendered on write; run this after upgrading, which adds
+``content_html`` empty, or after editing lesson content directly in the
+database. Only lessons whose content changed since they were last rendered
+are rendered, ``RENDER_BATCH_SIZE`` at a time, so a second run is a single
+query.
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.rendering import render_stale_lessons
+
+
+async def main():
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
+    async_session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    started = time.perf_counter()
+    try:
+        async with async_session_maker() as session:
+            rendered = await render_stale_lessons(session)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print(f"✓ {len(rendered)} lessons rendered in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
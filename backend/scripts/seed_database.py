@@ -3,12 +3,18 @@
 Seed script to populate EdTailor database with educational content.
 
 Run from backend directory:
-    python scripts/seed_database.py
+    python scripts/seed_database.py [--force]
+
+Files whose content hash matches the seed_manifest table are skipped;
+--force applies every file again (rows that already exist are still kept).
 """
 
 import sys
 import os
 import json
+import hashlib
+import argparse
+import time
 import asyncio
 from pathlib import Path
 
@@ -16,11 +22,20 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.config import settings
 from app.core.database import Base
-from app.models import Category, Topic, Lesson, Fabric, Garment, Term, Tag
+from app.core.glossary import link_lessons
+from app.core.rendering import render_stale_lessons
+from app.models import Category, Topic, Lesson, Fabric, Garment, Term, Tag, SeedManifest
+
+SEED_DATA_DIR = Path(__file__).resolve().parent / 'seed_data'
+LANGUAGES = ['en', 'ru']
+
+# Rows per set-based lookup or multi-row INSERT
+BATCH_SIZE = 1000
 
 
 # Color output for terminal
@@ -62,271 +77,246 @@ def load_json_file(filepath):
         return None
 
 
-async def seed_categories_and_content(session: AsyncSession):
-    """Seed English categories, topics, and lessons."""
-    print_info("Loading educational content...")
-    # Try enhanced content first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/educational_content_enhanced.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/educational_content.json')
-    if data:
-        await seed_categories_and_content_from_data(session, data)
-
-
-async def seed_fabrics(session: AsyncSession):
-    """Seed English fabric library."""
-    print_info("Loading fabrics...")
-    # Try enhanced fabrics first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/fabrics_enhanced.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/fabrics.json')
-    if data:
-        await seed_fabrics_from_data(session, data)
-
-
-async def seed_garments(session: AsyncSession):
-    """Seed English garment encyclopedia."""
-    print_info("Loading garments...")
-    # Try enhanced garments first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/garments_enhanced.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/garments.json')
-    if data:
-        await seed_garments_from_data(session, data)
-
-
-async def seed_terms(session: AsyncSession):
-    """Seed English terminology glossary."""
-    print_info("Loading terms...")
-    # Try enhanced terms first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/terms_enhanced.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/terms.json')
-    if data:
-        await seed_terms_from_data(session, data)
-
-
-async def seed_all_languages(session: AsyncSession):
-    """Seed data for all available languages."""
-    # English content
-    print(f"\n{Colors.BOLD}=== Seeding English Content ==={Colors.END}\n")
-    await seed_categories_and_content(session)
-    await seed_fabrics(session)
-    await seed_garments(session)
-    await seed_terms(session)
-
-    # Russian content
-    print(f"\n{Colors.BOLD}=== Seeding Russian Content (Русский контент) ==={Colors.END}\n")
-    await seed_categories_and_content_ru(session)
-    await seed_fabrics_ru(session)
-    await seed_garments_ru(session)
-    await seed_terms_ru(session)
-
-
-async def seed_categories_and_content_ru(session: AsyncSession):
-    """Seed Russian categories, topics, and lessons."""
-    print_info("Loading Russian educational content...")
-    # Try enhanced content first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/educational_content_enhanced_ru.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/educational_content_ru.json')
-    if data:
-        await seed_categories_and_content_from_data(session, data)
-
-
-async def seed_fabrics_ru(session: AsyncSession):
-    """Seed Russian fabric library."""
-    print_info("Loading Russian fabrics...")
-    # Try enhanced fabrics first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/fabrics_enhanced_ru.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/fabrics_ru.json')
-    if data:
-        await seed_fabrics_from_data(session, data)
-
-
-async def seed_garments_ru(session: AsyncSession):
-    """Seed Russian garment encyclopedia."""
-    print_info("Loading Russian garments...")
-    # Try enhanced garments first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/garments_enhanced_ru.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/garments_ru.json')
-    if data:
-        await seed_garments_from_data(session, data)
-
-
-async def seed_terms_ru(session: AsyncSession):
-    """Seed Russian terminology glossary."""
-    print_info("Loading Russian terms...")
-    # Try enhanced terms first, fall back to basic if not found
-    data = load_json_file('scripts/seed_data/terms_enhanced_ru.json')
-    if not data:
-        data = load_json_file('scripts/seed_data/terms_ru.json')
-    if data:
-        await seed_terms_from_data(session, data)
-
-
-async def seed_categories_and_content_from_data(session: AsyncSession, data: dict):
-    """Seed categories, topics, and lessons from provided data."""
-    category_map = {}
+def seed_file_candidates(kind: str, language: str):
+    """
+    Existing seed files for ``kind`` in ``language``, preferred first.
 
-    for cat_data in data['categories']:
-        result = await session.execute(
-            select(Category).where(Category.slug == cat_data['slug'])
-        )
-        category = result.scalar_one_or_none()
+    The enhanced file (e.g. ``fabrics_enhanced_ru.json``) is preferred and the
+    basic one (``fabrics_ru.json``) is the fallback; English files carry no
+    language suffix.
+    """
+    suffix = '' if language == 'en' else f'_{language}'
+    paths = (SEED_DATA_DIR / f'{kind}_enhanced{suffix}.json', SEED_DATA_DIR / f'{kind}{suffix}.json')
+    return [path for path in paths if path.exists()]
 
-        if category:
-            print_warning(f"Category '{cat_data['name']}' already exists, skipping")
-        else:
-            category = Category(**cat_data)
-            session.add(category)
-            await session.flush()
-            print_success(f"Created category: {cat_data['name']}")
 
-        category_map[cat_data['slug']] = category
+def file_hash(path: Path) -> str:
+    """SHA-256 hex digest of a seed file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
 
+
+async def load_manifest(session: AsyncSession):
+    """Map each applied seed file name to the content hash it was applied with."""
+    result = await session.execute(select(SeedManifest.filename, SeedManifest.content_hash))
+    return dict(result.all())
+
+
+async def record_seed_file(session: AsyncSession, filename: str, content_hash: str):
+    """Mark ``filename`` as applied with ``content_hash``."""
+    stmt = insert(SeedManifest).values(filename=filename, content_hash=content_hash)
+    await session.execute(stmt.on_conflict_do_update(
+        index_elements=['filename'],
+        set_={'content_hash': stmt.excluded.content_hash, 'applied_at': func.now()},
+    ))
     await session.commit()
 
-    topic_map = {}
-    for topic_data in data['topics']:
-        category_slug = topic_data.pop('category_slug')
-        category = category_map.get(category_slug)
 
-        if not category:
-            print_error(f"Category not found for slug: {category_slug}")
-            continue
+def batches(items, size=BATCH_SIZE):
+    """Split ``items`` into lists of at most ``size`` elements."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
-        result = await session.execute(
-            select(Topic).where(Topic.slug == topic_data['slug'])
-        )
-        topic = result.scalar_one_or_none()
 
-        if topic:
-            print_warning(f"Topic '{topic_data['name']}' already exists, skipping")
-        else:
-            topic = Topic(**topic_data, category_id=category.id)
-            session.add(topic)
-            await session.flush()
-            print_success(f"Created topic: {topic_data['name']}")
+def with_language(rows):
+    """Fill in the model default for rows that omit ``language``."""
+    return [{**row, 'language': row.get('language', 'en')} for row in rows]
 
-        topic_map[topic_data['slug']] = topic
 
-    await session.commit()
+async def insert_missing(session: AsyncSession, model, rows, key_fields):
+    """
+    Insert the ``rows`` whose ``key_fields`` are not in the table yet.
 
-    for lesson_data in data['lessons']:
-        topic_slug = lesson_data.pop('topic_slug')
-        topic = topic_map.get(topic_slug)
+    Existing keys are looked up with one set-based query per batch and the
+    missing rows are written as multi-row INSERTs; nothing is executed when
+    every row is already present. Returns ``(created, skipped)``.
+    """
+    key_columns = [getattr(model, field) for field in key_fields]
 
-        if not topic:
-            print_error(f"Topic not found for slug: {topic_slug}")
-            continue
+    def key(row):
+        return tuple(row[field] for field in key_fields)
 
+    existing = set()
+    for batch in batches({key(row) for row in rows}):
         result = await session.execute(
-            select(Lesson).where(Lesson.slug == lesson_data['slug'])
+            select(*key_columns).where(tuple_(*key_columns).in_(batch))
         )
-        lesson = result.scalar_one_or_none()
+        existing.update(tuple(found) for found in result)
 
-        if lesson:
-            print_warning(f"Lesson '{lesson_data['title']}' already exists, skipping")
-        else:
-            lesson = Lesson(**lesson_data, topic_id=topic.id)
-            session.add(lesson)
-            print_success(f"Created lesson: {lesson_data['title']}")
+    missing = []
+    for row in rows:
+        if key(row) not in existing:
+            existing.add(key(row))
+            missing.append(row)
 
-    await session.commit()
+    # A multi-row INSERT needs the same keys in every row
+    fields = set().union(*missing)
+    missing = [{field: row.get(field) for field in fields} for row in missing]
+    for batch in batches(missing):
+        # DO NOTHING covers a replica seeding the same rows concurrently
+        await session.execute(insert(model).values(batch).on_conflict_do_nothing())
 
+    return len(missing), len(rows) - len(missing)
 
-async def seed_fabrics_from_data(session: AsyncSession, data: dict):
-    """Seed fabrics from provided data."""
-    count = 0
-    for fabric_data in data['fabrics']:
+
+async def ids_by_slug(session: AsyncSession, model, slugs):
+    """Map ``slugs`` to row ids with one query per batch."""
+    id_map = {}
+    for batch in batches(set(slugs)):
         result = await session.execute(
-            select(Fabric).where(
-                (Fabric.name == fabric_data['name']) &
-                (Fabric.language == fabric_data.get('language', 'en'))
-            )
+            select(model.slug, model.id).where(model.slug.in_(batch))
         )
-        fabric = result.scalar_one_or_none()
+        id_map.update(result.all())
+    return id_map
+
+
+def report(language, label, created, skipped, started):
+    print_success(
+        f"[{language}] {label}: created {created}, already present {skipped} "
+        f"({time.perf_counter() - started:.2f}s)"
+    )
 
-        if fabric:
-            print_warning(f"Fabric '{fabric_data['name']}' already exists, skipping")
-        else:
-            fabric = Fabric(**fabric_data)
-            session.add(fabric)
-            count += 1
-            print_success(f"Created fabric: {fabric_data['name']}")
 
+async def seed_categories_and_content_from_data(session: AsyncSession, data: dict, language: str):
+    """Seed categories, topics, and lessons from provided data."""
+    started = time.perf_counter()
+    categories = with_language(data['categories'])
+    created, skipped = await insert_missing(session, Category, categories, ['slug'])
     await session.commit()
-    print_success(f"✓ Created {count} fabrics")
+    report(language, "Categories", created, skipped, started)
 
+    started = time.perf_counter()
+    category_ids = await ids_by_slug(
+        session, Category, (topic['category_slug'] for topic in data['topics'])
+    )
+    topics = []
+    for topic_data in with_language(data['topics']):
+        topic_data = dict(topic_data)
+        category_slug = topic_data.pop('category_slug')
+        if category_slug not in category_ids:
+            print_error(f"Category not found for slug: {category_slug}")
+            continue
+        topics.append({**topic_data, 'category_id': category_ids[category_slug]})
+    created, skipped = await insert_missing(session, Topic, topics, ['slug'])
+    await session.commit()
+    report(language, "Topics", created, skipped, started)
 
-async def seed_garments_from_data(session: AsyncSession, data: dict):
-    """Seed garments from provided data."""
-    count = 0
-    for garment_data in data['garments']:
-        result = await session.execute(
-            select(Garment).where(
-                (Garment.name == garment_data['name']) &
-                (Garment.language == garment_data.get('language', 'en'))
-            )
-        )
-        garment = result.scalar_one_or_none()
+    started = time.perf_counter()
+    topic_ids = await ids_by_slug(
+        session, Topic, (lesson['topic_slug'] for lesson in data['lessons'])
+    )
+    lessons = []
+    for lesson_data in with_language(data['lessons']):
+        lesson_data = dict(lesson_data)
+        topic_slug = lesson_data.pop('topic_slug')
+        if topic_slug not in topic_ids:
+            print_error(f"Topic not found for slug: {topic_slug}")
+            continue
+        lessons.append({**lesson_data, 'topic_id': topic_ids[topic_slug]})
+    created, skipped = await insert_missing(session, Lesson, lessons, ['slug'])
+    lesson_ids = await ids_by_slug(session, Lesson, (lesson['slug'] for lesson in lessons))
+    rendered = await render_stale_lessons(session, lesson_ids.values())
+    await link_lessons(session, rendered)
+    await session.commit()
+    report(language, "Lessons", created, skipped, started)
 
-        if garment:
-            print_warning(f"Garment '{garment_data['name']}' already exists, skipping")
-        else:
-            garment = Garment(**garment_data)
-            session.add(garment)
-            count += 1
-            print_success(f"Created garment: {garment_data['name']}")
 
+async def seed_fabrics_from_data(session: AsyncSession, data: dict, language: str):
+    """Seed fabrics from provided data."""
+    started = time.perf_counter()
+    fabrics = with_language(data['fabrics'])
+    created, skipped = await insert_missing(session, Fabric, fabrics, ['name', 'language'])
     await session.commit()
-    print_success(f"✓ Created {count} garments")
+    report(language, "Fabrics", created, skipped, started)
 
 
-async def seed_terms_from_data(session: AsyncSession, data: dict):
-    """Seed terms from provided data."""
-    count = 0
-    for term_data in data['terms']:
-        result = await session.execute(
-            select(Term).where(
-                (Term.term == term_data['term']) &
-                (Term.language == term_data.get('language', 'en'))
-            )
-        )
-        term = result.scalar_one_or_none()
+async def seed_garments_from_data(session: AsyncSession, data: dict, language: str):
+    """Seed garments from provided data."""
+    started = time.perf_counter()
+    garments = with_language(data['garments'])
+    created, skipped = await insert_missing(session, Garment, garments, ['name', 'language'])
+    await session.commit()
+    report(language, "Garments", created, skipped, started)
 
-        if term:
-            print_warning(f"Term '{term_data['term']}' already exists, skipping")
-        else:
-            term = Term(**term_data)
-            session.add(term)
-            count += 1
-            print_success(f"Created term: {term_data['term']}")
 
+async def seed_terms_from_data(session: AsyncSession, data: dict, language: str):
+    """Seed terms from provided data."""
+    started = time.perf_counter()
+    terms = with_language(data['terms'])
+    created, skipped = await insert_missing(session, Term, terms, ['term', 'language'])
     await session.commit()
-    print_success(f"✓ Created {count} terms")
+    if created:
+        await link_lessons(session, language=language)
+        await session.commit()
+    report(language, "Terms", created, skipped, started)
+
+
+# Seed file kind -> loader, in dependency order
+SEED_STAGES = [
+    ('educational_content', seed_categories_and_content_from_data),
+    ('fabrics', seed_fabrics_from_data),
+    ('garments', seed_garments_from_data),
+    ('terms', seed_terms_from_data),
+]
+
+
+async def seed_stage(session: AsyncSession, kind: str, seed_from_data, language: str,
+                     manifest: dict, force: bool):
+    """
+    Apply the seed file for one stage unless the manifest shows it unchanged.
+
+    Unchanged files are skipped before they are parsed. The manifest entry is
+    written only after the file's rows are committed, so an interrupted run
+    retries the file on the next start.
+    """
+    for path in seed_file_candidates(kind, language):
+        content_hash = file_hash(path)
+        if not force and manifest.get(path.name) == content_hash:
+            print_info(f"[{language}] {path.name} unchanged, skipping")
+            return
+        data = load_json_file(path)
+        if data:
+            await seed_from_data(session, data, language)
+            await record_seed_file(session, path.name, content_hash)
+            return
+    print_error(f"No seed file found for {kind} ({language})")
+
+
+async def seed_language(session_maker, language: str, force: bool = False):
+    """Seed every stage for one language on its own connection."""
+    started = time.perf_counter()
+    async with session_maker() as session:
+        manifest = await load_manifest(session)
+        for kind, seed_from_data in SEED_STAGES:
+            await seed_stage(session, kind, seed_from_data, language, manifest, force)
+    print_info(f"[{language}] Done in {time.perf_counter() - started:.2f}s")
+
+
+async def seed_all_languages(session_maker, force: bool = False):
+    """Seed data for all available languages, one concurrent pass each."""
+    print_info(f"Seeding {', '.join(LANGUAGES)} concurrently...")
+    await asyncio.gather(
+        *(seed_language(session_maker, language, force) for language in LANGUAGES)
+    )
 
 
-async def main():
+async def main(force: bool = False):
     """Main seeding function."""
     print(f"\n{Colors.BOLD}=== EdTailor Database Seeding ==={Colors.END}\n")
 
     # Create async engine and session
-    engine = create_async_engine(settings.database_url, echo=False)
+    engine = create_async_engine(settings.database_url, **settings.database_engine_options)
     async_session_maker = async_sessionmaker(
         engine, class_=AsyncSession, expire_on_commit=False
     )
 
     try:
-        async with async_session_maker() as session:
-            # Seed all data in both languages
-            await seed_all_languages(session)
+        started = time.perf_counter()
+        # Seed all data in both languages
+        await seed_all_languages(async_session_maker, force)
 
-            print(f"\n{Colors.GREEN}{Colors.BOLD}✓ Database seeding completed successfully!{Colors.END}\n")
-            print(f"{Colors.BLUE}📚 Content available in English and Russian (Английский и Русский){Colors.END}\n")
+        print(f"\n{Colors.GREEN}{Colors.BOLD}✓ Database seeding completed successfully in {time.perf_counter() - started:.2f}s!{Colors.END}\n")
+        print(f"{Colors.BLUE}📚 Content available in English and Russian (Английский и Русский){Colors.END}\n")
 
     except Exception as e:
         print_error(f"Error during seeding: {e}")
@@ -338,4 +328,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Seed the EdTailor database.")
+    parser.add_argument(
+        '--force', action='store_true',
+        help="apply every seed file, even those the seed manifest marks as unchanged",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(force=args.force))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Production entrypoint: uvicorn with several worker processes.
+
+Run from backend directory, after migrations and seeding:
+    python scripts/serve.py
+    DB_POOL_SIZE=5 DB_MAX_OVERFLOW=5 python scripts/serve.py --workers 4
+    python scripts/serve.py --reload   # development: one process, restarts on changes
+
+Workers (``SERVER_WORKERS``, 2 by default) share the listening socket, each
+with its own event loop, connection pool and in-memory caches. The server
+refuses to start when workers × (``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``)
+exceeds ``DB_CONNECTION_BUDGET``; the budgets of all servers, plus the
+migrations and any psql sessions, must fit in Postgres' ``max_connections``.
+Each worker runs on uvloop with the httptools parser and warms its pool
+before serving (`app.core.lifespan`).
+
+Each worker answers ``/metrics``, ``/db/stats`` and ``/cache/stats`` on the
+API port for itself only. Set ``WORKER_METRICS_PORT`` to give every worker
+its own metrics port and scrape them all (see `app.core.metrics`).
+
+On SIGTERM the supervisor stops the workers, which close the listening
+socket, finish in-flight requests for up to
+``SERVER_GRACEFUL_SHUTDOWN_SECONDS`` and dispose their pools; give the
+container a longer stop timeout than that. Migrations and the seed are not
+run here, so starting more workers or containers does not repeat them; run
+``alembic upgrade head`` and ``scripts/seed_database.py`` once per deploy
+first (the ``migrate`` service in docker-compose.yml does).
+"""
+
+import sys
+import os
+import argparse
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def main(workers: int, reload: bool) -> None:
+    # workers read it to size the WORKER_METRICS_PORT range
+    os.environ["SERVER_WORKERS"] = str(workers)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=None if reload else workers,
+        reload=reload,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the EdTailor API.")
+    parser.add_argument('--workers', type=int, default=settings.SERVER_WORKERS,
+                        help="worker processes (default: SERVER_WORKERS)")
+    parser.add_argument('--reload', action='store_true',
+                        help="development: a single process that restarts on code changes")
+    args = parser.parse_args()
+    workers = 1 if args.reload else args.workers
+    if workers < 1:
+        parser.error("--workers must be at least 1")
+    connections = settings.database_connections(workers)
+    if connections > settings.DB_CONNECTION_BUDGET:
+        parser.error(
+            f"{workers} workers may open {connections} database connections "
+            f"(DB_POOL_SIZE + DB_MAX_OVERFLOW each), more than DB_CONNECTION_BUDGET="
+            f"{settings.DB_CONNECTION_BUDGET}; lower one or raise the budget"
+        )
+    main(workers, args.reload)
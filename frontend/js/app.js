@@ -3,6 +3,10 @@
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
+// Fields rendered by the fabric and garment cards
+const FABRIC_LIST_FIELDS = 'name,description,fiber_type,weight,common_uses,season';
+const GARMENT_LIST_FIELDS = 'name,description,formality_level,construction_details,styling_tips';
+
 function app() {
     return {
         // State
@@ -80,30 +84,49 @@ function app() {
             this.selectedLesson = null;
         },
 
+        // Fetch every page of a cursor-paginated list endpoint
+        async fetchAllPages(url, errorMessage) {
+            const items = [];
+            const separator = url.includes('?') ? '&' : '?';
+            let cursor = null;
+            do {
+                const pageUrl = cursor ? `${url}${separator}after=${encodeURIComponent(cursor)}` : url;
+                const response = await fetch(pageUrl);
+                if (!response.ok) throw new Error(errorMessage);
+                const page = await response.json();
+                items.push(...page.items);
+                cursor = page.next_cursor;
+            } while (cursor);
+            return items;
+        },
+
         // API Calls - Categories
         async loadCategories() {
             try {
-                const response = await fetch(`${API_BASE_URL}/categories?language=${this.language}`);
+                // One request returns every category with its topics
+                const response = await fetch(`${API_BASE_URL}/categories/tree?language=${this.language}`);
                 if (!response.ok) throw new Error('Failed to load categories');
-                this.categories = await response.json();
+                const flatten = (nodes) => nodes.flatMap(node => [node, ...flatten(node.children)]);
+                this.categories = flatten(await response.json());
             } catch (error) {
                 console.error('Error loading categories:', error);
                 this.categories = [];
             }
         },
 
-        async selectCategory(category) {
+        selectCategory(category) {
             this.selectedCategory = category;
             this.currentView = 'topics';
-            await this.loadTopics(category.id);
+            this.topics = category.topics;
         },
 
         // API Calls - Topics
         async loadTopics(categoryId) {
             try {
-                const response = await fetch(`${API_BASE_URL}/categories/${categoryId}/topics?language=${this.language}`);
-                if (!response.ok) throw new Error('Failed to load topics');
-                this.topics = await response.json();
+                this.topics = await this.fetchAllPages(
+                    `${API_BASE_URL}/categories/${categoryId}/topics?language=${this.language}`,
+                    'Failed to load topics'
+                );
             } catch (error) {
                 console.error('Error loading topics:', error);
                 this.topics = [];
@@ -119,9 +142,10 @@ function app() {
         // API Calls - Lessons
         async loadLessons(topicId) {
             try {
-                const response = await fetch(`${API_BASE_URL}/topics/${topicId}/lessons?language=${this.language}`);
-                if (!response.ok) throw new Error('Failed to load lessons');
-                this.lessons = await response.json();
+                this.lessons = await this.fetchAllPages(
+                    `${API_BASE_URL}/topics/${topicId}/lessons?language=${this.language}&view=summary`,
+                    'Failed to load lessons'
+                );
             } catch (error) {
                 console.error('Error loading lessons:', error);
                 this.lessons = [];
@@ -143,9 +167,10 @@ function app() {
         // API Calls - Fabrics
         async loadFabrics() {
             try {
-                const response = await fetch(`${API_BASE_URL}/fabrics?language=${this.language}`);
-                if (!response.ok) throw new Error('Failed to load fabrics');
-                this.fabrics = await response.json();
+                this.fabrics = await this.fetchAllPages(
+                    `${API_BASE_URL}/fabrics?language=${this.language}&fields=${FABRIC_LIST_FIELDS}`,
+                    'Failed to load fabrics'
+                );
             } catch (error) {
                 console.error('Error loading fabrics:', error);
                 this.fabrics = [];
@@ -155,9 +180,10 @@ function app() {
         // API Calls - Garments
         async loadGarments() {
             try {
-                const response = await fetch(`${API_BASE_URL}/garments?language=${this.language}`);
-                if (!response.ok) throw new Error('Failed to load garments');
-                this.garments = await response.json();
+                this.garments = await this.fetchAllPages(
+                    `${API_BASE_URL}/garments?language=${this.language}&fields=${GARMENT_LIST_FIELDS}`,
+                    'Failed to load garments'
+                );
             } catch (error) {
                 console.error('Error loading garments:', error);
                 this.garments = [];
@@ -167,61 +193,14 @@ function app() {
         // API Calls - Terms
         async loadTerms() {
             try {
-                const response = await fetch(`${API_BASE_URL}/terms?language=${this.language}`);
-                if (!response.ok) throw new Error('Failed to load terms');
-                this.terms = await response.json();
+                this.terms = await this.fetchAllPages(
+                    `${API_BASE_URL}/terms?language=${this.language}`,
+                    'Failed to load terms'
+                );
             } catch (error) {
                 console.error('Error loading terms:', error);
                 this.terms = [];
             }
-        },
-
-        // Markdown formatting
-        formatMarkdown(content) {
-            if (!content) return '';
-
-            // Simple markdown parser for lesson content
-            let html = content;
-
-            // Headers
-            html = html.replace(/^### (.*$)/gim, '<h3>$1</h3>');
-            html = html.replace(/^## (.*$)/gim, '<h2>$1</h2>');
-            html = html.replace(/^# (.*$)/gim, '<h1>$1</h1>');
-
-            // Bold
-            html = html.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
-            html = html.replace(/__(.*?)__/g, '<strong>$1</strong>');
-
-            // Italic
-            html = html.replace(/\*(.*?)\*/g, '<em>$1</em>');
-            html = html.replace(/_(.*?)_/g, '<em>$1</em>');
-
-            // Lists
-            html = html.replace(/^\* (.*$)/gim, '<li>$1</li>');
-            html = html.replace(/^\- (.*$)/gim, '<li>$1</li>');
-            html = html.replace(/^(\d+)\. (.*$)/gim, '<li>$2</li>');
-
-            // Wrap consecutive <li> in <ul>
-            html = html.replace(/(<li>.*<\/li>\n?)+/g, (match) => {
-                return '<ul>' + match + '</ul>';
-            });
-
-            // Paragraphs
-            html = html.split('\n\n').map(paragraph => {
-                if (paragraph.trim() &&
-                    !paragraph.startsWith('<h') &&
-                    !paragraph.startsWith('<ul') &&
-                    !paragraph.startsWith('<ol') &&
-                    !paragraph.startsWith('<li')) {
-                    return '<p>' + paragraph.trim() + '</p>';
-                }
-                return paragraph;
-            }).join('\n');
-
-            // Line breaks
-            html = html.replace(/\n/g, '<br>');
-
-            return html;
         }
     };
 }